@@ -1,11 +1,16 @@
 """Base agent abstract class for LLM interactions"""
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any, AsyncGenerator
+from collections import deque
+from itertools import islice
+from typing import Dict, List, Optional, Any, AsyncGenerator, Deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
+# Conversation turns kept per context; older ones are evicted
+MAX_CONTEXT_MESSAGES = 64
+
 
 class AgentType(str, Enum):
     """Agent types"""
@@ -30,6 +35,11 @@ class AgentMessage:
     content: str
     metadata: Dict[str, Any] = field(default_factory=dict)
     timestamp: datetime = field(default_factory=datetime.utcnow)
+    # Chat API form, built once instead of on every request that replays history
+    api_message: Dict[str, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.api_message = {"role": self.role, "content": self.content}
 
 
 @dataclass
@@ -51,10 +61,14 @@ class AgentContext:
     """Context for agent execution"""
     user_id: str
     session_id: Optional[str] = None
-    messages: List[AgentMessage] = field(default_factory=list)
+    messages: Deque[AgentMessage] = field(
+        default_factory=lambda: deque(maxlen=MAX_CONTEXT_MESSAGES)
+    )
     ha_context: Optional[Dict[str, Any]] = None
     user_rules: List[Dict[str, Any]] = field(default_factory=list)
     relevant_memories: List[Dict[str, Any]] = field(default_factory=list)
+    # Embedding of the current input, if already computed upstream
+    input_embedding: Optional[List[float]] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
@@ -200,7 +214,9 @@ class BaseAgent(ABC):
         Returns:
             List of messages as dictionaries
         """
-        messages = context.messages[-limit:] if limit else context.messages
+        messages = context.messages
+        if limit:
+            messages = islice(messages, max(0, len(messages) - limit), None)
         return [
             {
                 "role": msg.role,
@@ -2,9 +2,14 @@
 
 import json
 import asyncio
-import base64
-from typing import Dict, List, Optional, Any, AsyncGenerator
+import binascii
+import re
+import socket
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, AsyncGenerator, Callable, Deque, Set
 from enum import Enum
+from functools import cached_property
 import websockets
 from websockets.client import WebSocketClientProtocol
 from app.agents.base import (
@@ -17,9 +22,31 @@ from app.agents.base import (
 from app.core.config import settings
 from app.core.logging import get_logger
 
+# Make orjson optional
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
 logger = get_logger(__name__)
 
 
+def _dumps(event: Any) -> str:
+    """Serialize an event to a JSON text frame"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(event).decode("utf-8")
+    return json.dumps(event)
+
+
+def _loads(message: Any) -> Any:
+    """Parse a JSON frame received from the Realtime API"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(message)
+    return json.loads(message)
+
+
 class RealtimeEventType(str, Enum):
     """OpenAI Realtime API event types"""
     # Session
@@ -77,6 +104,286 @@ class TurnDetectionType(str, Enum):
     NONE = "none"  # Manual turn detection
 
 
+# Static events are serialized once instead of on every send
+_COMMIT_FRAME = _dumps({"type": RealtimeEventType.INPUT_AUDIO_BUFFER_COMMIT})
+_CANCEL_FRAME = _dumps({"type": RealtimeEventType.RESPONSE_CANCEL})
+_RESPONSE_CREATE_FRAME = _dumps({
+    "type": RealtimeEventType.RESPONSE_CREATE,
+    "response": {"modalities": ["text", "audio"]},
+})
+
+# Constant envelope around the base64 payload of input_audio_buffer.append
+_AUDIO_PREFIX = '{"type":"input_audio_buffer.append","audio":"'
+_AUDIO_SUFFIX = '"}'
+
+# Canonical base64: nothing that could end the JSON string in the envelope,
+# and whole 4-character groups, so unpadded chunks concatenate cleanly
+_BASE64_AUDIO = re.compile(
+    r"(?:[A-Za-z0-9+/]{4})*(?:[A-Za-z0-9+/]{2}==|[A-Za-z0-9+/]{3}=)?"
+)
+
+# Upper bound on queued audio append frames merged into one send
+_MAX_MERGED_APPENDS = 16
+
+# The only events shed when a channel is full; late audio is useless, while
+# function calls, transcripts and response lifecycle events must arrive
+_SHEDDABLE_EVENT = RealtimeEventType.RESPONSE_AUDIO_DELTA.value
+
+# Max time spent coalescing buffered audio deltas into a single yield
+_AUDIO_BATCH_WINDOW = 0.020
+
+# turn_detection section of session.update for each mode
+_TURN_DETECTION_CONFIGS: Dict[TurnDetectionType, Dict[str, Any]] = {
+    TurnDetectionType.SERVER_VAD: {
+        "type": "server_vad",
+        "threshold": 0.5,
+        "prefix_padding_ms": 300,
+        "silence_duration_ms": 500,
+    },
+    TurnDetectionType.NONE: {"type": None},
+}
+
+
+class EventChannel:
+    """
+    Bounded single-producer/single-consumer buffer of Realtime events.
+    
+    A deque guarded by one asyncio.Event avoids the per-item Future
+    allocations of asyncio.Queue on the audio-delta hot path. When the
+    consumer falls behind and the buffer is full, audio deltas are shed:
+    new ones are dropped, and other events take the place of the oldest
+    buffered one. Other events are never dropped.
+    """
+
+    def __init__(self, maxlen: int = 256):
+        self.maxlen = maxlen
+        self.events: Deque[Dict[str, Any]] = deque()
+        self.dropped = 0
+        self._ready = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def put(self, event: Dict[str, Any]) -> bool:
+        """
+        Append event and wake up the consumer
+        
+        Args:
+            event: Parsed Realtime event
+            
+        Returns:
+            False if the event was dropped
+        """
+        if len(self.events) >= self.maxlen:
+            if event.get("type") == _SHEDDABLE_EVENT:
+                self.dropped += 1
+                return False
+            self._shed_oldest_audio()
+
+        self.events.append(event)
+        self._ready.set()
+        return True
+
+    def _shed_oldest_audio(self) -> None:
+        """Drop the oldest buffered audio delta; the buffer may overrun without one"""
+        for index, buffered in enumerate(self.events):
+            if buffered.get("type") == _SHEDDABLE_EVENT:
+                del self.events[index]
+                self.dropped += 1
+                return
+
+    def peek(self) -> Optional[Dict[str, Any]]:
+        """Return next buffered event without removing it"""
+        if self.events:
+            return self.events[0]
+        return None
+
+    def get_nowait(self) -> Optional[Dict[str, Any]]:
+        """Pop next buffered event, or None if the buffer is empty"""
+        if self.events:
+            return self.events.popleft()
+        return None
+
+    async def get(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Wait for next event
+        
+        Args:
+            timeout: Seconds to wait before raising asyncio.TimeoutError,
+                or None to wait without arming a timer
+            
+        Returns:
+            Next event
+        """
+        while not self.events:
+            self._ready.clear()
+            if timeout is None:
+                await self._ready.wait()
+            else:
+                await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+        return self.events.popleft()
+
+
+@dataclass
+class _StreamState:
+    """Per-call state shared by stream_process event handlers"""
+    session_id: str
+    channel: EventChannel
+    loop: asyncio.AbstractEventLoop
+    audio_chunks: List[bytes] = field(default_factory=list)
+    text_parts: List[str] = field(default_factory=list)
+    done: bool = False
+
+
+class RealtimeConnectionPool:
+    """
+    Process-wide pool of pre-opened Realtime API connections.
+    
+    Realtime sessions keep conversation state on the server, so a socket is
+    never handed to a second session. Instead, spare connections are opened
+    ahead of time so a new session skips the TCP + TLS + upgrade handshake.
+    Spares that stay idle longer than idle_timeout are closed.
+    """
+
+    def __init__(self, size: int = 1, idle_timeout: float = 300.0):
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self._idle: Dict[str, Deque[WebSocketClientProtocol]] = {}
+        self._refills: Dict[str, asyncio.Task] = {}
+        self._background: Set[asyncio.Task] = set()
+
+    async def acquire(self, model: str) -> WebSocketClientProtocol:
+        """
+        Get a connection for a new session
+        
+        Args:
+            model: Realtime model name
+            
+        Returns:
+            Open WebSocket connection owned by the caller
+        """
+        idle = self._idle.get(model)
+        ws = None
+        while idle:
+            candidate = idle.popleft()
+            if not candidate.closed:
+                ws = candidate
+                break
+
+        if ws is None:
+            ws = await self._open(model)
+
+        self._schedule_refill(model)
+        return ws
+
+    async def close(self) -> None:
+        """Close all idle connections"""
+        for task in self._refills.values():
+            task.cancel()
+        self._refills.clear()
+
+        for idle in self._idle.values():
+            while idle:
+                ws = idle.popleft()
+                try:
+                    await ws.close()
+                except Exception as e:
+                    logger.error("Error closing pooled WebSocket", error=str(e))
+
+    async def _open(self, model: str) -> WebSocketClientProtocol:
+        """Connect to OpenAI Realtime API"""
+        url = f"wss://api.openai.com/v1/realtime?model={model}"
+        headers = {
+            "Authorization": f"Bearer {settings.openai_api_key}",
+            "OpenAI-Beta": "realtime=v1",
+        }
+
+        # Base64 PCM barely compresses, so skip per-frame deflate; keepalive
+        # pings evict half-open connections
+        ws = await websockets.connect(
+            url,
+            extra_headers=headers,
+            compression=None,
+            max_size=16 * 1024 * 1024,
+            read_limit=2**20,
+            write_limit=2**20,
+            ping_interval=20,
+            ping_timeout=20,
+        )
+        self._tune_socket(ws)
+        return ws
+
+    @staticmethod
+    def _tune_socket(ws: WebSocketClientProtocol) -> None:
+        """Disable Nagle batching of small audio frames and enable TCP keepalive"""
+        transport = getattr(ws, "transport", None)
+        sock = transport.get_extra_info("socket") if transport else None
+        if sock is None:
+            return
+
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        except OSError as e:
+            logger.debug("Failed to set socket options", error=str(e))
+
+    def _schedule_refill(self, model: str) -> None:
+        """Top up idle connections in the background"""
+        if self.size <= 0:
+            return
+
+        task = self._refills.get(model)
+        if task and not task.done():
+            return
+
+        self._refills[model] = asyncio.create_task(self._refill(model))
+
+    async def _refill(self, model: str) -> None:
+        """Open connections until the idle pool is full"""
+        idle = self._idle.setdefault(model, deque())
+        loop = asyncio.get_running_loop()
+
+        try:
+            while len(idle) < self.size:
+                ws = await self._open(model)
+                idle.append(ws)
+                loop.call_later(self.idle_timeout, self._expire, model, ws)
+        except Exception as e:
+            logger.warning("Failed to pre-open Realtime connection", model=model, error=str(e))
+
+    def _expire(self, model: str, ws: WebSocketClientProtocol) -> None:
+        """Close a spare connection that was never acquired"""
+        idle = self._idle.get(model)
+        if idle is None or ws not in idle:
+            return
+
+        idle.remove(ws)
+        task = asyncio.create_task(ws.close())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+
+# Global connection pool
+connection_pool = RealtimeConnectionPool(size=settings.realtime_warm_connections)
+
+
+@dataclass
+class _Session:
+    """Connection state of one Realtime session"""
+    session_id: str
+    ws: WebSocketClientProtocol
+    channel: EventChannel
+    send_queue: asyncio.Queue
+    writer_task: Optional[asyncio.Task] = None
+    listener_task: Optional[asyncio.Task] = None
+    # Set once the writer has exited; nothing more can be sent
+    closed: bool = False
+    error: Optional[BaseException] = None
+
+
+_EventHandler = Callable[[Dict[str, Any], _StreamState], Optional[AgentResponse]]
+
+
 class RealtimeVoiceAgent(BaseAgent):
     """
     Voice-first agent using OpenAI Realtime API.
@@ -105,11 +412,35 @@ class RealtimeVoiceAgent(BaseAgent):
         self.max_tokens = max_tokens
         self.turn_detection = turn_detection
         
-        # WebSocket connection per session
-        self.websockets: Dict[str, WebSocketClientProtocol] = {}
-        
-        # Event handlers for async processing
-        self.event_handlers: Dict[str, asyncio.Queue] = {}
+        # Static part of session.update; instructions and tools are added per session
+        self._session_template: Dict[str, Any] = {
+            "modalities": ["text", "audio"],
+            "voice": self.voice,
+            "input_audio_format": "pcm16",
+            "output_audio_format": "pcm16",
+            "input_audio_transcription": {
+                "model": "whisper-1",
+            },
+            "turn_detection": self._get_turn_detection_config(),
+            "temperature": self.temperature,
+            "max_response_output_tokens": self.max_tokens,
+        }
+
+        # Connection state per session (socket, event channel, writer task)
+        self._sessions: Dict[str, _Session] = {}
+
+        # Sessions whose listener is still receiving; maintained by _listen_events
+        self._live_sessions: Set[str] = set()
+
+        # stream_process dispatch table: event type -> handler
+        self._handlers: Dict[str, _EventHandler] = {
+            RealtimeEventType.RESPONSE_AUDIO_DELTA.value: self._on_audio_delta,
+            RealtimeEventType.RESPONSE_TEXT_DELTA.value: self._on_text_delta,
+            RealtimeEventType.RESPONSE_AUDIO_TRANSCRIPT_DELTA.value: self._on_transcript_delta,
+            RealtimeEventType.RESPONSE_FUNCTION_CALL_ARGUMENTS_DONE.value: self._on_function_call,
+            RealtimeEventType.RESPONSE_DONE.value: self._on_response_done,
+            RealtimeEventType.ERROR.value: self._on_error,
+        }
 
     async def initialize(self) -> None:
         """Initialize agent"""
@@ -122,20 +453,26 @@ class RealtimeVoiceAgent(BaseAgent):
 
     async def shutdown(self) -> None:
         """Cleanup all active WebSocket connections"""
-        for session_id, ws in list(self.websockets.items()):
-            try:
-                await ws.close()
-            except Exception as e:
-                logger.error(
-                    "Error closing WebSocket",
-                    session_id=session_id,
-                    error=str(e),
-                )
+        for session in list(self._sessions.values()):
+            await self._close_session(session)
         
-        self.websockets.clear()
-        self.event_handlers.clear()
+        self._sessions.clear()
+        self._live_sessions.clear()
         logger.info("Realtime voice agent shutdown")
 
+    def get_event_channel(self, session_id: str) -> Optional[EventChannel]:
+        """
+        Get event channel for a connected session
+        
+        Args:
+            session_id: Session identifier
+            
+        Returns:
+            Event channel or None
+        """
+        session = self._sessions.get(session_id)
+        return session.channel if session else None
+
     async def connect_session(
         self,
         session_id: str,
@@ -150,35 +487,36 @@ class RealtimeVoiceAgent(BaseAgent):
             instructions: System instructions for the assistant
             tools: Optional tools for function calling
         """
-        if session_id in self.websockets:
+        if session_id in self._sessions:
             logger.warning("Session already connected", session_id=session_id)
             return
 
         try:
-            # Connect to OpenAI Realtime API
-            url = f"wss://api.openai.com/v1/realtime?model={self.model}"
-            headers = {
-                "Authorization": f"Bearer {settings.openai_api_key}",
-                "OpenAI-Beta": "realtime=v1",
-            }
+            # Take a pre-opened connection if one is available
+            ws = await connection_pool.acquire(self.model)
 
-            ws = await websockets.connect(url, extra_headers=headers)
-            self.websockets[session_id] = ws
-            
-            # Create event queue for this session
-            self.event_handlers[session_id] = asyncio.Queue()
+            # Bounded send queue gives send backpressure
+            session = _Session(
+                session_id=session_id,
+                ws=ws,
+                channel=EventChannel(),
+                send_queue=asyncio.Queue(maxsize=64),
+            )
+            session.writer_task = asyncio.create_task(self._writer_loop(session))
+            self._sessions[session_id] = session
+            self._live_sessions.add(session_id)
 
             logger.info("WebSocket connected", session_id=session_id)
 
             # Configure session
             await self._configure_session(
-                session_id=session_id,
+                session=session,
                 instructions=instructions,
                 tools=tools,
             )
 
             # Start event listener
-            asyncio.create_task(self._listen_events(session_id))
+            session.listener_task = asyncio.create_task(self._listen_events(session))
 
         except Exception as e:
             logger.error(
@@ -195,80 +533,178 @@ class RealtimeVoiceAgent(BaseAgent):
         Args:
             session_id: Session identifier
         """
-        ws = self.websockets.get(session_id)
-        if ws:
-            try:
-                await ws.close()
-            except Exception as e:
-                logger.error("Error disconnecting", session_id=session_id, error=str(e))
-            finally:
-                del self.websockets[session_id]
-                if session_id in self.event_handlers:
-                    del self.event_handlers[session_id]
-                
-                logger.info("Session disconnected", session_id=session_id)
+        session = self._sessions.pop(session_id, None)
+        self._live_sessions.discard(session_id)
+        if session:
+            await self._close_session(session)
+            logger.info("Session disconnected", session_id=session_id)
+
+    async def _close_session(self, session: _Session) -> None:
+        """Flush pending frames and close the session's WebSocket"""
+        await self._stop_writer(session)
+        try:
+            await session.ws.close()
+        except Exception as e:
+            logger.error(
+                "Error closing WebSocket",
+                session_id=session.session_id,
+                error=str(e),
+            )
+
+        # The listener normally ends with the socket; don't leave it behind
+        # if the close handshake did not complete
+        if session.listener_task and not session.listener_task.done():
+            session.listener_task.cancel()
 
     async def _configure_session(
         self,
-        session_id: str,
+        session: _Session,
         instructions: str,
         tools: Optional[List[Dict[str, Any]]] = None,
     ) -> None:
         """Configure Realtime API session"""
-        ws = self.websockets.get(session_id)
-        if not ws:
-            raise RuntimeError(f"No WebSocket for session {session_id}")
+        session_config = dict(self._session_template)
+        session_config["instructions"] = instructions
+
+        if tools:
+            session_config["tools"] = tools
+            session_config["tool_choice"] = "auto"
 
         config = {
             "type": RealtimeEventType.SESSION_UPDATE,
-            "session": {
-                "modalities": ["text", "audio"],
-                "instructions": instructions,
-                "voice": self.voice,
-                "input_audio_format": "pcm16",
-                "output_audio_format": "pcm16",
-                "input_audio_transcription": {
-                    "model": "whisper-1",
-                },
-                "turn_detection": self._get_turn_detection_config(),
-                "temperature": self.temperature,
-                "max_response_output_tokens": self.max_tokens,
-            },
+            "session": session_config,
         }
 
-        if tools:
-            config["session"]["tools"] = tools
-            config["session"]["tool_choice"] = "auto"
-
-        await ws.send(json.dumps(config))
-        logger.info("Session configured", session_id=session_id)
+        await session.send_queue.put(_dumps(config))
+        logger.info("Session configured", session_id=session.session_id)
 
     def _get_turn_detection_config(self) -> Dict[str, Any]:
         """Get turn detection configuration"""
-        if self.turn_detection == TurnDetectionType.SERVER_VAD:
-            return {
-                "type": "server_vad",
-                "threshold": 0.5,
-                "prefix_padding_ms": 300,
-                "silence_duration_ms": 500,
-            }
-        else:
-            return {"type": None}
+        return _TURN_DETECTION_CONFIGS.get(
+            self.turn_detection,
+            _TURN_DETECTION_CONFIGS[TurnDetectionType.NONE],
+        )
 
-    async def _listen_events(self, session_id: str) -> None:
+    def _require_session(self, session_id: str) -> _Session:
+        """Get connected session or raise"""
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise RuntimeError(f"No WebSocket for session {session_id}")
+        self._check_open(session)
+        return session
+
+    @staticmethod
+    def _check_open(session: _Session) -> None:
+        """Raise if the session's writer has exited"""
+        if session.closed or (session.writer_task is not None and session.writer_task.done()):
+            raise RuntimeError(
+                f"WebSocket for session {session.session_id} is closed"
+            ) from session.error
+
+    async def _writer_loop(self, session: _Session) -> None:
         """
-        Listen for events from WebSocket
+        Write queued frames to the WebSocket
         
         Args:
-            session_id: Session identifier
+            session: Connected session
+        """
+        ws = session.ws
+        queue = session.send_queue
+        # Frame taken from the queue while merging, sent next
+        held: Deque[Optional[str]] = deque()
+
+        try:
+            while True:
+                frame = held.popleft() if held else await queue.get()
+                if frame is None:
+                    break
+                if frame.startswith(_AUDIO_PREFIX):
+                    frame = self._merge_audio_appends(frame, queue, held)
+                await ws.send(frame)
+
+        except websockets.exceptions.ConnectionClosed as e:
+            session.error = e
+            logger.info("WebSocket closed while sending", session_id=session.session_id)
+        except Exception as e:
+            session.error = e
+            logger.error(
+                "Error in writer task",
+                session_id=session.session_id,
+                error=str(e),
+            )
+        finally:
+            session.closed = True
+            # Wake producers blocked on the full queue; they fail on their
+            # next send
+            while not queue.empty():
+                queue.get_nowait()
+
+    @staticmethod
+    def _merge_audio_appends(
+        frame: str,
+        queue: asyncio.Queue,
+        held: Deque[Optional[str]],
+    ) -> str:
         """
-        ws = self.websockets.get(session_id)
-        if not ws:
+        Merge audio append frames already queued behind frame into one
+        
+        Base64 strings concatenate cleanly only while the leading part is
+        unpadded, so merging stops after the first padded chunk.
+        
+        Args:
+            frame: input_audio_buffer.append frame just taken from the queue
+            queue: Session send queue
+            held: Receives the first queued frame that cannot be merged
+            
+        Returns:
+            The frame itself, or one frame carrying the merged audio
+        """
+        start, end = len(_AUDIO_PREFIX), -len(_AUDIO_SUFFIX)
+        parts = [frame[start:end]]
+
+        while len(parts) < _MAX_MERGED_APPENDS and not parts[-1].endswith("="):
+            try:
+                pending = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if pending is None or not pending.startswith(_AUDIO_PREFIX):
+                held.append(pending)
+                break
+            parts.append(pending[start:end])
+
+        if len(parts) == 1:
+            return frame
+        return "".join((_AUDIO_PREFIX, *parts, _AUDIO_SUFFIX))
+
+    async def _stop_writer(self, session: _Session) -> None:
+        """Flush pending frames and stop the session's writer task"""
+        task = session.writer_task
+        if task is None or task.done():
             return
 
         try:
-            async for message in ws:
-                event = json.loads(message)
+            session.send_queue.put_nowait(None)
+        except asyncio.QueueFull:
+            task.cancel()
+            return
+
+        done, _ = await asyncio.wait({task}, timeout=5.0)
+        if not done:
+            task.cancel()
+
+    async def _listen_events(self, session: _Session) -> None:
+        """
+        Listen for events from WebSocket
+        
+        Args:
+            session: Connected session
+        """
+        session_id = session.session_id
+        channel = session.channel
+
+        try:
+            async for message in session.ws:
+                event = _loads(message)
                 event_type = event.get("type")
                 
                 logger.debug(
@@ -277,10 +713,15 @@ class RealtimeVoiceAgent(BaseAgent):
                     event_type=event_type,
                 )
 
-                # Put event in queue for processing
-                queue = self.event_handlers.get(session_id)
-                if queue:
-                    await queue.put(event)
+                # Put event in channel for processing; warn on the first drop
+                dropped = channel.dropped
+                channel.put(event)
+                if channel.dropped and not dropped:
+                    logger.warning(
+                        "Event channel full, dropping events",
+                        session_id=session_id,
+                        event_type=event_type,
+                    )
 
         except websockets.exceptions.ConnectionClosed:
             logger.info("WebSocket connection closed", session_id=session_id)
@@ -290,6 +731,8 @@ class RealtimeVoiceAgent(BaseAgent):
                 session_id=session_id,
                 error=str(e),
             )
+        finally:
+            self._live_sessions.discard(session_id)
 
     async def send_audio(
         self,
@@ -305,23 +748,58 @@ class RealtimeVoiceAgent(BaseAgent):
             audio_data: PCM16 audio data
             commit: Whether to commit the audio buffer
         """
-        ws = self.websockets.get(session_id)
-        if not ws:
-            raise RuntimeError(f"No WebSocket for session {session_id}")
+        await self._send_audio(self._require_session(session_id), audio_data, commit)
 
-        # Encode audio to base64
-        audio_base64 = base64.b64encode(audio_data).decode("utf-8")
+    async def send_audio_base64(
+        self,
+        session_id: str,
+        audio_base64: str,
+        commit: bool = False,
+    ) -> None:
+        """
+        Send already base64-encoded audio input to Realtime API
+        
+        Args:
+            session_id: Session identifier
+            audio_base64: Base64-encoded PCM16 audio data; line breaks are
+                allowed
+            commit: Whether to commit the audio buffer
+            
+        Raises:
+            ValueError: If audio_base64 is not valid base64
+        """
+        if not _BASE64_AUDIO.fullmatch(audio_base64):
+            # Line-wrapped base64, e.g. from base64.encodebytes
+            audio_base64 = "".join(audio_base64.split())
+            if not _BASE64_AUDIO.fullmatch(audio_base64):
+                raise ValueError("Audio is not valid base64")
 
-        # Send append event
-        event = {
-            "type": RealtimeEventType.INPUT_AUDIO_BUFFER_APPEND,
-            "audio": audio_base64,
-        }
-        await ws.send(json.dumps(event))
+        await self._send_audio_base64(self._require_session(session_id), audio_base64, commit)
+
+    async def _send_audio(
+        self,
+        session: _Session,
+        audio_data: bytes,
+        commit: bool = False,
+    ) -> None:
+        """Send audio input on a connected session"""
+        audio_base64 = binascii.b2a_base64(audio_data, newline=False).decode("ascii")
+        await self._send_audio_base64(session, audio_base64, commit)
+
+    async def _send_audio_base64(
+        self,
+        session: _Session,
+        audio_base64: str,
+        commit: bool = False,
+    ) -> None:
+        """Send base64 audio input on a connected session"""
+        # Wrap the audio in the append envelope directly,
+        # skipping dict construction and JSON encoding for the audio payload
+        await session.send_queue.put("".join((_AUDIO_PREFIX, audio_base64, _AUDIO_SUFFIX)))
 
         # Commit if requested
         if commit:
-            await self.commit_audio(session_id)
+            await self._commit_audio(session)
 
     async def commit_audio(self, session_id: str) -> None:
         """
@@ -330,13 +808,12 @@ class RealtimeVoiceAgent(BaseAgent):
         Args:
             session_id: Session identifier
         """
-        ws = self.websockets.get(session_id)
-        if not ws:
-            raise RuntimeError(f"No WebSocket for session {session_id}")
+        await self._commit_audio(self._require_session(session_id))
 
-        event = {"type": RealtimeEventType.INPUT_AUDIO_BUFFER_COMMIT}
-        await ws.send(json.dumps(event))
-        logger.debug("Audio buffer committed", session_id=session_id)
+    async def _commit_audio(self, session: _Session) -> None:
+        """Commit audio buffer on a connected session"""
+        await session.send_queue.put(_COMMIT_FRAME)
+        logger.debug("Audio buffer committed", session_id=session.session_id)
 
     async def send_text(
         self,
@@ -352,10 +829,15 @@ class RealtimeVoiceAgent(BaseAgent):
             text: Text content
             trigger_response: Whether to trigger assistant response
         """
-        ws = self.websockets.get(session_id)
-        if not ws:
-            raise RuntimeError(f"No WebSocket for session {session_id}")
+        await self._send_text(self._require_session(session_id), text, trigger_response)
 
+    async def _send_text(
+        self,
+        session: _Session,
+        text: str,
+        trigger_response: bool = True,
+    ) -> None:
+        """Send text input on a connected session"""
         # Create conversation item
         event = {
             "type": RealtimeEventType.CONVERSATION_ITEM_CREATE,
@@ -365,10 +847,10 @@ class RealtimeVoiceAgent(BaseAgent):
                 "content": [{"type": "input_text", "text": text}],
             },
         }
-        await ws.send(json.dumps(event))
+        await session.send_queue.put(_dumps(event))
 
         if trigger_response:
-            await self.trigger_response(session_id)
+            await self._trigger_response(session)
 
     async def trigger_response(
         self,
@@ -382,18 +864,27 @@ class RealtimeVoiceAgent(BaseAgent):
             session_id: Session identifier
             modalities: Optional modalities (text, audio)
         """
-        ws = self.websockets.get(session_id)
-        if not ws:
-            raise RuntimeError(f"No WebSocket for session {session_id}")
+        await self._trigger_response(self._require_session(session_id), modalities)
 
-        event = {
-            "type": RealtimeEventType.RESPONSE_CREATE,
-            "response": {
-                "modalities": modalities or ["text", "audio"],
-            },
-        }
-        await ws.send(json.dumps(event))
-        logger.debug("Response triggered", session_id=session_id)
+    async def _trigger_response(
+        self,
+        session: _Session,
+        modalities: Optional[List[str]] = None,
+    ) -> None:
+        """Trigger assistant response on a connected session"""
+        if modalities:
+            event = {
+                "type": RealtimeEventType.RESPONSE_CREATE,
+                "response": {
+                    "modalities": modalities,
+                },
+            }
+            frame = _dumps(event)
+        else:
+            frame = _RESPONSE_CREATE_FRAME
+
+        await session.send_queue.put(frame)
+        logger.debug("Response triggered", session_id=session.session_id)
 
     async def cancel_response(self, session_id: str) -> None:
         """
@@ -402,12 +893,7 @@ class RealtimeVoiceAgent(BaseAgent):
         Args:
             session_id: Session identifier
         """
-        ws = self.websockets.get(session_id)
-        if not ws:
-            raise RuntimeError(f"No WebSocket for session {session_id}")
-
-        event = {"type": RealtimeEventType.RESPONSE_CANCEL}
-        await ws.send(json.dumps(event))
+        await self._require_session(session_id).send_queue.put(_CANCEL_FRAME)
         logger.info("Response cancelled (barge-in)", session_id=session_id)
 
     async def send_function_result(
@@ -424,22 +910,19 @@ class RealtimeVoiceAgent(BaseAgent):
             call_id: Function call ID
             output: Function result
         """
-        ws = self.websockets.get(session_id)
-        if not ws:
-            raise RuntimeError(f"No WebSocket for session {session_id}")
-
+        session = self._require_session(session_id)
         event = {
             "type": RealtimeEventType.CONVERSATION_ITEM_CREATE,
             "item": {
                 "type": "function_call_output",
                 "call_id": call_id,
-                "output": json.dumps(output),
+                "output": _dumps(output),
             },
         }
-        await ws.send(json.dumps(event))
+        await session.send_queue.put(_dumps(event))
 
         # Trigger response to continue
-        await self.trigger_response(session_id)
+        await self._trigger_response(session)
 
     async def process(
         self,
@@ -479,122 +962,45 @@ class RealtimeVoiceAgent(BaseAgent):
             raise ValueError("Session ID required for realtime agent")
 
         # Ensure session is connected
-        if session_id not in self.websockets:
+        session = self._sessions.get(session_id)
+        if session is None:
             instructions = self._build_instructions(context)
             await self.connect_session(session_id, instructions, tools)
+            session = self._require_session(session_id)
+        else:
+            self._check_open(session)
 
         # Send input
         if input_audio:
-            await self.send_audio(session_id, input_audio, commit=True)
+            await self._send_audio(session, input_audio, commit=True)
         elif input_text:
-            await self.send_text(session_id, input_text)
+            await self._send_text(session, input_text)
         else:
             raise ValueError("Either input_text or input_audio required")
 
         # Stream events
-        queue = self.event_handlers.get(session_id)
-        if not queue:
-            raise RuntimeError("No event handler for session")
+        channel = session.channel
 
-        accumulated_audio = bytearray()
-        accumulated_text = ""
+        state = _StreamState(
+            session_id=session_id,
+            channel=channel,
+            loop=asyncio.get_running_loop(),
+        )
 
         try:
-            while True:
+            while not state.done:
                 # Get event with timeout
                 try:
-                    event = await asyncio.wait_for(queue.get(), timeout=30.0)
+                    event = await channel.get(timeout=30.0)
                 except asyncio.TimeoutError:
                     logger.warning("Event timeout", session_id=session_id)
                     break
 
-                event_type = event.get("type")
-
-                # Audio delta
-                if event_type == RealtimeEventType.RESPONSE_AUDIO_DELTA:
-                    audio_base64 = event.get("delta", "")
-                    if audio_base64:
-                        audio_chunk = base64.b64decode(audio_base64)
-                        accumulated_audio.extend(audio_chunk)
-                        
-                        yield AgentResponse(
-                            type=ResponseType.AUDIO,
-                            content="",
-                            audio_data=audio_chunk,
-                            audio_format="pcm16",
-                            metadata={"event": event_type},
-                        )
-
-                # Text delta
-                elif event_type == RealtimeEventType.RESPONSE_TEXT_DELTA:
-                    text_delta = event.get("delta", "")
-                    accumulated_text += text_delta
-                    
-                    yield AgentResponse(
-                        type=ResponseType.TEXT,
-                        content=text_delta,
-                        metadata={
-                            "event": event_type,
-                            "accumulated": accumulated_text,
-                        },
-                    )
-
-                # Transcript delta
-                elif event_type == RealtimeEventType.RESPONSE_AUDIO_TRANSCRIPT_DELTA:
-                    transcript_delta = event.get("delta", "")
-                    
-                    yield AgentResponse(
-                        type=ResponseType.TEXT,
-                        content=transcript_delta,
-                        metadata={"event": event_type, "is_transcript": True},
-                    )
-
-                # Function call
-                elif event_type == RealtimeEventType.RESPONSE_FUNCTION_CALL_ARGUMENTS_DONE:
-                    call_id = event.get("call_id")
-                    function_name = event.get("name")
-                    arguments = event.get("arguments")
-                    
-                    yield AgentResponse(
-                        type=ResponseType.FUNCTION_CALL,
-                        content=function_name,
-                        metadata={
-                            "event": event_type,
-                            "call_id": call_id,
-                            "function": function_name,
-                            "arguments": json.loads(arguments) if arguments else {},
-                        },
-                    )
-
-                # Response done
-                elif event_type == RealtimeEventType.RESPONSE_DONE:
-                    response_data = event.get("response", {})
-                    usage = response_data.get("usage", {})
-                    
-                    # Final response
-                    yield AgentResponse(
-                        type=ResponseType.TEXT,
-                        content=accumulated_text or "[Audio response]",
-                        audio_data=bytes(accumulated_audio) if accumulated_audio else None,
-                        audio_format="pcm16" if accumulated_audio else None,
-                        tokens_used=usage.get("total_tokens"),
-                        metadata={
-                            "event": event_type,
-                            "response_id": response_data.get("id"),
-                            "status": response_data.get("status"),
-                        },
-                    )
-                    break
-
-                # Error
-                elif event_type == RealtimeEventType.ERROR:
-                    error_data = event.get("error", {})
-                    logger.error(
-                        "Realtime API error",
-                        session_id=session_id,
-                        error=error_data,
-                    )
-                    break
+                handler = self._handlers.get(event.get("type"))
+                if handler:
+                    response = handler(event, state)
+                    if response:
+                        yield response
 
         except Exception as e:
             logger.error(
@@ -604,35 +1010,164 @@ class RealtimeVoiceAgent(BaseAgent):
             )
             raise
 
-    def _build_instructions(self, context: AgentContext) -> str:
-        """Build system instructions for session"""
-        parts = [
+    def _on_audio_delta(
+        self,
+        event: Dict[str, Any],
+        state: _StreamState,
+    ) -> Optional[AgentResponse]:
+        """Handle audio delta, coalescing back-to-back buffered deltas"""
+        batch: List[bytes] = []
+        deadline = state.loop.time() + _AUDIO_BATCH_WINDOW
+        while True:
+            audio_base64 = event.get("delta", "")
+            if audio_base64:
+                batch.append(binascii.a2b_base64(audio_base64))
+
+            next_event = state.channel.peek()
+            if (
+                next_event is None
+                or next_event.get("type") != RealtimeEventType.RESPONSE_AUDIO_DELTA
+                or state.loop.time() >= deadline
+            ):
+                break
+            event = state.channel.get_nowait()
+
+        if not batch:
+            return None
+
+        audio_chunk = batch[0] if len(batch) == 1 else b"".join(batch)
+        state.audio_chunks.append(audio_chunk)
+
+        return AgentResponse(
+            type=ResponseType.AUDIO,
+            content="",
+            audio_data=audio_chunk,
+            audio_format="pcm16",
+            metadata={"event": event.get("type")},
+        )
+
+    def _on_text_delta(
+        self,
+        event: Dict[str, Any],
+        state: _StreamState,
+    ) -> Optional[AgentResponse]:
+        """Handle text delta"""
+        text_delta = event.get("delta", "")
+        state.text_parts.append(text_delta)
+
+        # Full text is only joined once, on response.done
+        return AgentResponse(
+            type=ResponseType.TEXT,
+            content=text_delta,
+            metadata={"event": event.get("type")},
+        )
+
+    def _on_transcript_delta(
+        self,
+        event: Dict[str, Any],
+        state: _StreamState,
+    ) -> Optional[AgentResponse]:
+        """Handle audio transcript delta"""
+        return AgentResponse(
+            type=ResponseType.TEXT,
+            content=event.get("delta", ""),
+            metadata={"event": event.get("type"), "is_transcript": True},
+        )
+
+    def _on_function_call(
+        self,
+        event: Dict[str, Any],
+        state: _StreamState,
+    ) -> Optional[AgentResponse]:
+        """Handle completed function call arguments"""
+        function_name = event.get("name")
+        arguments = event.get("arguments")
+
+        return AgentResponse(
+            type=ResponseType.FUNCTION_CALL,
+            content=function_name,
+            metadata={
+                "event": event.get("type"),
+                "call_id": event.get("call_id"),
+                "function": function_name,
+                "arguments": _loads(arguments) if arguments else {},
+            },
+        )
+
+    def _on_response_done(
+        self,
+        event: Dict[str, Any],
+        state: _StreamState,
+    ) -> Optional[AgentResponse]:
+        """Handle response completion (terminal)"""
+        state.done = True
+        response_data = event.get("response", {})
+        usage = response_data.get("usage", {})
+
+        # Final response (audio and text joined once instead of grown per delta)
+        audio_data = b"".join(state.audio_chunks) if state.audio_chunks else None
+        return AgentResponse(
+            type=ResponseType.TEXT,
+            content="".join(state.text_parts) or "[Audio response]",
+            audio_data=audio_data,
+            audio_format="pcm16" if audio_data else None,
+            tokens_used=usage.get("total_tokens"),
+            metadata={
+                "event": event.get("type"),
+                "response_id": response_data.get("id"),
+                "status": response_data.get("status"),
+            },
+        )
+
+    def _on_error(
+        self,
+        event: Dict[str, Any],
+        state: _StreamState,
+    ) -> Optional[AgentResponse]:
+        """Handle Realtime API error (terminal)"""
+        state.done = True
+        logger.error(
+            "Realtime API error",
+            session_id=state.session_id,
+            error=event.get("error", {}),
+        )
+        return None
+
+    @cached_property
+    def _instructions_prefix(self) -> str:
+        """Static part of the system instructions, built from settings once"""
+        return "\n".join([
             f"Ты — {settings.assistant_name}, умный голосовой ассистент для управления домом через Home Assistant.",
             f"Стиль общения: {', '.join(settings.assistant_style_list)}",
             f"Язык: {settings.assistant_language}",
             "",
             "Отвечай КРАТКО и ЕСТЕСТВЕННО, как в живом разговоре.",
             "Это голосовой интерфейс - избегай длинных списков и форматирования.",
-        ]
+        ])
 
-        if context.user_rules:
-            parts.append("")
-            parts.append("Правила пользователя:")
-            for rule in context.user_rules[:3]:
-                parts.append(f"- {rule.get('rule_text', '')}")
+    def _build_instructions(self, context: AgentContext) -> str:
+        """Build system instructions for session"""
+        if not context.user_rules:
+            return self._instructions_prefix
+
+        parts = [self._instructions_prefix, "", "Правила пользователя:"]
+        for rule in context.user_rules[:3]:
+            parts.append(f"- {rule.get('rule_text', '')}")
 
         return "\n".join(parts)
 
     async def health_check(self) -> Dict[str, Any]:
         """Check agent health"""
-        active_connections = len(self.websockets)
-        healthy = True
-
-        # Check if any connections are alive
-        for session_id, ws in list(self.websockets.items()):
-            if ws.closed:
-                healthy = False
-                logger.warning("Dead WebSocket detected", session_id=session_id)
+        # Listeners drop out of _live_sessions when their socket closes; the
+        # pool's keepalive pings close sockets that stop answering
+        active_connections = len(self._live_sessions)
+        healthy = active_connections == len(self._sessions)
+
+        if not healthy:
+            logger.warning(
+                "Dead WebSocket detected",
+                dead_sessions=len(self._sessions) - active_connections,
+            )
 
         return {
             "agent_type": self.agent_type.value,
@@ -641,5 +1176,6 @@ class RealtimeVoiceAgent(BaseAgent):
             "healthy": healthy,
             "active_sessions": len(self.active_sessions),
             "active_connections": active_connections,
+            "dropped_events": sum(s.channel.dropped for s in self._sessions.values()),
             "turn_detection": self.turn_detection.value,
         }
@@ -1,8 +1,12 @@
 """Text-based agent using OpenAI Chat Completions API"""
 
 import json
+import asyncio
 import time
-from typing import Dict, List, Optional, Any, AsyncGenerator
+from dataclasses import replace
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, List, Optional, Any, AsyncGenerator, Tuple
 from openai import AsyncOpenAI, OpenAIError
 from app.agents.base import (
     BaseAgent,
@@ -12,10 +16,63 @@ from app.agents.base import (
     ResponseType,
 )
 from app.core.config import settings
+from app.core.http_client import get_http_client
 from app.core.logging import get_logger
+from app.services.semantic_cache import semantic_cache
+
+# Make orjson optional
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
 
 logger = get_logger(__name__)
 
+# Seconds a successful API health check is reused for
+_HEALTH_CHECK_TTL = 30.0
+
+
+def _loads(text: str) -> Any:
+    """Parse JSON from model output; raises json.JSONDecodeError on invalid input"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+@lru_cache(maxsize=8)
+def _static_system_prompt(
+    assistant_name: str,
+    assistant_style: Tuple[str, ...],
+    assistant_language: str,
+) -> str:
+    """
+    Build the request-independent part of the system prompt
+
+    Kept byte-identical across requests so the provider's prompt cache can
+    reuse it as a prefix.
+    """
+    return "\n".join([
+        f"Ты — {assistant_name}, умный голосовой ассистент для управления домом через Home Assistant.",
+        f"Стиль: {', '.join(assistant_style)}",
+        f"Язык: {assistant_language}",
+        "",
+        "Твои задачи:",
+        "1. Понимать естественные команды пользователя",
+        "2. Планировать действия в Home Assistant",
+        "3. Учитывать контекст и предпочтения пользователя",
+        "4. Запрашивать подтверждение для опасных действий",
+        "",
+        "Для управления домом возвращай JSON:",
+        '{"intent": "...", "actions": [...], "needs_confirmation": true/false, "response": "..."}',
+        "",
+        "ВАЖНО:",
+        "- НЕ выдумывай entity_id! Используй только те, что есть в контексте",
+        "- Опасные действия требуют подтверждения",
+        "- Для обычных вопросов возвращай текст",
+    ])
+
 
 class TextAgent(BaseAgent):
     """
@@ -40,9 +97,32 @@ class TextAgent(BaseAgent):
         self.max_tokens = max_tokens
         self.client: Optional[AsyncOpenAI] = None
 
+        # Completion parameters shared by every request
+        self._request_params: Dict[str, Any] = {
+            "model": self.model,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+        }
+
+        # Settings don't change at runtime, so the static prompt is built once
+        self._system_prompt = _static_system_prompt(
+            settings.assistant_name,
+            tuple(settings.assistant_style_list),
+            settings.assistant_language,
+        )
+        self._warmup_task: Optional[asyncio.Task] = None
+        self._last_health_ok = float("-inf")
+
     async def initialize(self) -> None:
         """Initialize OpenAI client"""
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+        self.client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            http_client=get_http_client(),
+        )
+
+        # Open the TLS connection now rather than on the first user command
+        self._warmup_task = asyncio.create_task(self._warm_up())
+
         logger.info(
             "Text agent initialized",
             model=self.model,
@@ -51,11 +131,21 @@ class TextAgent(BaseAgent):
 
     async def shutdown(self) -> None:
         """Cleanup resources"""
-        if self.client:
-            await self.client.close()
-            self.client = None
+        if self._warmup_task and not self._warmup_task.done():
+            self._warmup_task.cancel()
+        self._warmup_task = None
+
+        # The HTTP pool is shared and closed with the application
+        self.client = None
         logger.info("Text agent shutdown")
 
+    async def _warm_up(self) -> None:
+        """Establish a pooled connection to the API"""
+        try:
+            await self.client.models.list()
+        except Exception as e:
+            logger.warning("Text agent warmup failed", error=str(e))
+
     async def process(
         self,
         context: AgentContext,
@@ -81,19 +171,28 @@ class TextAgent(BaseAgent):
         if not input_text:
             raise ValueError("Text input is required for TextAgent")
 
-        start_time = time.time()
+        start_time = time.monotonic()
+
+        # Tool calls depend on the tools offered, so only plain requests are cached
+        cache_key = None
+        if settings.semantic_cache_enabled and not tools:
+            cache_key = await self._semantic_cache_key(context, input_text)
+            cached = semantic_cache.get(*cache_key) if cache_key else None
+            if cached is not None:
+                self.add_message(context, "user", input_text)
+                self.add_message(context, "assistant", cached.content)
+                return replace(
+                    cached,
+                    latency_ms=(time.monotonic() - start_time) * 1000,
+                    metadata={**cached.metadata, "cached": True},
+                )
 
         # Build messages from context
         messages = self._build_messages(context, input_text)
 
         try:
             # Call OpenAI
-            request_params = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": self.temperature,
-                "max_tokens": self.max_tokens,
-            }
+            request_params = {**self._request_params, "messages": messages}
 
             if tools:
                 request_params["tools"] = tools
@@ -105,7 +204,7 @@ class TextAgent(BaseAgent):
             message = choice.message
 
             # Calculate latency
-            latency_ms = (time.time() - start_time) * 1000
+            latency_ms = (time.monotonic() - start_time) * 1000
 
             # Handle tool calls
             if message.tool_calls:
@@ -117,7 +216,7 @@ class TextAgent(BaseAgent):
                             {
                                 "id": tc.id,
                                 "function": tc.function.name,
-                                "arguments": json.loads(tc.function.arguments),
+                                "arguments": _loads(tc.function.arguments),
                             }
                             for tc in message.tool_calls
                         ],
@@ -135,16 +234,17 @@ class TextAgent(BaseAgent):
             actions = None
             needs_confirmation = False
 
-            try:
-                parsed = json.loads(content)
-                if isinstance(parsed, dict) and "intent" in parsed:
-                    response_type = ResponseType.ACTION_PLAN
-                    actions = parsed.get("actions", [])
-                    needs_confirmation = parsed.get("needs_confirmation", False)
-                    content = parsed.get("response", content)
-            except json.JSONDecodeError:
-                # Not JSON, keep as text
-                pass
+            if self._looks_like_action_plan(content):
+                try:
+                    parsed = _loads(content)
+                    if isinstance(parsed, dict) and "intent" in parsed:
+                        response_type = ResponseType.ACTION_PLAN
+                        actions = parsed.get("actions", [])
+                        needs_confirmation = parsed.get("needs_confirmation", False)
+                        content = parsed.get("response", content)
+                except json.JSONDecodeError:
+                    # Not JSON, keep as text
+                    pass
 
             # Add to context
             self.add_message(context, "assistant", content)
@@ -157,7 +257,7 @@ class TextAgent(BaseAgent):
                 latency_ms=latency_ms,
             )
 
-            return AgentResponse(
+            agent_response = AgentResponse(
                 type=response_type,
                 content=content,
                 actions=actions,
@@ -170,6 +270,12 @@ class TextAgent(BaseAgent):
                 },
             )
 
+            # Action plans act on live HA state, so never replay them
+            if cache_key and response_type == ResponseType.TEXT:
+                semantic_cache.put(*cache_key, agent_response)
+
+            return agent_response
+
         except OpenAIError as e:
             logger.error("OpenAI API error", error=str(e), user_id=context.user_id)
             raise
@@ -207,58 +313,100 @@ class TextAgent(BaseAgent):
         if not input_text:
             raise ValueError("Text input is required")
 
-        start_time = time.time()
+        start_time = time.monotonic()
         messages = self._build_messages(context, input_text)
 
         try:
-            request_params = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": self.temperature,
-                "max_tokens": self.max_tokens,
-                "stream": True,
-            }
+            request_params = {**self._request_params, "messages": messages, "stream": True}
 
             if tools:
                 request_params["tools"] = tools
 
             stream = await self.client.chat.completions.create(**request_params)
 
-            accumulated_content = ""
+            chunks: List[str] = []
             
             async for chunk in stream:
                 if not chunk.choices:
                     continue
 
                 delta = chunk.choices[0].delta
+                finish_reason = chunk.choices[0].finish_reason
                 
                 if delta.content:
-                    accumulated_content += delta.content
+                    chunks.append(delta.content)
+
+                    # Stamp latency on the first, every 8th and the final chunk
+                    latency_ms = None
+                    if len(chunks) % 8 == 1 or finish_reason is not None:
+                        latency_ms = (time.monotonic() - start_time) * 1000
                     
                     yield AgentResponse(
                         type=ResponseType.STREAM,
                         content=delta.content,
                         metadata={
-                            "accumulated": accumulated_content,
-                            "finish_reason": chunk.choices[0].finish_reason,
+                            "finish_reason": finish_reason,
                         },
-                        latency_ms=(time.time() - start_time) * 1000,
+                        latency_ms=latency_ms,
                     )
 
             # Add final message to context
-            if accumulated_content:
-                self.add_message(context, "assistant", accumulated_content)
+            content = "".join(chunks)
+            if content:
+                self.add_message(context, "assistant", content)
 
             logger.info(
                 "Text agent stream completed",
                 user_id=context.user_id,
-                content_length=len(accumulated_content),
+                content_length=len(content),
             )
 
         except Exception as e:
             logger.error("Stream processing failed", error=str(e))
             raise
 
+    @staticmethod
+    def _looks_like_action_plan(content: str) -> bool:
+        """Cheap check that skips the JSON parser for ordinary text replies"""
+        stripped = content.strip()
+        return (
+            stripped.startswith("{")
+            and stripped.endswith("}")
+            and '"intent"' in stripped
+        )
+
+    async def _semantic_cache_key(
+        self,
+        context: AgentContext,
+        input_text: str,
+    ) -> Optional[Tuple[List[float], str]]:
+        """
+        Build the semantic cache key for an input
+
+        Args:
+            context: Agent context, before the input is added to it
+            input_text: Text input
+
+        Returns:
+            (embedding, context hash) or None if embedding failed
+        """
+        embedding = context.input_embedding
+        if embedding is None:
+            try:
+                response = await self.client.embeddings.create(
+                    model="text-embedding-3-small",
+                    input=input_text,
+                )
+            except OpenAIError as e:
+                logger.warning("Semantic cache embedding failed", error=str(e))
+                return None
+            embedding = response.data[0].embedding
+
+        return (
+            embedding,
+            semantic_cache.context_hash(context.user_id, context.messages),
+        )
+
     def _build_messages(
         self,
         context: AgentContext,
@@ -266,7 +414,11 @@ class TextAgent(BaseAgent):
     ) -> List[Dict[str, Any]]:
         """
         Build messages array for OpenAI API
-        
+
+        Stable content goes first so consecutive requests share the longest
+        possible prefix: static system prompt, per-request context, history,
+        then the command itself.
+
         Args:
             context: Agent context
             current_input: Current user input
@@ -274,70 +426,45 @@ class TextAgent(BaseAgent):
         Returns:
             List of message dictionaries
         """
-        messages = []
+        messages = [{"role": "system", "content": self._build_system_prompt()}]
 
-        # System message with context
-        system_content = self._build_system_prompt(context)
-        messages.append({"role": "system", "content": system_content})
+        # User rules, HA summary and memories change between requests
+        dynamic_context = self._build_context_message(context)
+        if dynamic_context:
+            messages.append({"role": "system", "content": dynamic_context})
 
         # Recent conversation history (last 10 messages)
-        for msg in context.messages[-10:]:
-            messages.append({
-                "role": msg.role,
-                "content": msg.content,
-            })
+        history = context.messages
+        messages.extend(
+            msg.api_message
+            for msg in islice(history, max(0, len(history) - 10), None)
+        )
 
         # Current input
-        user_message = self._build_user_message(context, current_input)
-        messages.append({"role": "user", "content": user_message})
+        messages.append({"role": "user", "content": f"Команда: {current_input}"})
 
         # Add to context
         self.add_message(context, "user", current_input)
 
         return messages
 
-    def _build_system_prompt(self, context: AgentContext) -> str:
-        """Build system prompt with context"""
-        prompt_parts = [
-            f"Ты — {settings.assistant_name}, умный голосовой ассистент для управления домом через Home Assistant.",
-            f"Стиль: {', '.join(settings.assistant_style_list)}",
-            f"Язык: {settings.assistant_language}",
-            "",
-            "Твои задачи:",
-            "1. Понимать естественные команды пользователя",
-            "2. Планировать действия в Home Assistant",
-            "3. Учитывать контекст и предпочтения пользователя",
-            "4. Запрашивать подтверждение для опасных действий",
-            "",
-            "Для управления домом возвращай JSON:",
-            '{"intent": "...", "actions": [...], "needs_confirmation": true/false, "response": "..."}',
-            "",
-            "ВАЖНО:",
-            "- НЕ выдумывай entity_id! Используй только те, что есть в контексте",
-            "- Опасные действия требуют подтверждения",
-            "- Для обычных вопросов возвращай текст",
-        ]
-
-        # Add user rules if present
-        if context.user_rules:
-            prompt_parts.append("")
-            prompt_parts.append("Правила пользователя:")
-            for rule in context.user_rules[:5]:
-                prompt_parts.append(f"- {rule.get('rule_text', '')}")
-
-        return "\n".join(prompt_parts)
+    def _build_system_prompt(self) -> str:
+        """Get the static system prompt"""
+        return self._system_prompt
 
-    def _build_user_message(
-        self,
-        context: AgentContext,
-        input_text: str,
-    ) -> str:
-        """Build user message with context"""
+    def _build_context_message(self, context: AgentContext) -> str:
+        """Build the per-request context message"""
         parts = []
 
+        if context.user_rules:
+            parts.append("Правила пользователя:")
+            parts.extend("- " + rule.get("rule_text", "") for rule in context.user_rules[:5])
+
         # HA context summary
         if context.ha_context:
             ha_ctx = context.ha_context
+            if parts:
+                parts.append("")
             parts.append("Контекст Home Assistant:")
             parts.append(f"- Устройств: {ha_ctx.get('total_entities', 0)}")
             
@@ -346,25 +473,25 @@ class TextAgent(BaseAgent):
 
         # Relevant memories
         if context.relevant_memories:
-            parts.append("")
+            if parts:
+                parts.append("")
             parts.append("Из истории:")
             for memory in context.relevant_memories[:2]:
                 parts.append(f"- {memory.get('content', '')[:100]}")
 
-        # Current command
-        parts.append("")
-        parts.append(f"Команда: {input_text}")
-
         return "\n".join(parts)
 
     async def health_check(self) -> Dict[str, Any]:
         """Check agent health"""
         healthy = self.client is not None
-        
-        if healthy:
+
+        # Probes fire every few seconds; a recent success is good enough
+        now = time.monotonic()
+        if healthy and now - self._last_health_ok >= _HEALTH_CHECK_TTL:
             try:
-                # Simple test call
-                await self.client.models.list()
+                # Fetch just our model rather than the whole model list
+                await self.client.with_options(timeout=3.0).models.retrieve(self.model)
+                self._last_health_ok = now
             except Exception as e:
                 healthy = False
                 logger.error("Text agent health check failed", error=str(e))
@@ -0,0 +1,60 @@
+"""JSON encoding for API responses and WebSocket frames"""
+
+import json
+from typing import Any
+from fastapi import WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+# Make orjson optional
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+# ORJSONResponse needs orjson at render time
+JSONResponseClass = ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+
+
+def dumps(payload: Any) -> str:
+    """Serialize a payload to a JSON text frame"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload).decode("utf-8")
+    return json.dumps(payload)
+
+
+def loads(frame: Any) -> Any:
+    """Parse a JSON text or binary frame"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(frame)
+    return json.loads(frame)
+
+
+async def receive_json(websocket: WebSocket) -> Any:
+    """
+    Receive one JSON frame, text or binary
+
+    Args:
+        websocket: Accepted WebSocket
+
+    Returns:
+        Parsed payload
+
+    Raises:
+        WebSocketDisconnect: If the client disconnected
+    """
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+
+    frame = message.get("text")
+    if frame is None:
+        frame = message.get("bytes")
+    return loads(frame)
+
+
+# Static replies, serialized once
+PONG_FRAME = dumps({"type": "pong"})
+PING_FRAME = dumps({"type": "ping"})
+NOT_CONFIGURED_FRAME = dumps({"type": "error", "message": "Not configured"})
@@ -0,0 +1,212 @@
+"""ASGI middleware"""
+
+import time
+from math import ceil
+from typing import Iterable, Optional
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.api import frames
+from app.core.rate_limiter import rate_limiter
+from app.core.logging import get_logger
+from app.services.monitoring import metrics
+
+logger = get_logger(__name__)
+
+_TOO_MANY_REQUESTS_BODY = b'{"detail":"Too many requests"}'
+
+
+class RateLimitMiddleware:
+    """
+    Per-client HTTP rate limiting ahead of routing.
+    
+    Rejected requests are answered with 429 straight from the ASGI layer,
+    without routing, dependency resolution or body validation.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rate_per_minute: int,
+        trust_forwarded: bool = False,
+        exempt_paths: Iterable[str] = ("/healthz", "/readyz", "/metrics"),
+    ):
+        """Initialize middleware
+        
+        Args:
+            app: Wrapped ASGI application
+            rate_per_minute: Requests allowed per client per minute
+            trust_forwarded: Identify clients by X-Forwarded-For
+            exempt_paths: Paths never limited (probes and scrapes)
+        """
+        self.app = app
+        self.rate_per_minute = rate_per_minute
+        self.trust_forwarded = trust_forwarded
+        self.exempt_paths = frozenset(exempt_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        allowed, wait_time = rate_limiter.check_limit(
+            "http",
+            self.rate_per_minute,
+            self._client_id(scope),
+        )
+        if allowed:
+            await self.app(scope, receive, send)
+            return
+
+        logger.warning("HTTP rate limit exceeded", path=scope["path"], wait_time=wait_time)
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(_TOO_MANY_REQUESTS_BODY)).encode()),
+                (b"retry-after", str(ceil(wait_time)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": _TOO_MANY_REQUESTS_BODY})
+
+    def _client_id(self, scope: Scope) -> str:
+        """Resolve client identifier from proxy header or socket peer"""
+        if self.trust_forwarded:
+            forwarded = _header(scope, b"x-forwarded-for")
+            if forwarded:
+                return forwarded.split(",", 1)[0].strip()
+
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+
+class TimingMiddleware:
+    """
+    Request timing and metrics.
+    
+    Pure ASGI: response messages pass straight through with the timing
+    header added, instead of each request being run in a separate task
+    as BaseHTTPMiddleware does. Timing stops when the response starts.
+    Unhandled exceptions are recorded as 500s and re-raised for
+    internal_error_handler.
+    """
+
+    def __init__(self, app: ASGIApp, log_requests: bool = False):
+        """Initialize middleware
+        
+        Args:
+            app: Wrapped ASGI application
+            log_requests: Log each request and tag it with an X-Request-ID
+        """
+        self.app = app
+        self.log_requests = log_requests
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        path = scope["path"]
+        # Wall clock only names the request; durations use the monotonic counter
+        request_id = str(time.time_ns() // 1_000_000) if self.log_requests else None
+        start_ns = time.perf_counter_ns()
+        response_started = False
+
+        if request_id:
+            logger.info("Request started", request_id=request_id, method=method, path=path)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                duration_ns = time.perf_counter_ns() - start_ns
+                status = message["status"]
+
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Process-Time", f"{duration_ns / 1e9:.6f}")
+                if request_id:
+                    headers.append("X-Request-ID", request_id)
+
+                metrics.record_http_request(
+                    method=method,
+                    endpoint=_endpoint_label(scope),
+                    status=status,
+                    duration=duration_ns * 1e-9,
+                )
+
+                if request_id:
+                    logger.info(
+                        "Request completed",
+                        request_id=request_id,
+                        status=status,
+                        duration_ms=duration_ns // 1_000_000,
+                    )
+
+            await send(message)
+
+        # Lets the error handler tag its response
+        if request_id:
+            scope.setdefault("state", {})["request_id"] = request_id
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+
+        except Exception as e:
+            duration_ns = time.perf_counter_ns() - start_ns
+            logger.error(
+                "Request failed",
+                request_id=request_id,
+                error=str(e),
+                path=path,
+                duration_ms=duration_ns // 1_000_000,
+            )
+
+            # The error response is sent by internal_error_handler further out
+            if not response_started:
+                metrics.record_http_request(
+                    method=method,
+                    endpoint=_endpoint_label(scope),
+                    status=500,
+                    duration=duration_ns * 1e-9,
+                )
+            raise
+
+
+async def internal_error_handler(request: Request, exc: Exception) -> Response:
+    """
+    Answer unhandled exceptions with a JSON 500
+    
+    Register with app.add_exception_handler(Exception, ...); Starlette then
+    runs it in its outermost error middleware.
+    """
+    content = {"detail": "Internal server error"}
+    request_id = getattr(request.state, "request_id", None)
+    if request_id:
+        content["request_id"] = request_id
+    return frames.JSONResponseClass(content, status_code=500)
+
+
+def _endpoint_label(scope: Scope) -> str:
+    """
+    Metrics label for a request: the route template, not the raw path
+    
+    Keeps label cardinality bounded by the number of routes. Responses
+    sent without a matched route (unrouted 404s, CORS preflights, 429s
+    from the rate limiter, slash redirects) share one label.
+    """
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path is not None:
+        return path
+    return "unmatched"
+
+
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    """Return first value of a request header"""
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
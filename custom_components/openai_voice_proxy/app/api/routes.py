@@ -1,11 +1,13 @@
 """API route handlers"""
 
-import time
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, List
 from fastapi import APIRouter, HTTPException, Response, WebSocket, WebSocketDisconnect
 from fastapi.responses import StreamingResponse
+from app.api import frames
 from app.api.schemas import (
     CommandRequest, CommandResponse,
+    CommandBatchRequest, CommandBatchResponse,
     ConfirmRequest, ConfirmResponse,
     SearchRequest, SearchResponse,
     HabrSearchRequest, HabrSearchResponse,
@@ -15,7 +17,7 @@ from app.api.schemas import (
 )
 from app.core.config import settings
 from app.core.logging import get_logger
-from app.core.database import engine
+from app.core.database import check_database
 from app.integrations.homeassistant import ha_client
 from app.integrations.openai_client import tts_client
 from app.integrations.perplexity import perplexity_client
@@ -29,57 +31,131 @@ from app import __version__
 logger = get_logger(__name__)
 router = APIRouter()
 
+# Static WebSocket replies, serialized once
+_CONFIGURED_FRAME = frames.dumps({"type": "configured"})
+_NOT_IMPLEMENTED_FRAME = frames.dumps({"type": "error", "message": "Not implemented yet"})
 
-@router.post("/v1/command", response_model=CommandResponse)
+
+@router.post(
+    "/v1/command",
+    response_class=frames.JSONResponseClass,
+    responses={200: {"model": CommandResponse}},
+)
 async def execute_command(request: CommandRequest):
     """Execute user command"""
-    start_time = time.time()
+    loop = asyncio.get_running_loop()
+    start_time = loop.time()
+    ha_context = None
+    tts_tasks: List[asyncio.Task] = []
     
     try:
-        # Get HA context if requested
-        ha_context = None
+        # Fetch HA context in the background; the processor awaits it
+        # alongside its own memory lookups
         if request.include_context:
-            ha_context = await ha_client.get_context()
+            ha_context = asyncio.create_task(ha_client.get_context())
+
+        # Synthesize each sentence while the rest of the reply is generated
+        def speak(sentence: str) -> None:
+            tts_tasks.append(
+                asyncio.create_task(tts_client.synthesize_speech(sentence, format="opus"))
+            )
 
         # Process command
         result = await command_processor.process_command(
             user_id=request.user_id,
             command=request.command,
             ha_context=ha_context,
+            on_sentence=speak,
         )
 
-        # Generate TTS audio
+        # Collect TTS audio; Ogg Opus streams can be chained back to back
         response_text = result.get("response", "")
-        if response_text:
-            audio_bytes = await tts_client.synthesize_speech(response_text, format="opus")
+        if tts_tasks:
+            audio_parts = await asyncio.gather(*tts_tasks)
+            audio_bytes = b"".join(audio_parts)
             # In production, save to storage and return URL
             # For now, we'll include it in the response
             result["audio_size"] = len(audio_bytes)
 
         # Record metrics
-        duration = time.time() - start_time
+        duration = loop.time() - start_time
         intent = result.get("intent", "text_response")
         metrics.record_command(intent, "success", duration)
 
-        return CommandResponse(
-            type=result.get("type", "action_plan"),
-            response=response_text,
-            intent=result.get("intent"),
-            actions=result.get("actions"),
-            needs_confirmation=result.get("needs_confirmation"),
-        )
+        return frames.JSONResponseClass({
+            "type": result.get("type", "action_plan"),
+            "response": response_text,
+            "intent": result.get("intent"),
+            "actions": result.get("actions"),
+            "needs_confirmation": result.get("needs_confirmation"),
+            "audio_url": None,
+        })
 
     except Exception as e:
-        duration = time.time() - start_time
+        for task in [ha_context, *tts_tasks]:
+            if isinstance(task, asyncio.Task) and not task.done():
+                task.cancel()
+        duration = loop.time() - start_time
         metrics.record_command("unknown", "error", duration)
         logger.error("Command execution failed", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/v1/confirm", response_model=ConfirmResponse)
+@router.post(
+    "/v1/command/batch",
+    response_class=frames.JSONResponseClass,
+    responses={200: {"model": CommandBatchResponse}},
+)
+async def execute_command_batch(request: CommandBatchRequest):
+    """Execute several independent commands, e.g. from scheduled automations"""
+    loop = asyncio.get_running_loop()
+    start_time = loop.time()
+
+    try:
+        # One HA context fetch serves the whole batch
+        ha_context = None
+        if request.include_context:
+            ha_context = await ha_client.get_context()
+
+        results = await command_processor.process_commands(
+            user_id=request.user_id,
+            commands=request.commands,
+            ha_context=ha_context,
+        )
+
+        duration = loop.time() - start_time
+        metrics.record_command("batch", "success", duration)
+
+        return frames.JSONResponseClass({
+            "results": [
+                {
+                    "type": result.get("type", "action_plan"),
+                    "response": result.get("response", ""),
+                    "intent": result.get("intent"),
+                    "actions": result.get("actions"),
+                    "needs_confirmation": result.get("needs_confirmation"),
+                    "audio_url": None,
+                }
+                for result in results
+            ],
+        })
+
+    except Exception as e:
+        duration = loop.time() - start_time
+        metrics.record_command("batch", "error", duration)
+        logger.error("Batch command execution failed", error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post(
+    "/v1/confirm",
+    response_class=frames.JSONResponseClass,
+    responses={200: {"model": ConfirmResponse}},
+)
 async def confirm_action(request: ConfirmRequest):
     """Confirm and execute action"""
-    start_time = time.time()
+    loop = asyncio.get_running_loop()
+    start_time = loop.time()
 
     try:
         result = await command_processor.execute_action_plan(
@@ -88,19 +164,19 @@ async def confirm_action(request: ConfirmRequest):
             confirmed=request.confirmed,
         )
 
-        duration = time.time() - start_time
+        duration = loop.time() - start_time
         intent = request.plan.get("intent", "unknown")
         status = "success" if result["success"] else "error"
         metrics.record_command(f"{intent}_confirm", status, duration)
 
-        return ConfirmResponse(
-            success=result["success"],
-            message=result["message"],
-            results=result.get("results"),
-        )
+        return frames.JSONResponseClass({
+            "success": result["success"],
+            "message": result["message"],
+            "results": result.get("results"),
+        })
 
     except Exception as e:
-        duration = time.time() - start_time
+        duration = loop.time() - start_time
         metrics.record_command("confirm", "error", duration)
         logger.error("Action confirmation failed", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -124,10 +200,15 @@ async def get_context():
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/v1/search", response_model=SearchResponse)
+@router.post(
+    "/v1/search",
+    response_class=frames.JSONResponseClass,
+    responses={200: {"model": SearchResponse}},
+)
 async def search_web(request: SearchRequest):
     """Search web via Perplexity"""
-    start_time = time.time()
+    loop = asyncio.get_running_loop()
+    start_time = loop.time()
 
     try:
         result = await perplexity_client.search(
@@ -140,24 +221,28 @@ async def search_web(request: SearchRequest):
         # Generate TTS
         audio_bytes = await tts_client.synthesize_speech(result["answer"], format="opus")
 
-        duration = time.time() - start_time
+        duration = loop.time() - start_time
         metrics.record_perplexity_search(result["category"], "success", duration)
 
-        return SearchResponse(
-            answer=result["answer"],
-            sources=result["sources"],
-            category=result["category"],
-            recency=result["recency"],
-        )
+        return frames.JSONResponseClass({
+            "answer": result["answer"],
+            "sources": result["sources"],
+            "category": result["category"],
+            "recency": result["recency"],
+        })
 
     except Exception as e:
-        duration = time.time() - start_time
+        duration = loop.time() - start_time
         metrics.record_perplexity_search("unknown", "error", duration)
         logger.error("Search failed", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/v1/habr/search", response_model=HabrSearchResponse)
+@router.get(
+    "/v1/habr/search",
+    response_class=frames.JSONResponseClass,
+    responses={200: {"model": HabrSearchResponse}},
+)
 async def search_habr(
     query: str = None,
     tags: str = None,
@@ -166,7 +251,8 @@ async def search_habr(
     limit: int = 10,
 ):
     """Search Habr articles"""
-    start_time = time.time()
+    loop = asyncio.get_running_loop()
+    start_time = loop.time()
 
     try:
         tags_list = tags.split(",") if tags else None
@@ -180,17 +266,17 @@ async def search_habr(
             limit=limit,
         )
 
-        duration = time.time() - start_time
+        duration = loop.time() - start_time
         method = "rss" if not query else "html"
         metrics.record_habr_search(method, "success", duration)
 
-        return HabrSearchResponse(
-            articles=articles,
-            count=len(articles),
-        )
+        return frames.JSONResponseClass({
+            "articles": articles,
+            "count": len(articles),
+        })
 
     except Exception as e:
-        duration = time.time() - start_time
+        duration = loop.time() - start_time
         metrics.record_habr_search("unknown", "error", duration)
         logger.error("Habr search failed", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -261,11 +347,7 @@ async def healthcheck():
     }
 
     # Check database
-    try:
-        async with engine.begin() as conn:
-            await conn.execute("SELECT 1")
-    except:
-        checks["database"] = False
+    checks["database"] = await check_database()
 
     # Update metrics
     metrics.set_database_health(checks["database"])
@@ -308,20 +390,17 @@ async def realtime_websocket(websocket: WebSocket):
         # For now, it's a placeholder
         
         while True:
-            data = await websocket.receive_json()
+            data = await frames.receive_json(websocket)
             
             # Process message
             message_type = data.get("type")
             
             if message_type == "ping":
-                await websocket.send_json({"type": "pong"})
+                await websocket.send_text(frames.PONG_FRAME)
             elif message_type == "configure":
-                await websocket.send_json({"type": "configured"})
+                await websocket.send_text(_CONFIGURED_FRAME)
             else:
-                await websocket.send_json({
-                    "type": "error",
-                    "message": "Not implemented yet"
-                })
+                await websocket.send_text(_NOT_IMPLEMENTED_FRAME)
 
     except WebSocketDisconnect:
         logger.info("WebSocket connection closed")
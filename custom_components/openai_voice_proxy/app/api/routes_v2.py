@@ -1,11 +1,14 @@
 """Updated API routes with new architecture"""
 
 import time
+from time import perf_counter
 import json
 import asyncio
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from fastapi import APIRouter, HTTPException, Response, WebSocket, WebSocketDisconnect
 from fastapi.responses import StreamingResponse
+from websockets.exceptions import ConnectionClosed
+from app.api import frames
 from app.api.schemas import (
     CommandRequest, CommandResponse,
     ConfirmRequest, ConfirmResponse,
@@ -17,7 +20,7 @@ from app.api.schemas import (
 )
 from app.core.config import settings
 from app.core.logging import get_logger
-from app.core.database import engine
+from app.core.database import check_database
 from app.integrations.homeassistant import ha_client
 from app.integrations.habr import habr_client
 from app.integrations.telegram_bot import telegram_client
@@ -25,7 +28,7 @@ from app.services.pipeline.orchestrator import pipeline
 from app.services.memory_v2.manager import memory_manager
 from app.services.tts.openai_tts import openai_tts
 from app.services.search.perplexity_enhanced import enhanced_perplexity_client
-from app.agents.realtime_voice_agent import RealtimeVoiceAgent
+from app.agents.realtime_voice_agent import EventChannel, RealtimeVoiceAgent
 from app.services.monitoring import metrics, get_metrics, get_content_type
 from app.core.rate_limiter import rate_limiter
 from app import __version__
@@ -35,43 +38,112 @@ router = APIRouter()
 
 
 class WebSocketRateLimiter:
-    """Simple rate limiter for WebSocket messages"""
+    """Token-bucket rate limiter for WebSocket messages
+    
+    Buckets are per user, not per connection, so reconnecting does not
+    restore spent tokens.
+    """
     
     def __init__(self, max_messages_per_minute: int = 60):
         self.max_messages = max_messages_per_minute
-        self.user_messages: Dict[str, list] = {}
+        self.refill_rate = max_messages_per_minute / 60.0
+        # user_id -> (tokens, last_refill)
+        self.buckets: Dict[str, Tuple[float, float]] = {}
+        # user_id -> open connections
+        self.connections: Dict[str, int] = {}
     
-    def check_limit(self, user_id: str) -> tuple[bool, float]:
+    def check_limit(self, user_id: str) -> Tuple[bool, float]:
         """Check if user is within rate limit"""
-        import time
-        current_time = time.time()
+        now = time.monotonic()
+        tokens, last_refill = self.buckets.get(user_id, (self.max_messages, now))
         
-        # Clean old messages
-        if user_id in self.user_messages:
-            self.user_messages[user_id] = [
-                t for t in self.user_messages[user_id]
-                if current_time - t < 60
-            ]
-        else:
-            self.user_messages[user_id] = []
+        # Refill for the time elapsed since the last message
+        tokens = min(self.max_messages, tokens + (now - last_refill) * self.refill_rate)
         
-        # Check limit
-        if len(self.user_messages[user_id]) >= self.max_messages:
-            wait_time = 60 - (current_time - self.user_messages[user_id][0])
-            return False, wait_time
+        if tokens < 1:
+            self.buckets[user_id] = (tokens, now)
+            return False, (1 - tokens) / self.refill_rate
         
-        # Add current message
-        self.user_messages[user_id].append(current_time)
+        self.buckets[user_id] = (tokens - 1, now)
         return True, 0.0
 
+    def connect(self, user_id: str) -> None:
+        """Count a connection opened by the user"""
+        self.connections[user_id] = self.connections.get(user_id, 0) + 1
+
+    def release(self, user_id: str) -> None:
+        """Count a connection closed by the user
+        
+        Spent tokens stay spent. The bucket is dropped only once the user
+        has no connections left and it has refilled, when forgetting it
+        changes nothing.
+        """
+        remaining = self.connections.get(user_id, 0) - 1
+        if remaining > 0:
+            self.connections[user_id] = remaining
+            return
+        self.connections.pop(user_id, None)
+
+        bucket = self.buckets.get(user_id)
+        if bucket is None:
+            return
+        tokens, last_refill = bucket
+        if tokens + (time.monotonic() - last_refill) * self.refill_rate >= self.max_messages:
+            del self.buckets[user_id]
+
 
 ws_rate_limiter = WebSocketRateLimiter(max_messages_per_minute=120)
 
+# Seconds of outbound silence before the realtime socket sends a ping
+_KEEPALIVE_INTERVAL = 30.0
 
-@router.post("/v1/command", response_model=CommandResponse)
+# Queued into the event channel by the keepalive timer, matched by identity
+_KEEPALIVE_EVENT = {"type": "ping"}
+
+# Upper bound on buffered audio deltas merged into one outbound frame
+_MAX_COALESCED_DELTAS = 16
+
+
+def _coalesce_audio_deltas(event: Dict[str, Any], channel: EventChannel) -> Dict[str, Any]:
+    """
+    Merge audio deltas already buffered behind event into one delta
+    
+    Base64 strings concatenate cleanly only while the leading part is
+    unpadded, so merging stops after the first padded chunk.
+    
+    Args:
+        event: response.audio.delta event just taken from the channel
+        channel: Session event channel
+        
+    Returns:
+        The event itself, or a copy carrying the merged delta
+    """
+    parts = [event["delta"]]
+    item_id = event.get("item_id")
+
+    while len(parts) < _MAX_COALESCED_DELTAS and not parts[-1].endswith("="):
+        pending = channel.peek()
+        if (
+            pending is None
+            or pending.get("type") != "response.audio.delta"
+            or pending.get("item_id") != item_id
+        ):
+            break
+        parts.append(channel.get_nowait()["delta"])
+
+    if len(parts) == 1:
+        return event
+    return {**event, "delta": "".join(parts)}
+
+
+@router.post(
+    "/v1/command",
+    response_class=frames.JSONResponseClass,
+    responses={200: {"model": CommandResponse}},
+)
 async def execute_command(request: CommandRequest):
     """Execute user command through new pipeline"""
-    start_time = time.time()
+    start_time = perf_counter()
     
     try:
         # Process through pipeline
@@ -83,31 +155,36 @@ async def execute_command(request: CommandRequest):
         )
 
         # Record metrics
-        duration = time.time() - start_time
+        duration = perf_counter() - start_time
         intent = response.get("intent", "unknown")
         metrics.record_command(intent, "success", duration)
 
-        # Format response
-        return CommandResponse(
-            type=response.get("type", "text_response"),
-            response=response.get("text", ""),
-            intent=response.get("intent"),
-            actions=response.get("actions"),
-            needs_confirmation=response.get("needs_confirmation", False),
-            metadata=response.get("pipeline"),
-        )
+        # Format response; built as a dict, so no model validation pass
+        return frames.JSONResponseClass({
+            "type": response.get("type", "text_response"),
+            "response": response.get("text", ""),
+            "intent": response.get("intent"),
+            "actions": response.get("actions"),
+            "needs_confirmation": response.get("needs_confirmation", False),
+            "audio_url": None,
+            "metadata": response.get("pipeline"),
+        })
 
     except Exception as e:
-        duration = time.time() - start_time
+        duration = perf_counter() - start_time
         metrics.record_command("unknown", "error", duration)
         logger.error("Command execution failed", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/v1/confirm", response_model=ConfirmResponse)
+@router.post(
+    "/v1/confirm",
+    response_class=frames.JSONResponseClass,
+    responses={200: {"model": ConfirmResponse}},
+)
 async def confirm_action(request: ConfirmRequest):
     """Confirm and execute action"""
-    start_time = time.time()
+    start_time = perf_counter()
 
     try:
         response = await pipeline.process_confirmation(
@@ -116,19 +193,20 @@ async def confirm_action(request: ConfirmRequest):
             confirmed=request.confirmed,
         )
 
-        duration = time.time() - start_time
+        duration = perf_counter() - start_time
         intent = request.plan.get("intent", "unknown")
-        status = "success" if response.get("execution", {}).get("success", True) else "error"
+        execution = response.get("execution", {})
+        status = "success" if execution.get("success", True) else "error"
         metrics.record_command(f"{intent}_confirm", status, duration)
 
-        return ConfirmResponse(
-            success=response.get("execution", {}).get("success", True),
-            message=response.get("text", ""),
-            results=response.get("execution", {}).get("results"),
-        )
+        return frames.JSONResponseClass({
+            "success": execution.get("success", True),
+            "message": response.get("text", ""),
+            "results": execution.get("results"),
+        })
 
     except Exception as e:
-        duration = time.time() - start_time
+        duration = perf_counter() - start_time
         metrics.record_command("confirm", "error", duration)
         logger.error("Action confirmation failed", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -152,10 +230,14 @@ async def get_context():
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/v1/search", response_model=SearchResponse)
+@router.post(
+    "/v1/search",
+    response_class=frames.JSONResponseClass,
+    responses={200: {"model": SearchResponse}},
+)
 async def search_web(request: SearchRequest):
     """Search web via enhanced Perplexity"""
-    start_time = time.time()
+    start_time = perf_counter()
 
     try:
         result = await enhanced_perplexity_client.search(
@@ -165,23 +247,73 @@ async def search_web(request: SearchRequest):
             max_results=request.max_results,
         )
 
-        duration = time.time() - start_time
+        duration = perf_counter() - start_time
         metrics.record_perplexity_search(result["category"], "success", duration)
 
-        return SearchResponse(
-            answer=result["answer"],
-            sources=result["sources"],
-            category=result["category"],
-            recency=result["policy"].get("recency_days"),
-            metadata=result.get("policy"),
-        )
+        return frames.JSONResponseClass({
+            "answer": result["answer"],
+            "sources": result["sources"],
+            "category": result["category"],
+            "recency": result["policy"].get("recency_days"),
+            "metadata": result.get("policy"),
+        })
+
+    except Exception as e:
+        duration = perf_counter() - start_time
+        metrics.record_perplexity_search("unknown", "error", duration)
+        logger.error("Search failed", error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/v1/search/stream")
+async def search_web_stream(request: SearchRequest):
+    """
+    Search web via enhanced Perplexity, streaming the answer as it is generated
+    
+    Responds with newline-delimited JSON: "delta" events carrying answer
+    text, then a "done" event with the remaining SearchResponse fields.
+    """
+    start_time = perf_counter()
 
+    events = enhanced_perplexity_client.stream_search(
+        query=request.query,
+        requested_recency_days=request.recency_days,
+        category=request.category,
+        max_results=request.max_results,
+    )
+
+    # Failures before the first event still get a proper error status
+    try:
+        first_event = await anext(events)
     except Exception as e:
-        duration = time.time() - start_time
+        duration = perf_counter() - start_time
         metrics.record_perplexity_search("unknown", "error", duration)
         logger.error("Search failed", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
+    async def body():
+        category = "unknown"
+        status = "error"
+        event = first_event
+        try:
+            while True:
+                if event["type"] == "done":
+                    category = event["category"]
+                    status = "success"
+                yield frames.dumps(event) + "\n"
+                event = await anext(events)
+        except StopAsyncIteration:
+            pass
+        except Exception as e:
+            logger.error("Search stream failed", error=str(e))
+            yield frames.dumps({"type": "error", "message": str(e)}) + "\n"
+        finally:
+            metrics.record_perplexity_search(category, status, perf_counter() - start_time)
+            # Closes the upstream response if the client went away mid-stream
+            await events.aclose()
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
 
 @router.get("/v1/habr/search", response_model=HabrSearchResponse)
 async def search_habr(
@@ -192,7 +324,7 @@ async def search_habr(
     limit: int = 10,
 ):
     """Search Habr articles"""
-    start_time = time.time()
+    start_time = perf_counter()
 
     try:
         tags_list = tags.split(",") if tags else None
@@ -206,7 +338,7 @@ async def search_habr(
             limit=limit,
         )
 
-        duration = time.time() - start_time
+        duration = perf_counter() - start_time
         method = "rss" if not query else "html"
         metrics.record_habr_search(method, "success", duration)
 
@@ -216,7 +348,7 @@ async def search_habr(
         )
 
     except Exception as e:
-        duration = time.time() - start_time
+        duration = perf_counter() - start_time
         metrics.record_habr_search("unknown", "error", duration)
         logger.error("Habr search failed", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -244,34 +376,34 @@ async def send_telegram(request: TelegramSendRequest):
 @router.get("/healthz", response_model=HealthResponse)
 async def healthcheck():
     """Health check endpoint"""
+    async def check_pipeline() -> bool:
+        try:
+            pipeline_health = await pipeline.health_check()
+            return pipeline_health.get("pipeline") == "healthy"
+        except Exception:
+            return False
+
+    async def check_memory() -> bool:
+        try:
+            memory_health = await memory_manager.health_check()
+            return memory_health.get("overall") == "healthy"
+        except Exception:
+            return False
+
+    # Probes are independent, so the slowest one bounds the latency
+    database_ok, pipeline_ok, memory_ok = await asyncio.gather(
+        check_database(),
+        check_pipeline(),
+        check_memory(),
+    )
+
     checks = {
-        "database": True,
-        "pipeline": True,
-        "memory": True,
+        "database": database_ok,
+        "pipeline": pipeline_ok,
+        "memory": memory_ok,
         "homeassistant": True,
     }
 
-    # Check database
-    try:
-        async with engine.begin() as conn:
-            await conn.execute("SELECT 1")
-    except:
-        checks["database"] = False
-
-    # Check pipeline
-    try:
-        pipeline_health = await pipeline.health_check()
-        checks["pipeline"] = pipeline_health.get("pipeline") == "healthy"
-    except:
-        checks["pipeline"] = False
-
-    # Check memory
-    try:
-        memory_health = await memory_manager.health_check()
-        checks["memory"] = memory_health.get("overall") == "healthy"
-    except:
-        checks["memory"] = False
-
     # Update metrics
     metrics.set_database_health(checks["database"])
     metrics.set_system_health(all(checks.values()))
@@ -323,175 +455,195 @@ async def realtime_websocket(websocket: WebSocket):
 
     session_id = None
     user_id = None
-    event_listener_task = None
 
     async def listen_and_forward_events():
         """Listen to agent events and forward to client"""
         if not session_id:
             return
             
-        queue = voice_agent.event_handlers.get(session_id)
-        if not queue:
+        channel = voice_agent.get_event_channel(session_id)
+        if not channel:
             return
         
+        # Keepalive timer re-arms itself instead of a timeout on every wait;
+        # it only queues a ping after a full idle interval
+        loop = asyncio.get_running_loop()
+        last_send = loop.time()
+        keepalive_handle = None
+
+        def keepalive() -> None:
+            nonlocal keepalive_handle
+            idle = loop.time() - last_send
+            if idle >= _KEEPALIVE_INTERVAL:
+                channel.put(_KEEPALIVE_EVENT)
+                idle = 0.0
+            keepalive_handle = loop.call_later(_KEEPALIVE_INTERVAL - idle, keepalive)
+
+        keepalive_handle = loop.call_later(_KEEPALIVE_INTERVAL, keepalive)
+
         try:
             while True:
-                # Get event from agent's queue
-                try:
-                    event = await asyncio.wait_for(queue.get(), timeout=30.0)
-                except asyncio.TimeoutError:
-                    # Send keepalive ping
-                    await websocket.send_json({"type": "ping"})
-                    continue
-                
-                event_type = event.get("type")
+                # Get event from agent's channel
+                event = await channel.get()
                 
                 # Forward event to client
                 try:
-                    # For audio events, keep base64 encoding
-                    if event_type in ["response.audio.delta", "response.audio_transcript.delta"]:
-                        await websocket.send_json(event)
-                        metrics.record_websocket_message("outbound", event_type)
-                    
-                    # For other events, forward as-is
+                    if event is _KEEPALIVE_EVENT:
+                        await websocket.send_text(frames.PING_FRAME)
                     else:
-                        await websocket.send_json(event)
+                        event_type = event.get("type")
+                        # Audio produced faster than we send goes out in fewer, larger frames
+                        if event_type == "response.audio.delta":
+                            event = _coalesce_audio_deltas(event, channel)
+                        await websocket.send_text(frames.dumps(event))
                         metrics.record_websocket_message("outbound", event_type)
+                        logger.debug("Forwarded event to client", event_type=event_type)
                     
-                    logger.debug("Forwarded event to client", event_type=event_type)
-                    
-                except Exception as e:
-                    logger.error("Failed to forward event", error=str(e))
+                except (WebSocketDisconnect, ConnectionClosed, RuntimeError) as e:
+                    # Client went away; Starlette raises RuntimeError on send after close
+                    logger.debug("Client closed, stopped forwarding", error=type(e).__name__)
                     break
+
+                last_send = loop.time()
                     
         except asyncio.CancelledError:
             logger.debug("Event listener cancelled")
+            raise
         except Exception as e:
             logger.error("Event listener error", error=str(e))
+        finally:
+            keepalive_handle.cancel()
 
     try:
-        while True:
-            # Receive message from client
-            data = await websocket.receive_json()
-            message_type = data.get("type")
+        # The listener is cancelled with the group when the receive loop exits
+        async with asyncio.TaskGroup() as tg:
+            while True:
+                # Receive message from client
+                data = await frames.receive_json(websocket)
+                message_type = data.get("type")
             
-            metrics.record_websocket_message("inbound", message_type)
+                metrics.record_websocket_message("inbound", message_type)
             
-            # Check rate limit (skip for pings and audio chunks)
-            if message_type not in ["ping", "audio_input"] and user_id:
-                allowed, wait_time = ws_rate_limiter.check_limit(user_id)
-                if not allowed:
-                    await websocket.send_json({
-                        "type": "error",
-                        "message": f"Rate limit exceeded. Wait {wait_time:.1f} seconds.",
-                    })
-                    continue
-
-            if message_type == "configure":
-                # Configure session
-                user_id = data.get("user_id", "anonymous")
-                session_id = f"{user_id}_{int(time.time())}"
-                instructions = data.get("instructions", "Ты — голосовой ассистент.")
-                tools = data.get("tools", [])
-
-                # Connect session
-                await voice_agent.connect_session(
-                    session_id=session_id,
-                    instructions=instructions,
-                    tools=tools,
-                )
-
-                # Start event listener task
-                event_listener_task = asyncio.create_task(listen_and_forward_events())
-
-                await websocket.send_json({
-                    "type": "configured",
-                    "session_id": session_id,
-                })
+                # Check rate limit (skip for pings and audio chunks)
+                if message_type not in ["ping", "audio_input"] and user_id:
+                    allowed, wait_time = ws_rate_limiter.check_limit(user_id)
+                    if not allowed:
+                        await websocket.send_text(frames.dumps({
+                            "type": "error",
+                            "message": f"Rate limit exceeded. Wait {wait_time:.1f} seconds.",
+                        }))
+                        continue
+
+                if message_type == "configure":
+                    # Configure session
+                    configured_user_id = data.get("user_id", "anonymous")
+                    if configured_user_id != user_id:
+                        if user_id:
+                            ws_rate_limiter.release(user_id)
+                        ws_rate_limiter.connect(configured_user_id)
+                    user_id = configured_user_id
+                    session_id = f"{user_id}_{int(time.time())}"
+                    instructions = data.get("instructions", "Ты — голосовой ассистент.")
+                    tools = data.get("tools", [])
+
+                    # Connect session
+                    await voice_agent.connect_session(
+                        session_id=session_id,
+                        instructions=instructions,
+                        tools=tools,
+                    )
+
+                    # Start event listener task
+                    tg.create_task(listen_and_forward_events())
+
+                    await websocket.send_text(frames.dumps({
+                        "type": "configured",
+                        "session_id": session_id,
+                    }))
                 
-                logger.info("Session configured", session_id=session_id, user_id=user_id)
-
-            elif message_type == "audio_input":
-                # Receive audio chunk
-                if not session_id:
-                    await websocket.send_json({"type": "error", "message": "Not configured"})
-                    continue
-
-                audio_base64 = data.get("audio")
-                if audio_base64:
-                    import base64
-                    audio_data = base64.b64decode(audio_base64)
-                    await voice_agent.send_audio(session_id, audio_data)
-
-            elif message_type == "audio_commit":
-                # Commit audio buffer (triggers response generation)
-                if not session_id:
-                    await websocket.send_json({"type": "error", "message": "Not configured"})
-                    continue
-
-                await voice_agent.commit_audio(session_id)
-                logger.debug("Audio buffer committed", session_id=session_id)
-
-            elif message_type == "text_input":
-                # Receive text input (triggers response generation)
-                if not session_id:
-                    await websocket.send_json({"type": "error", "message": "Not configured"})
-                    continue
-
-                text = data.get("text")
-                if text:
-                    await voice_agent.send_text(session_id, text)
-                    logger.debug("Text input sent", session_id=session_id, text_length=len(text))
-
-            elif message_type == "cancel":
-                # Cancel response (barge-in)
-                if session_id:
-                    await voice_agent.cancel_response(session_id)
-                    logger.info("Response cancelled (barge-in)", session_id=session_id)
-
-            elif message_type == "function_result":
-                # Function call result
-                if not session_id:
-                    await websocket.send_json({"type": "error", "message": "Not configured"})
-                    continue
-
-                call_id = data.get("call_id")
-                output = data.get("output")
+                    logger.info("Session configured", session_id=session_id, user_id=user_id)
+
+                elif message_type == "audio_input":
+                    # Receive audio chunk
+                    if not session_id:
+                        await websocket.send_text(frames.NOT_CONFIGURED_FRAME)
+                        continue
+
+                    # Realtime API takes base64 audio, so forward it without decoding
+                    audio_base64 = data.get("audio")
+                    if audio_base64 and isinstance(audio_base64, str):
+                        try:
+                            await voice_agent.send_audio_base64(session_id, audio_base64)
+                        except ValueError as e:
+                            await websocket.send_text(frames.dumps({
+                                "type": "error",
+                                "message": str(e),
+                            }))
+
+                elif message_type == "audio_commit":
+                    # Commit audio buffer (triggers response generation)
+                    if not session_id:
+                        await websocket.send_text(frames.NOT_CONFIGURED_FRAME)
+                        continue
+
+                    await voice_agent.commit_audio(session_id)
+                    logger.debug("Audio buffer committed", session_id=session_id)
+
+                elif message_type == "text_input":
+                    # Receive text input (triggers response generation)
+                    if not session_id:
+                        await websocket.send_text(frames.NOT_CONFIGURED_FRAME)
+                        continue
+
+                    text = data.get("text")
+                    if text:
+                        await voice_agent.send_text(session_id, text)
+                        logger.debug("Text input sent", session_id=session_id, text_length=len(text))
+
+                elif message_type == "cancel":
+                    # Cancel response (barge-in)
+                    if session_id:
+                        await voice_agent.cancel_response(session_id)
+                        logger.info("Response cancelled (barge-in)", session_id=session_id)
+
+                elif message_type == "function_result":
+                    # Function call result
+                    if not session_id:
+                        await websocket.send_text(frames.NOT_CONFIGURED_FRAME)
+                        continue
+
+                    call_id = data.get("call_id")
+                    output = data.get("output")
                 
-                if call_id and output:
-                    await voice_agent.send_function_result(session_id, call_id, output)
-                    logger.debug("Function result sent", call_id=call_id)
+                    if call_id and output:
+                        await voice_agent.send_function_result(session_id, call_id, output)
+                        logger.debug("Function result sent", call_id=call_id)
 
-            elif message_type == "ping":
-                # Ping/pong
-                await websocket.send_json({"type": "pong"})
+                elif message_type == "ping":
+                    # Ping/pong
+                    await websocket.send_text(frames.PONG_FRAME)
 
-            else:
-                await websocket.send_json({
-                    "type": "error",
-                    "message": f"Unknown message type: {message_type}",
-                })
+                else:
+                    await websocket.send_text(frames.dumps({
+                        "type": "error",
+                        "message": f"Unknown message type: {message_type}",
+                    }))
 
-    except WebSocketDisconnect:
+    except* WebSocketDisconnect:
         logger.info("WebSocket connection closed", session_id=session_id)
-    except Exception as e:
+    except* Exception as group:
+        e = group.exceptions[0]
         logger.error("WebSocket error", error=str(e), session_id=session_id)
         try:
-            await websocket.send_json({"type": "error", "message": str(e)})
-        except:
+            await websocket.send_text(frames.dumps({"type": "error", "message": str(e)}))
+        except Exception:
             pass
     finally:
-        # Cancel event listener
-        if event_listener_task and not event_listener_task.done():
-            event_listener_task.cancel()
-            try:
-                await event_listener_task
-            except asyncio.CancelledError:
-                pass
-        
         # Cleanup
         if session_id:
             await voice_agent.disconnect_session(session_id)
+        if user_id:
+            ws_rate_limiter.release(user_id)
         
         await voice_agent.shutdown()
         metrics.set_websocket_connections(0)
@@ -516,6 +668,7 @@ async def root():
             "command": "POST /v1/command",
             "confirm": "POST /v1/confirm",
             "search": "POST /v1/search",
+            "search_stream": "POST /v1/search/stream",
             "habr": "GET /v1/habr/search",
             "context": "GET /v1/context",
             "realtime": "WS /v1/realtime/ws",
@@ -1,17 +1,28 @@
 """Pydantic schemas for API requests and responses"""
 
-from typing import List, Dict, Optional, Any
-from pydantic import BaseModel, Field
+from typing import List, Dict, Optional, Any, Union
+from pydantic import BaseModel, ConfigDict, Field
 
 
-class CommandRequest(BaseModel):
+class RequestModel(BaseModel):
+    """Base for request bodies; unknown fields are dropped rather than kept"""
+    model_config = ConfigDict(extra="ignore")
+
+
+class ResponseModel(BaseModel):
+    """Base for response bodies; built once and never mutated"""
+    model_config = ConfigDict(frozen=True)
+
+
+class CommandRequest(RequestModel):
     """Command execution request"""
     user_id: str = Field(..., description="User identifier")
     command: str = Field(..., description="User command")
     include_context: bool = Field(default=True, description="Include HA context")
+    include_audio: bool = Field(default=False, description="Synthesize spoken response")
 
 
-class CommandResponse(BaseModel):
+class CommandResponse(ResponseModel):
     """Command execution response"""
     type: str = Field(..., description="Response type (action_plan, text_response)")
     response: str = Field(..., description="Text response")
@@ -19,23 +30,36 @@ class CommandResponse(BaseModel):
     actions: Optional[List[Dict[str, Any]]] = Field(None, description="Actions to execute")
     needs_confirmation: Optional[bool] = Field(None, description="Requires confirmation")
     audio_url: Optional[str] = Field(None, description="URL to audio response")
+    metadata: Optional[Dict[str, Any]] = Field(None, description="Pipeline metadata")
+
+
+class CommandBatchRequest(RequestModel):
+    """Batch command execution request for non-interactive callers"""
+    user_id: str = Field(..., description="User identifier")
+    commands: List[str] = Field(..., min_length=1, max_length=32, description="Commands")
+    include_context: bool = Field(default=True, description="Include HA context")
+
+
+class CommandBatchResponse(ResponseModel):
+    """Batch command execution response"""
+    results: List[CommandResponse] = Field(..., description="Results in command order")
 
 
-class ConfirmRequest(BaseModel):
+class ConfirmRequest(RequestModel):
     """Action confirmation request"""
     user_id: str = Field(..., description="User identifier")
     plan: Dict[str, Any] = Field(..., description="Action plan to confirm")
     confirmed: bool = Field(..., description="User confirmation")
 
 
-class ConfirmResponse(BaseModel):
+class ConfirmResponse(ResponseModel):
     """Action confirmation response"""
     success: bool = Field(..., description="Execution success")
     message: str = Field(..., description="Status message")
     results: Optional[List[Dict[str, Any]]] = Field(None, description="Execution results")
 
 
-class SearchRequest(BaseModel):
+class SearchRequest(RequestModel):
     """Perplexity search request"""
     query: str = Field(..., description="Search query")
     recency_days: Optional[int] = Field(None, description="Recency filter in days")
@@ -43,15 +67,16 @@ class SearchRequest(BaseModel):
     max_results: int = Field(default=5, description="Maximum results")
 
 
-class SearchResponse(BaseModel):
+class SearchResponse(ResponseModel):
     """Search response"""
     answer: str = Field(..., description="Search answer")
     sources: List[str] = Field(..., description="Source URLs")
     category: str = Field(..., description="Search category")
-    recency: Optional[str] = Field(None, description="Applied recency filter")
+    recency: Optional[Union[int, str]] = Field(None, description="Applied recency filter")
+    metadata: Optional[Dict[str, Any]] = Field(None, description="Applied search policy")
 
 
-class HabrSearchRequest(BaseModel):
+class HabrSearchRequest(RequestModel):
     """Habr search request"""
     query: Optional[str] = Field(None, description="Search query")
     tags: Optional[List[str]] = Field(None, description="Filter by tags")
@@ -60,31 +85,31 @@ class HabrSearchRequest(BaseModel):
     limit: int = Field(default=10, description="Maximum results")
 
 
-class HabrSearchResponse(BaseModel):
+class HabrSearchResponse(ResponseModel):
     """Habr search response"""
     articles: List[Dict[str, Any]] = Field(..., description="List of articles")
     count: int = Field(..., description="Total articles found")
 
 
-class TelegramSendRequest(BaseModel):
+class TelegramSendRequest(RequestModel):
     """Telegram message send request"""
     text: str = Field(..., description="Message text")
     parse_mode: str = Field(default="Markdown", description="Parse mode")
 
 
-class AutomationDraftRequest(BaseModel):
+class AutomationDraftRequest(RequestModel):
     """Automation draft request"""
     user_id: str = Field(..., description="User identifier")
     description: str = Field(..., description="Natural language automation description")
 
 
-class AutomationDraftResponse(BaseModel):
+class AutomationDraftResponse(ResponseModel):
     """Automation draft response"""
     automation: Dict[str, Any] = Field(..., description="Generated automation config")
     warnings: List[str] = Field(default_factory=list, description="Validation warnings")
 
 
-class ContextResponse(BaseModel):
+class ContextResponse(ResponseModel):
     """HA context response"""
     config: Dict[str, Any] = Field(..., description="HA configuration")
     total_entities: int = Field(..., description="Total entities")
@@ -92,7 +117,7 @@ class ContextResponse(BaseModel):
     entities_by_domain: Dict[str, List[Dict[str, Any]]] = Field(..., description="Entities by domain")
 
 
-class HealthResponse(BaseModel):
+class HealthResponse(ResponseModel):
     """Health check response"""
     status: str = Field(..., description="Health status")
     version: str = Field(..., description="Application version")
@@ -20,6 +20,11 @@ class Settings(BaseSettings):
     port: int = Field(default=8000, description="Server port")
     debug: bool = Field(default=False, description="Debug mode")
     log_level: str = Field(default="INFO", description="Logging level")
+    workers: int = Field(
+        default=1,
+        description="Server worker processes when run standalone; rate limits, caches "
+        "and metrics are kept per worker",
+    )
 
     # OpenAI
     openai_api_key: str = Field(..., description="OpenAI API key")
@@ -32,6 +37,9 @@ class Settings(BaseSettings):
     openai_realtime_model: str = Field(
         default="gpt-4o-realtime-preview", description="OpenAI Realtime model"
     )
+    realtime_warm_connections: int = Field(
+        default=1, description="Pre-opened Realtime API connections kept per model"
+    )
 
     # Home Assistant
     ha_url: str = Field(..., description="Home Assistant URL")
@@ -57,15 +65,30 @@ class Settings(BaseSettings):
     telegram_chat_id: Optional[str] = Field(
         default=None, description="Telegram chat ID"
     )
+    telegram_connection_pool_size: int = Field(
+        default=32, description="Concurrent Telegram API connections for sending"
+    )
+    telegram_pool_timeout: float = Field(
+        default=10.0, description="Seconds to wait for a free Telegram connection"
+    )
 
     # Database
     database_url: str = Field(
         default="sqlite+aiosqlite:///./data/openai_proxy.db",
         description="Database URL"
     )
+    database_pool_size: int = Field(
+        default=10, description="Persistent database connections (server databases only)"
+    )
+    database_max_overflow: int = Field(
+        default=20, description="Extra connections allowed under burst load"
+    )
     chroma_persist_dir: str = Field(
         default="./chroma_data", description="Chroma persist directory"
     )
+    chroma_workers: int = Field(
+        default=4, description="Worker threads for blocking Chroma calls"
+    )
 
     # Memory
     short_term_memory_size: int = Field(
@@ -74,6 +97,32 @@ class Settings(BaseSettings):
     long_term_memory_enabled: bool = Field(
         default=True, description="Enable long-term memory"
     )
+    ltm_batch_size: int = Field(
+        default=128, description="Maximum long-term memories written per batch"
+    )
+    ltm_flush_interval: float = Field(
+        default=0.05, description="Seconds queued long-term memories wait for a batch"
+    )
+    ltm_query_cache_size: int = Field(
+        default=2000, description="Cached long-term memory searches"
+    )
+    ltm_query_cache_ttl_seconds: int = Field(
+        default=300, description="Long-term memory search cache TTL in seconds"
+    )
+    ltm_query_cache_threshold: float = Field(
+        default=0.97, description="Minimum query cosine similarity to reuse cached search results"
+    )
+    ltm_cache_quantize: bool = Field(
+        default=True, description="Store search cache embeddings as int8"
+    )
+    ltm_max_parallel_queries: int = Field(
+        default=8, description="Concurrent long-term memory collection queries"
+    )
+    ltm_shards: int = Field(
+        default=8,
+        description="Shards per long-term memory collection, by user; changing it "
+        "hides memories stored under the previous layout",
+    )
 
     # Security
     allowed_ha_services: str = Field(
@@ -89,6 +138,9 @@ class Settings(BaseSettings):
     rate_limit_per_minute: int = Field(
         default=60, description="General rate limit per minute"
     )
+    rate_limit_trust_forwarded: bool = Field(
+        default=False, description="Identify clients by X-Forwarded-For (only behind a trusted proxy)"
+    )
     perplexity_rate_limit_per_minute: int = Field(
         default=20, description="Perplexity API rate limit"
     )
@@ -103,6 +155,15 @@ class Settings(BaseSettings):
     perplexity_cache_ttl_minutes: int = Field(
         default=30, description="Perplexity cache TTL in minutes"
     )
+    semantic_cache_enabled: bool = Field(
+        default=False, description="Reuse text answers for semantically identical commands"
+    )
+    semantic_cache_threshold: float = Field(
+        default=0.93, description="Minimum cosine similarity for a semantic cache hit"
+    )
+    semantic_cache_ttl_seconds: int = Field(
+        default=300, description="Semantic cache entry TTL in seconds"
+    )
 
     # Assistant personality
     assistant_name: str = Field(default="Домовой", description="Assistant name")
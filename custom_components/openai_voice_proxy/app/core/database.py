@@ -1,16 +1,68 @@
 """Database setup and models"""
 
+import time
 from datetime import datetime
-from typing import Optional
-from sqlalchemy import String, Integer, DateTime, Text, Boolean, JSON
+from typing import Any, Dict, Optional, Union
+from sqlalchemy import String, Integer, DateTime, Text, Boolean, JSON, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
+# Make orjson optional
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
 from app.core.config import settings
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Binary JSONB on PostgreSQL, plain JSON text elsewhere
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+class utcnow(FunctionElement):
+    """Current UTC time evaluated by the database, as a naive timestamp
+    
+    Used both as the INSERT-time default, rendered inline instead of a bound
+    parameter, and as the DDL server default.
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw) -> str:
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element, compiler, **kw) -> str:
+    # Wall clock rather than transaction start, pinned to UTC
+    return "TIMEZONE('utc', CLOCK_TIMESTAMP())"
+
+
+@compiles(utcnow, "sqlite")
+def _utcnow_sqlite(element, compiler, **kw) -> str:
+    # CURRENT_TIMESTAMP is UTC but only to the second
+    return "STRFTIME('%Y-%m-%d %H:%M:%f', 'NOW')"
+
+
+def _json_serializer(value: Any) -> str:
+    """Serialize JSON column values"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+def _json_deserializer(value: Union[str, bytes]) -> Any:
+    """Deserialize JSON column values"""
+    return orjson.loads(value)
+
 
 class Base(DeclarativeBase):
     """Base class for all database models"""
@@ -20,19 +72,31 @@ class Base(DeclarativeBase):
 class DialogHistory(Base):
     """Dialog history storage with memory V2 support"""
     __tablename__ = "dialog_history"
+    # Composite indexes match the per-user queries; fewer B-trees to update per insert
+    __table_args__ = (
+        Index("ix_dialog_history_user_ts", "user_id", "timestamp"),
+        Index("ix_dialog_history_user_type_ts", "user_id", "memory_type", "timestamp"),
+        # Expiry sweep runs across users; only rows with a TTL are indexed
+        Index(
+            "ix_dialog_history_expires_at",
+            "expires_at",
+            postgresql_where=text("expires_at IS NOT NULL"),
+            sqlite_where=text("expires_at IS NOT NULL"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    user_id: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    user_id: Mapped[str] = mapped_column(String(255), nullable=False)
     role: Mapped[str] = mapped_column(String(50), nullable=False)  # user, assistant, system
     content: Mapped[str] = mapped_column(Text, nullable=False)
-    timestamp: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    timestamp: Mapped[datetime] = mapped_column(DateTime, default=utcnow(), server_default=utcnow())
     
     # Memory V2 fields for efficient filtering
-    memory_type: Mapped[Optional[str]] = mapped_column(String(50), nullable=True, index=True)  # conversation, preference, rule, etc.
-    importance: Mapped[Optional[str]] = mapped_column(String(20), nullable=True, index=True)  # low, medium, high, critical
-    expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, index=True)
+    memory_type: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)  # conversation, preference, rule, etc.
+    importance: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)  # low, medium, high, critical
+    expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
-    extra_data: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    extra_data: Mapped[Optional[dict]] = mapped_column(JSONType, nullable=True)
 
 
 class UserRule(Base):
@@ -44,23 +108,26 @@ class UserRule(Base):
     rule_text: Mapped[str] = mapped_column(Text, nullable=False)
     rule_type: Mapped[str] = mapped_column(String(50), nullable=False)  # preference, automation, constraint
     active: Mapped[bool] = mapped_column(Boolean, default=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    extra_data: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow(), server_default=utcnow())
+    extra_data: Mapped[Optional[dict]] = mapped_column(JSONType, nullable=True)
 
 
 class ActionLog(Base):
     """Audit log for all HA actions"""
     __tablename__ = "action_log"
+    __table_args__ = (
+        Index("ix_action_log_user_ts", "user_id", "timestamp"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    user_id: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    user_id: Mapped[str] = mapped_column(String(255), nullable=False)
     intent: Mapped[str] = mapped_column(String(100), nullable=False)
-    actions: Mapped[dict] = mapped_column(JSON, nullable=False)
+    actions: Mapped[dict] = mapped_column(JSONType, nullable=False)
     confirmed: Mapped[bool] = mapped_column(Boolean, default=False)
     executed: Mapped[bool] = mapped_column(Boolean, default=False)
     success: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
     error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    timestamp: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    timestamp: Mapped[datetime] = mapped_column(DateTime, default=utcnow(), server_default=utcnow())
 
 
 class CacheEntry(Base):
@@ -69,16 +136,54 @@ class CacheEntry(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     cache_key: Mapped[str] = mapped_column(String(512), nullable=False, unique=True, index=True)
-    cache_value: Mapped[dict] = mapped_column(JSON, nullable=False)
+    cache_value: Mapped[dict] = mapped_column(JSONType, nullable=False)
     expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow(), server_default=utcnow())
 
 
 # Database engine and session
+_json_options = (
+    {"json_serializer": _json_serializer, "json_deserializer": _json_deserializer}
+    if ORJSON_AVAILABLE
+    else {}
+)
+
+
+def _pool_options(database_url: str) -> Dict[str, Any]:
+    """Connection pool options for the configured backend
+    
+    Args:
+        database_url: SQLAlchemy database URL
+        
+    Returns:
+        Keyword arguments for create_async_engine
+    """
+    # SQLite is a local file; its default pool already fits
+    if database_url.startswith("sqlite"):
+        return {}
+
+    options: Dict[str, Any] = {
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        # Drop connections the server or a proxy closed while idle
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+    }
+    if "+asyncpg" in database_url:
+        options["connect_args"] = {
+            "statement_cache_size": 1024,
+            "prepared_statement_cache_size": 1024,
+        }
+    return options
+
+
+# Statement echo stays tied to debug mode; it logs every query
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     future=True,
+    **_json_options,
+    **_pool_options(settings.database_url),
 )
 
 async_session_maker = async_sessionmaker(
@@ -96,6 +201,35 @@ async def init_db() -> None:
     logger.info("Database initialized successfully")
 
 
+# Seconds a successful database health check is reused for
+_DB_HEALTH_TTL = 30.0
+_db_last_ok = float("-inf")
+
+
+async def check_database() -> bool:
+    """Check database connectivity, reusing a recent success
+    
+    Returns:
+        True if the database answered
+    """
+    global _db_last_ok
+
+    now = time.monotonic()
+    if now - _db_last_ok < _DB_HEALTH_TTL:
+        return True
+
+    try:
+        # Plain connection, no transaction to begin and commit
+        async with engine.connect() as conn:
+            await conn.exec_driver_sql("SELECT 1")
+    except Exception as e:
+        logger.warning("Database health check failed", error=str(e))
+        return False
+
+    _db_last_ok = now
+    return True
+
+
 async def get_session() -> AsyncSession:
     """Get database session
     
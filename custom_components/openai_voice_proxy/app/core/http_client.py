@@ -0,0 +1,53 @@
+"""Shared HTTP connection pool for OpenAI API clients"""
+
+from typing import Optional
+import httpx
+from app.core.logging import get_logger
+
+# HTTP/2 needs the optional h2 package
+try:
+    import h2  # noqa: F401
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client, creating it on first use
+
+    Clients built on it reuse warm keep-alive connections instead of
+    paying a TCP and TLS handshake each.
+
+    Returns:
+        Shared async HTTP client
+    """
+    global _http_client
+
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=H2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=50,
+                keepalive_expiry=300.0,
+            ),
+            timeout=httpx.Timeout(60.0, connect=10.0),
+        )
+        logger.info("Shared HTTP client created", http2=H2_AVAILABLE)
+
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client"""
+    global _http_client
+
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+        logger.info("Shared HTTP client closed")
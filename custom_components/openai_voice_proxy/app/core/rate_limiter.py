@@ -1,15 +1,19 @@
 """Rate limiting implementation"""
 
 import time
+from collections import OrderedDict
 from typing import Dict, Tuple
-from collections import deque
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
 
 class RateLimiter:
-    """Token bucket rate limiter"""
+    """Sliding window counter rate limiter, partitioned per identifier"""
+
+    WINDOW_SECONDS = 60.0
+    # Identifiers tracked; the least recently seen is evicted beyond this
+    MAX_IDENTIFIERS = 10000
 
     def __init__(self, rate_per_minute: int):
         """Initialize rate limiter
@@ -18,7 +22,9 @@ class RateLimiter:
             rate_per_minute: Maximum requests per minute
         """
         self.rate_per_minute = rate_per_minute
-        self.requests: deque = deque()
+        # identifier -> (window_start, previous_window_count, current_window_count),
+        # least recently seen first
+        self.windows: "OrderedDict[str, Tuple[float, int, int]]" = OrderedDict()
 
     def is_allowed(self, identifier: str = "default") -> Tuple[bool, float]:
         """Check if request is allowed
@@ -29,23 +35,41 @@ class RateLimiter:
         Returns:
             Tuple of (allowed, wait_time_seconds)
         """
-        now = time.time()
-        minute_ago = now - 60
-
-        # Remove old requests
-        while self.requests and self.requests[0] < minute_ago:
-            self.requests.popleft()
-
-        # Check if under limit
-        if len(self.requests) < self.rate_per_minute:
-            self.requests.append(now)
+        window = self.WINDOW_SECONDS
+        now = time.monotonic()
+        window_start, prev_count, curr_count = self.windows.get(identifier, (now, 0, 0))
+
+        # Roll the window forward; a gap of two windows forgets the previous one
+        elapsed = now - window_start
+        if elapsed >= window:
+            prev_count = curr_count if elapsed < 2 * window else 0
+            curr_count = 0
+            window_start += (elapsed // window) * window
+            elapsed = now - window_start
+
+        # Previous window's count, weighted by how much of it still overlaps
+        weighted = prev_count * (1 - elapsed / window) + curr_count
+
+        if weighted < self.rate_per_minute:
+            self._store(identifier, (window_start, prev_count, curr_count + 1))
             return True, 0.0
 
-        # Calculate wait time
-        oldest_request = self.requests[0]
-        wait_time = 60 - (now - oldest_request)
+        self._store(identifier, (window_start, prev_count, curr_count))
+
+        # Wait until enough of the previous window slides out, or for the next window
+        if curr_count >= self.rate_per_minute or not prev_count:
+            wait_time = window - elapsed
+        else:
+            wait_time = window * (1 - (self.rate_per_minute - curr_count) / prev_count) - elapsed
         return False, max(0, wait_time)
 
+    def _store(self, identifier: str, state: Tuple[float, int, int]) -> None:
+        """Save an identifier's window as the most recently seen"""
+        self.windows[identifier] = state
+        self.windows.move_to_end(identifier)
+        if len(self.windows) > self.MAX_IDENTIFIERS:
+            self.windows.popitem(last=False)
+
 
 class RateLimiterManager:
     """Manage multiple rate limiters"""
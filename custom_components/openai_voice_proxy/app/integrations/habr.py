@@ -2,7 +2,7 @@
 
 import asyncio
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from urllib.parse import urlencode
 import feedparser
 import httpx
@@ -25,6 +25,8 @@ class HabrClient:
         self.client: Optional[httpx.AsyncClient] = None
         self._cache: Dict[str, Any] = {}
         self._cache_timestamps: Dict[str, datetime] = {}
+        # Searches in flight, shared by identical concurrent callers
+        self._inflight: Dict[Tuple, asyncio.Task] = {}
     
     async def _ensure_client(self):
         """Ensure HTTP client is initialized (lazy initialization to avoid blocking calls)"""
@@ -100,6 +102,12 @@ class HabrClient:
         Returns:
             List of articles
         """
+        # Cache hits don't fetch, so they don't count against the rate limit
+        cache_key = f"rss_{query}_{tags}_{hubs}_{days}_{limit}"
+        cached = self._check_cache(cache_key)
+        if cached is not None:
+            return cached
+
         # Ensure client is initialized
         await self._ensure_client()
         
@@ -114,12 +122,6 @@ class HabrClient:
             logger.warning("Habr rate limit exceeded", wait_time=wait_time)
             raise Exception(f"Rate limit exceeded. Wait {wait_time:.1f} seconds.")
 
-        # Build cache key
-        cache_key = f"rss_{query}_{tags}_{hubs}_{days}_{limit}"
-        cached = self._check_cache(cache_key)
-        if cached:
-            return cached
-
         logger.info(
             "Searching Habr via RSS",
             query=query,
@@ -215,6 +217,12 @@ class HabrClient:
         Returns:
             List of articles
         """
+        # Cache hits don't fetch, so they don't count against the rate limit
+        cache_key = f"html_{query}_{days}_{limit}"
+        cached = self._check_cache(cache_key)
+        if cached is not None:
+            return cached
+
         # Ensure client is initialized
         await self._ensure_client()
         
@@ -229,12 +237,6 @@ class HabrClient:
             logger.warning("Habr rate limit exceeded", wait_time=wait_time)
             raise Exception(f"Rate limit exceeded. Wait {wait_time:.1f} seconds.")
 
-        # Build cache key
-        cache_key = f"html_{query}_{days}_{limit}"
-        cached = self._check_cache(cache_key)
-        if cached:
-            return cached
-
         logger.info("Searching Habr via HTML", query=query, days=days)
 
         try:
@@ -335,6 +337,32 @@ class HabrClient:
         Returns:
             List of articles
         """
+        # Tag order and case don't change the result; normalize for cache keys
+        if tags:
+            tags = sorted({tag.strip().lower() for tag in tags if tag.strip()}) or None
+        if hubs:
+            hubs = sorted({hub.strip().lower() for hub in hubs if hub.strip()}) or None
+
+        # Identical concurrent searches share one fetch
+        key = (query, tuple(tags or ()), tuple(hubs or ()), days, limit)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._search(query, tags, hubs, days, limit))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shielded so one caller's cancellation doesn't fail the others
+        return await asyncio.shield(task)
+
+    async def _search(
+        self,
+        query: Optional[str],
+        tags: Optional[List[str]],
+        hubs: Optional[List[str]],
+        days: Optional[int],
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        """Run search, RSS first with HTML fallback"""
         try:
             # Try RSS first
             return await self.search_rss(
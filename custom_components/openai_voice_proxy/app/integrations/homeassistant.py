@@ -1,13 +1,30 @@
 """Home Assistant integration"""
 
 import re
-from typing import Dict, List, Optional, Any
+import time
+import asyncio
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Sequence, Tuple
 import aiohttp
 from app.core.config import settings
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Seconds config, areas and devices are reused for; entity states are always fresh
+_STATIC_CONTEXT_TTL = 300.0
+
+
+@lru_cache(maxsize=256)
+def _matches_any(service: str, patterns: Tuple[str, ...]) -> bool:
+    """Match a service against wildcard patterns; results are memoized"""
+    for pattern in patterns:
+        # Convert wildcard pattern to regex
+        regex_pattern = pattern.replace(".", r"\.").replace("*", ".*")
+        if re.match(f"^{regex_pattern}$", service):
+            return True
+    return False
+
 
 class HomeAssistantClient:
     """Client for Home Assistant REST API"""
@@ -20,6 +37,10 @@ class HomeAssistantClient:
             "Content-Type": "application/json",
         }
         self.session: Optional[aiohttp.ClientSession] = None
+        self._static_cache: Dict[str, Tuple[float, Any]] = {}
+        # Service lists are fixed for the process lifetime
+        self._allowed_services = tuple(settings.allowed_services_list)
+        self._confirmation_services = tuple(settings.confirmation_services_list)
 
     async def __aenter__(self):
         self.session = aiohttp.ClientSession(headers=self.headers)
@@ -107,8 +128,7 @@ class HomeAssistantClient:
         service_call = f"{domain}.{service}"
         
         # Check if service is allowed
-        allowed_services = settings.allowed_services_list
-        if not self._is_service_allowed(service_call, allowed_services):
+        if not self._is_service_allowed(service_call, self._allowed_services):
             raise PermissionError(f"Service {service_call} is not allowed")
 
         logger.info(
@@ -128,7 +148,7 @@ class HomeAssistantClient:
         endpoint = f"services/{domain}/{service}"
         return await self._request("POST", endpoint, json=data)
 
-    def _is_service_allowed(self, service: str, allowed: List[str]) -> bool:
+    def _is_service_allowed(self, service: str, allowed: Sequence[str]) -> bool:
         """Check if service is in allowed list
         
         Args:
@@ -138,12 +158,7 @@ class HomeAssistantClient:
         Returns:
             True if allowed
         """
-        for pattern in allowed:
-            # Convert wildcard pattern to regex
-            regex_pattern = pattern.replace(".", r"\.").replace("*", ".*")
-            if re.match(f"^{regex_pattern}$", service):
-                return True
-        return False
+        return _matches_any(service, tuple(allowed))
 
     def needs_confirmation(self, service: str) -> bool:
         """Check if service needs user confirmation
@@ -154,8 +169,7 @@ class HomeAssistantClient:
         Returns:
             True if confirmation required
         """
-        confirmation_services = settings.confirmation_services_list
-        return self._is_service_allowed(service, confirmation_services)
+        return _matches_any(service, self._confirmation_services)
 
     async def get_config(self) -> Dict[str, Any]:
         """Get Home Assistant configuration
@@ -198,10 +212,12 @@ class HomeAssistantClient:
         """
         logger.info("Fetching HA context")
         
-        states = await self.get_states()
-        config = await self.get_config()
-        areas = await self.get_areas()
-        devices = await self.get_devices()
+        states, config, areas, devices = await asyncio.gather(
+            self.get_states(),
+            self._get_static("config", self.get_config),
+            self._get_static("areas", self.get_areas),
+            self._get_static("devices", self.get_devices),
+        )
 
         # Organize by domain and area
         entities_by_domain: Dict[str, List[Dict[str, Any]]] = {}
@@ -242,6 +258,30 @@ class HomeAssistantClient:
 
         return context
 
+    async def _get_static(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Get rarely changing HA data, refetching once it is stale
+        
+        Args:
+            key: Cache key
+            fetch: Coroutine function that fetches the data
+            
+        Returns:
+            Cached or freshly fetched data
+        """
+        now = time.monotonic()
+        cached = self._static_cache.get(key)
+        if cached and now - cached[0] < _STATIC_CONTEXT_TTL:
+            return cached[1]
+
+        value = await fetch()
+        if value:
+            self._static_cache[key] = (now, value)
+        return value
+
     async def find_user_location(self, user_id: str = "default") -> Optional[str]:
         """Find current user location based on presence sensors
         
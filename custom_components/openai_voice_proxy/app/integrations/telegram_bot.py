@@ -1,15 +1,80 @@
 """Telegram bot integration"""
 
-from typing import Optional
+from typing import List, Optional, Tuple, Union
 import asyncio
 from telegram import Bot
 from telegram.constants import ParseMode
 from telegram.error import TelegramError
+from telegram.request import HTTPXRequest
 from app.core.config import settings
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Telegram rejects longer message texts
+MAX_MESSAGE_LENGTH = 4096
+
+# Telegram allows about 30 messages per second per bot
+_SEND_CONCURRENCY = 30
+
+# Notification emoji by priority
+_PRIORITY_EMOJI = {
+    "low": "ℹ️",
+    "normal": "📢",
+    "high": "⚠️",
+    "urgent": "🚨",
+}
+
+# Search results emoji by source
+_SOURCE_EMOJI = {
+    "web": "🌐",
+    "habr": "📚",
+    "perplexity": "🔍",
+}
+
+
+def _split_message(text: str, limit: int = MAX_MESSAGE_LENGTH) -> List[Tuple[str, bool]]:
+    """
+    Cut text into pieces Telegram accepts
+    
+    Cuts fall on line breaks, so markup that does not span lines stays
+    whole. Only a single line over the limit is cut inside the line.
+    
+    Args:
+        text: Message text
+        limit: Maximum piece length
+        
+    Returns:
+        (piece, markup_intact) pairs; markup_intact is False for pieces
+        of a line that was cut
+    """
+    if len(text) <= limit:
+        return [(text, True)]
+
+    pieces: List[Tuple[str, bool]] = []
+    current = ""
+    for line in text.splitlines(keepends=True):
+        if len(current) + len(line) <= limit:
+            current += line
+            continue
+
+        # Telegram rejects blank messages
+        if current.strip():
+            pieces.append((current, True))
+        current = ""
+
+        if len(line) <= limit:
+            current = line
+        else:
+            pieces.extend(
+                (line[start:start + limit], False)
+                for start in range(0, len(line), limit)
+            )
+
+    if current.strip():
+        pieces.append((current, True))
+    return pieces
+
 
 class TelegramClient:
     """Client for Telegram Bot API"""
@@ -19,6 +84,7 @@ class TelegramClient:
         self.bot: Optional[Bot] = None
         self.chat_id = settings.telegram_chat_id if self.enabled else None
         self._initialized = False
+        self._sem = asyncio.Semaphore(_SEND_CONCURRENCY)
         
         if self.enabled:
             logger.info("Telegram bot will be initialized on first use", chat_id=self.chat_id)
@@ -28,7 +94,19 @@ class TelegramClient:
     async def _ensure_bot(self):
         """Ensure bot is initialized (lazy initialization to avoid blocking calls)"""
         if self.enabled and not self._initialized:
-            self.bot = Bot(token=settings.telegram_bot_token)
+            # The default pool holds one connection, so concurrent sends queue up
+            # and time out; long polling gets its own small pool so it never
+            # blocks sends
+            self.bot = Bot(
+                token=settings.telegram_bot_token,
+                request=HTTPXRequest(
+                    connection_pool_size=settings.telegram_connection_pool_size,
+                    pool_timeout=settings.telegram_pool_timeout,
+                    connect_timeout=5.0,
+                    read_timeout=20.0,
+                ),
+                get_updates_request=HTTPXRequest(connection_pool_size=4),
+            )
             self._initialized = True
             logger.info("Telegram bot initialized", chat_id=self.chat_id)
 
@@ -73,6 +151,43 @@ class TelegramClient:
             logger.error("Unexpected error sending Telegram message", error=str(e))
             return False
 
+    async def send_many(
+        self,
+        texts: List[str],
+        parse_mode: str = ParseMode.MARKDOWN,
+        disable_web_page_preview: bool = False,
+    ) -> List[Union[bool, BaseException]]:
+        """Send several messages concurrently
+        
+        Texts over MAX_MESSAGE_LENGTH are cut into several messages, sent
+        in order. Pieces cut inside a line are sent without parse mode,
+        since their markup may be unbalanced.
+        
+        Args:
+            texts: Message texts
+            parse_mode: Parse mode (Markdown, HTML, or None)
+            disable_web_page_preview: Disable link previews
+            
+        Returns:
+            Result of each send, in order of texts
+        """
+        async def _one(text: str) -> bool:
+            async with self._sem:
+                delivered = True
+                for piece, markup_intact in _split_message(text):
+                    # Keep sending the rest if one piece fails
+                    delivered &= await self.send_message(
+                        piece,
+                        parse_mode=parse_mode if markup_intact else None,
+                        disable_web_page_preview=disable_web_page_preview,
+                    )
+                return delivered
+
+        return await asyncio.gather(
+            *[_one(text) for text in texts],
+            return_exceptions=True,
+        )
+
     async def send_notification(
         self,
         title: str,
@@ -90,13 +205,7 @@ class TelegramClient:
             True if sent successfully
         """
         # Format with emoji based on priority
-        emoji_map = {
-            "low": "ℹ️",
-            "normal": "📢",
-            "high": "⚠️",
-            "urgent": "🚨",
-        }
-        emoji = emoji_map.get(priority, "📢")
+        emoji = _PRIORITY_EMOJI.get(priority, "📢")
 
         text = f"{emoji} *{title}*\n\n{message}"
         return await self.send_message(text)
@@ -124,13 +233,13 @@ class TelegramClient:
         status_emoji = "✅" if success else "❌"
         status_text = "успешно" if success else "с ошибкой"
 
-        text = f"{status_emoji} *Действие выполнено {status_text}*\n\n"
-        text += f"👤 Пользователь: `{user_id}`\n"
-        text += f"🎯 Намерение: `{intent}`\n"
-        text += f"📋 Действия: `{len(actions)}`\n"
-
-        if error:
-            text += f"\n❌ Ошибка: `{error}`"
+        text = (
+            f"{status_emoji} *Действие выполнено {status_text}*\n\n"
+            f"👤 Пользователь: `{user_id}`\n"
+            f"🎯 Намерение: `{intent}`\n"
+            f"📋 Действия: `{len(actions)}`\n"
+            + (f"\n❌ Ошибка: `{error}`" if error else "")
+        )
 
         return await self.send_message(text)
 
@@ -150,15 +259,9 @@ class TelegramClient:
         Returns:
             True if sent successfully
         """
-        source_emoji = {
-            "web": "🌐",
-            "habr": "📚",
-            "perplexity": "🔍",
-        }.get(source, "🔍")
+        source_emoji = _SOURCE_EMOJI.get(source, "🔍")
 
-        text = f"{source_emoji} *Результаты поиска*\n\n"
-        text += f"Запрос: _{query}_\n\n"
-        text += results_text
+        text = f"{source_emoji} *Результаты поиска*\n\nЗапрос: _{query}_\n\n{results_text}"
 
         return await self.send_message(
             text,
@@ -177,18 +280,29 @@ class TelegramClient:
         Returns:
             True if sent successfully
         """
-        text = "📊 *Ежедневный дайджест*\n\n"
+        header = "📊 *Ежедневный дайджест*\n\n"
+        sections = []
 
         if "home_events" in summaries:
-            text += f"🏠 *Дом*\n{summaries['home_events']}\n\n"
+            sections.append(f"🏠 *Дом*\n{summaries['home_events']}\n\n")
 
         if "news" in summaries:
-            text += f"📰 *Новости*\n{summaries['news']}\n\n"
+            sections.append(f"📰 *Новости*\n{summaries['news']}\n\n")
 
         if "tech" in summaries:
-            text += f"💻 *Технологии*\n{summaries['tech']}\n\n"
+            sections.append(f"💻 *Технологии*\n{summaries['tech']}\n\n")
 
-        return await self.send_message(text)
+        text = header + "".join(sections)
+        if len(text) <= MAX_MESSAGE_LENGTH or not sections:
+            return await self.send_message(text)
+
+        # Too long for one message: send each section on its own, and cut
+        # sections that are still too long
+        sections[0] = header + sections[0]
+        # The header goes first; the remaining sections follow concurrently
+        results = await self.send_many(sections[:1])
+        results += await self.send_many(sections[1:])
+        return all(result is True for result in results)
 
     async def close(self):
         """Close bot session"""
@@ -1,15 +1,17 @@
 """Main FastAPI application"""
 
-import time
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 
 from app.core.config import settings
 from app.core.logging import setup_logging, get_logger
 from app.core.database import init_db
+from app.core.http_client import close_http_client
+from app.api import frames
 from app.api.routes import router
+from app.api.middleware import TimingMiddleware, internal_error_handler
+from app.services.command_processor import command_processor
 from app.services.monitoring import metrics
 from app import __version__
 
@@ -28,6 +30,9 @@ async def lifespan(app: FastAPI):
     await init_db()
     logger.info("Database initialized")
     
+    # Load the tokenizer now rather than on the first command
+    await command_processor.warm_up()
+    
     # Set initial health
     metrics.set_system_health(True)
     metrics.set_database_health(True)
@@ -38,6 +43,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down application")
+    await close_http_client()
 
 
 # Create FastAPI app
@@ -46,6 +52,7 @@ app = FastAPI(
     description="LLM-powered voice assistant and smart home controller",
     version=__version__,
     lifespan=lifespan,
+    default_response_class=frames.JSONResponseClass,
 )
 
 
@@ -60,43 +67,10 @@ app.add_middleware(
 
 
 # Request timing middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    """Add request timing and metrics"""
-    start_time = time.time()
-    
-    try:
-        response = await call_next(request)
-        duration = time.time() - start_time
-        
-        # Add header
-        response.headers["X-Process-Time"] = str(duration)
-        
-        # Record metrics
-        metrics.record_http_request(
-            method=request.method,
-            endpoint=request.url.path,
-            status=response.status_code,
-            duration=duration,
-        )
-        
-        return response
-    
-    except Exception as e:
-        duration = time.time() - start_time
-        logger.error("Request failed", error=str(e), path=request.url.path)
-        
-        metrics.record_http_request(
-            method=request.method,
-            endpoint=request.url.path,
-            status=500,
-            duration=duration,
-        )
-        
-        return JSONResponse(
-            status_code=500,
-            content={"detail": "Internal server error"},
-        )
+app.add_middleware(TimingMiddleware)
+
+# JSON 500s for unhandled errors
+app.add_exception_handler(Exception, internal_error_handler)
 
 
 # Include API routes
@@ -117,10 +91,27 @@ async def root():
 if __name__ == "__main__":
     import uvicorn
     
+    # uvloop and httptools are faster; fall back to asyncio and h11
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+    
+    try:
+        import httptools  # noqa: F401
+        http = "httptools"
+    except ImportError:
+        http = "h11"
+    
     uvicorn.run(
         "app.main:app",
         host=settings.host,
         port=settings.port,
+        loop=loop,
+        http=http,
+        # Reload runs a single process
+        workers=1 if settings.debug else settings.workers,
         reload=settings.debug,
         log_level=settings.log_level.lower(),
     )
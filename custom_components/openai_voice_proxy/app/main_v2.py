@@ -1,20 +1,26 @@
 """Main FastAPI application with refactored architecture"""
 
-import time
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 
 from app.core.config import settings
 from app.core.logging import setup_logging, get_logger
 from app.core.database import init_db
+from app.api import frames
 from app.api.routes_v2 import router
+from app.api.middleware import (
+    RateLimitMiddleware,
+    TimingMiddleware,
+    internal_error_handler,
+)
 from app.services.monitoring import metrics
 from app.services.pipeline.orchestrator import pipeline
 from app.services.memory_v2.manager import memory_manager
 from app.services.tts.openai_tts import openai_tts
 from app.services.search.perplexity_enhanced import enhanced_perplexity_client
+from app.agents.realtime_voice_agent import connection_pool
+from app.core.http_client import close_http_client
 from app import __version__
 
 # Setup logging
@@ -135,6 +141,8 @@ async def lifespan(app: FastAPI):
         await memory_manager.shutdown()
         await openai_tts.shutdown()
         await enhanced_perplexity_client.close()
+        await connection_pool.close()
+        await close_http_client()
         logger.info("All services shutdown gracefully")
     except Exception as e:
         logger.error("Shutdown error", error=str(e))
@@ -149,12 +157,21 @@ app = FastAPI(
     ),
     version=__version__,
     lifespan=lifespan,
+    default_response_class=frames.JSONResponseClass,
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
 )
 
 
+# Rate limiting, ahead of routing; added first so CORS headers still wrap 429s
+app.add_middleware(
+    RateLimitMiddleware,
+    rate_per_minute=settings.rate_limit_per_minute,
+    trust_forwarded=settings.rate_limit_trust_forwarded,
+)
+
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -165,70 +182,11 @@ app.add_middleware(
 )
 
 
-# Request timing and metrics middleware
-@app.middleware("http")
-async def add_process_time_and_metrics(request: Request, call_next):
-    """Add request timing, metrics, and error handling"""
-    start_time = time.time()
-    request_id = f"{int(start_time * 1000)}"
-    
-    logger.info(
-        "Request started",
-        request_id=request_id,
-        method=request.method,
-        path=request.url.path,
-    )
-    
-    try:
-        response = await call_next(request)
-        duration = time.time() - start_time
-        
-        # Add headers
-        response.headers["X-Process-Time"] = f"{duration:.3f}"
-        response.headers["X-Request-ID"] = request_id
-        
-        # Record metrics
-        metrics.record_http_request(
-            method=request.method,
-            endpoint=request.url.path,
-            status=response.status_code,
-            duration=duration,
-        )
-        
-        logger.info(
-            "Request completed",
-            request_id=request_id,
-            status=response.status_code,
-            duration_ms=int(duration * 1000),
-        )
-        
-        return response
-    
-    except Exception as e:
-        duration = time.time() - start_time
-        
-        logger.error(
-            "Request failed",
-            request_id=request_id,
-            error=str(e),
-            path=request.url.path,
-            duration_ms=int(duration * 1000),
-        )
-        
-        metrics.record_http_request(
-            method=request.method,
-            endpoint=request.url.path,
-            status=500,
-            duration=duration,
-        )
-        
-        return JSONResponse(
-            status_code=500,
-            content={
-                "detail": "Internal server error",
-                "request_id": request_id,
-            },
-        )
+# Request timing and metrics middleware; added last so it times everything
+app.add_middleware(TimingMiddleware, log_requests=True)
+
+# JSON 500s for unhandled errors, tagged with the request ID
+app.add_exception_handler(Exception, internal_error_handler)
 
 
 # Include API routes
@@ -276,10 +234,28 @@ async def root():
 if __name__ == "__main__":
     import uvicorn
     
+    # uvloop speeds up the Realtime WebSocket path; fall back to asyncio
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+    
+    # httptools parses HTTP in C; fall back to the pure-Python h11
+    try:
+        import httptools  # noqa: F401
+        http = "httptools"
+    except ImportError:
+        http = "h11"
+    
     uvicorn.run(
         "app.main_v2:app",
         host=settings.host,
         port=settings.port,
+        loop=loop,
+        http=http,
+        # Reload runs a single process
+        workers=1 if settings.debug else settings.workers,
         reload=settings.debug,
         log_level=settings.log_level.lower(),
         ws_ping_interval=30,
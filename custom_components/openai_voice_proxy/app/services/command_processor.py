@@ -1,16 +1,108 @@
 """Command processing and LLM planning service"""
 
+import asyncio
+import inspect
 import json
-from typing import Dict, List, Optional, Any
+import re
+from itertools import islice
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Set, Union
 from openai import AsyncOpenAI
+from pydantic import BaseModel, ConfigDict, ValidationError, field_validator
+from sqlalchemy import insert
 from app.core.config import settings
+from app.core.http_client import get_http_client
 from app.core.logging import get_logger
 from app.core.database import ActionLog, async_session_maker
 from app.integrations.homeassistant import ha_client
 from app.services.memory import memory_service
 
+# Make orjson optional
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+# Make tiktoken optional
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    tiktoken = None
+    TIKTOKEN_AVAILABLE = False
+
 logger = get_logger(__name__)
 
+# Budget for each remembered snippet in the prompt context; the character
+# limit applies when no tokenizer is available
+_MEMORY_SNIPPET_TOKENS = 40
+_MEMORY_SNIPPET_CHARS = 100
+
+# Sentence boundary: whitespace after terminal punctuation, or a line break
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?…])\s+|\n+")
+
+
+# Tokenizers loaded so far; failed loads are not stored, so they are retried
+_encodings: Dict[str, "tiktoken.Encoding"] = {}
+
+
+def _load_encoding(model: str) -> Optional["tiktoken.Encoding"]:
+    """Load the tokenizer of a model; None if unavailable
+
+    May read or download the BPE file, so run it off the event loop.
+    """
+    if not TIKTOKEN_AVAILABLE:
+        return None
+
+    encoding = _encodings.get(model)
+    if encoding is None:
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except Exception as e:
+            # Unknown model, or the BPE file could not be fetched
+            logger.warning("Tokenizer unavailable", model=model, error=str(e))
+            return None
+        _encodings[model] = encoding
+    return encoding
+
+
+class _ActionPlan(BaseModel):
+    """Action plan envelope returned by the LLM; unknown keys are kept"""
+    model_config = ConfigDict(extra="allow")
+
+    intent: str
+    actions: Optional[List[Dict[str, Any]]] = []
+    needs_confirmation: Optional[bool] = False
+    response: Optional[str] = ""
+
+    @field_validator("actions", "needs_confirmation", "response", mode="before")
+    @classmethod
+    def _null_as_default(cls, value: Any, info) -> Any:
+        """Models often emit explicit nulls for fields they leave unset"""
+        if value is None:
+            return cls.model_fields[info.field_name].get_default(call_default_factory=True)
+        return value
+
+
+def _parse_action_plan(text: str) -> Optional[Dict[str, Any]]:
+    """Parse an action plan from model output; None for plain-text replies"""
+    stripped = text.lstrip()
+    # Text replies are the common case; don't scan them just to fail
+    if not stripped.startswith("{"):
+        return None
+
+    try:
+        data = orjson.loads(stripped) if ORJSON_AVAILABLE else json.loads(stripped)
+    except json.JSONDecodeError:
+        # orjson.JSONDecodeError subclasses it
+        return None
+
+    try:
+        return _ActionPlan.model_validate(data).model_dump()
+    except ValidationError:
+        return None
+
 
 SYSTEM_PROMPT = """Ты — {assistant_name}, умный голосовой ассистент для управления домом через Home Assistant.
 
@@ -59,47 +151,88 @@ class CommandProcessor:
     """Service for processing user commands and planning actions"""
 
     def __init__(self):
-        self.openai_client = AsyncOpenAI(api_key=settings.openai_api_key)
+        self._openai_client: Optional[AsyncOpenAI] = None
+        self._http_client = None
         self.model = "gpt-4o"  # Use GPT-4 for better reasoning
+        self._background: Set[asyncio.Task] = set()
+        self._encoding_task: Optional[asyncio.Task] = None
+        # Settings are fixed for the process lifetime, so format once
+        self._system_prompt = SYSTEM_PROMPT.format(
+            assistant_name=settings.assistant_name,
+            style=", ".join(settings.assistant_style_list),
+            language=settings.assistant_language,
+        )
+
+    @property
+    def openai_client(self) -> AsyncOpenAI:
+        """OpenAI client on the shared HTTP/2 connection pool
+        
+        Rebuilt if the shared pool was closed and replaced, e.g. after an
+        application restart within the same process.
+        """
+        http_client = get_http_client()
+        if self._openai_client is None or self._http_client is not http_client:
+            self._openai_client = AsyncOpenAI(
+                api_key=settings.openai_api_key,
+                http_client=http_client,
+            )
+            self._http_client = http_client
+        return self._openai_client
+
+    async def warm_up(self) -> None:
+        """Load the tokenizer in a worker thread, off the event loop"""
+        await asyncio.to_thread(_load_encoding, self.model)
+
+    def _get_encoding(self) -> Optional["tiktoken.Encoding"]:
+        """Loaded tokenizer, or None while it is unavailable
+
+        Never blocks: a missing tokenizer is loaded in the background for
+        later calls.
+        """
+        encoding = _encodings.get(self.model)
+        if encoding is None and TIKTOKEN_AVAILABLE:
+            if self._encoding_task is None or self._encoding_task.done():
+                self._encoding_task = asyncio.create_task(self.warm_up())
+        return encoding
 
     async def process_command(
         self,
         user_id: str,
         command: str,
-        ha_context: Optional[Dict[str, Any]] = None,
+        ha_context: Optional[Union[Dict[str, Any], Awaitable[Dict[str, Any]]]] = None,
+        on_sentence: Optional[Callable[[str], None]] = None,
     ) -> Dict[str, Any]:
         """Process user command and generate action plan
         
         Args:
             user_id: User identifier
             command: User command
-            ha_context: Optional Home Assistant context
+            ha_context: Optional Home Assistant context, or a pending fetch of it
+            on_sentence: Optional callback, called with each sentence of the
+                spoken reply as soon as it is complete
             
         Returns:
             Action plan or text response
         """
         logger.info("Processing command", user_id=user_id, command=command)
 
-        # Build context
-        context = await memory_service.build_context(
+        # Build memory context while the HA context is still being fetched
+        memory_context = memory_service.build_context(
             user_id=user_id,
             current_query=command,
-            ha_context=ha_context,
-        )
-
-        # Build system prompt
-        system_prompt = SYSTEM_PROMPT.format(
-            assistant_name=settings.assistant_name,
-            style=", ".join(settings.assistant_style_list),
-            language=settings.assistant_language,
         )
+        if inspect.isawaitable(ha_context):
+            context, ha_context = await asyncio.gather(memory_context, ha_context)
+        else:
+            context = await memory_context
+        context["ha_context"] = ha_context or {}
 
         # Build context for LLM
         context_text = self._format_context(context)
 
         # Build messages
         messages = [
-            {"role": "system", "content": system_prompt},
+            {"role": "system", "content": self._system_prompt},
         ]
 
         # Add recent history
@@ -115,49 +248,33 @@ class CommandProcessor:
 
         # Call OpenAI
         try:
-            response = await self.openai_client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=0.7,
-                max_tokens=2000,
-            )
-
-            assistant_response = response.choices[0].message.content
+            assistant_response = await self._stream_completion(messages, on_sentence)
 
             # Try to parse as JSON (action plan)
-            try:
-                action_plan = json.loads(assistant_response)
-                if isinstance(action_plan, dict) and "intent" in action_plan:
-                    # Validate action plan
-                    validated_plan = await self._validate_action_plan(action_plan, ha_context)
-                    
-                    # Save to memory
-                    await memory_service.add_to_short_term(
-                        user_id=user_id,
-                        role="user",
-                        content=command,
-                    )
-                    await memory_service.add_to_short_term(
-                        user_id=user_id,
-                        role="assistant",
-                        content=validated_plan.get("response", ""),
-                    )
+            action_plan = _parse_action_plan(assistant_response)
+            if action_plan is not None:
+                # Validate action plan
+                validated_plan = await self._validate_action_plan(action_plan, ha_context)
+
+                # A plan's spoken reply is only known once it is parsed
+                if on_sentence and validated_plan.get("response"):
+                    on_sentence(validated_plan["response"])
+                
+                # Save to memory
+                await memory_service.add_to_short_term_many(
+                    user_id,
+                    [
+                        ("user", command),
+                        ("assistant", validated_plan.get("response", "")),
+                    ],
+                )
 
-                    return validated_plan
-            except json.JSONDecodeError:
-                # Not JSON, it's a text response
-                pass
+                return validated_plan
 
             # Text response
-            await memory_service.add_to_short_term(
-                user_id=user_id,
-                role="user",
-                content=command,
-            )
-            await memory_service.add_to_short_term(
-                user_id=user_id,
-                role="assistant",
-                content=assistant_response,
+            await memory_service.add_to_short_term_many(
+                user_id,
+                [("user", command), ("assistant", assistant_response)],
             )
 
             return {
@@ -169,6 +286,72 @@ class CommandProcessor:
             logger.error("Command processing failed", error=str(e))
             raise
 
+    async def _stream_completion(
+        self,
+        messages: List[Dict[str, Any]],
+        on_sentence: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """Stream a completion, reporting complete sentences of text replies
+        
+        Args:
+            messages: Chat messages
+            on_sentence: Optional callback, called with each sentence as soon
+                as it is complete
+            
+        Returns:
+            Full assistant response
+        """
+        stream = await self.openai_client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=0.7,
+            max_tokens=2000,
+            stream=True,
+        )
+
+        parts: List[str] = []
+        pending = ""
+        is_plan: Optional[bool] = None
+
+        async for chunk in stream:
+            if not chunk.choices or not chunk.choices[0].delta.content:
+                continue
+
+            delta = chunk.choices[0].delta.content
+            parts.append(delta)
+            if on_sentence is None:
+                continue
+
+            # JSON action plans are held back until they can be parsed
+            if is_plan is None:
+                head = "".join(parts).lstrip()
+                if not head:
+                    continue
+                is_plan = head.startswith("{")
+                delta = head
+            if is_plan:
+                continue
+
+            pending += delta
+            *sentences, pending = _SENTENCE_BREAK.split(pending)
+            for sentence in sentences:
+                if sentence.strip():
+                    on_sentence(sentence.strip())
+
+        full_response = "".join(parts)
+        if on_sentence is None:
+            return full_response
+
+        if is_plan:
+            if _parse_action_plan(full_response) is None:
+                # Looked like a plan but is answered as plain text after all
+                pending = full_response
+
+        if pending.strip():
+            on_sentence(pending.strip())
+
+        return full_response
+
     def _format_context(self, context: Dict[str, Any]) -> str:
         """Format context for LLM
         
@@ -193,17 +376,36 @@ class CommandProcessor:
             
             if ha_ctx.get("entities_by_area"):
                 parts.append("Комнаты:")
-                for area, entities in list(ha_ctx["entities_by_area"].items())[:5]:
+                for area, entities in islice(ha_ctx["entities_by_area"].items(), 5):
                     parts.append(f"- {area}: {len(entities)} устройств")
 
         # Relevant memories
         if context["relevant_memories"]:
             parts.append("\nИз истории:")
             for memory in context["relevant_memories"][:2]:
-                parts.append(f"- {memory['content'][:100]}")
+                parts.append(f"- {self._truncate_snippet(memory['content'])}")
 
         return "\n".join(parts) if parts else "Контекст пуст"
 
+    def _truncate_snippet(self, text: str) -> str:
+        """Cut a context snippet to its token budget
+        
+        Args:
+            text: Snippet text
+            
+        Returns:
+            Text limited to _MEMORY_SNIPPET_TOKENS tokens, or to
+            _MEMORY_SNIPPET_CHARS characters without a tokenizer
+        """
+        encoding = self._get_encoding()
+        if encoding is None:
+            return text[:_MEMORY_SNIPPET_CHARS]
+
+        tokens = encoding.encode(text)
+        if len(tokens) <= _MEMORY_SNIPPET_TOKENS:
+            return text
+        return encoding.decode(tokens[:_MEMORY_SNIPPET_TOKENS])
+
     async def _validate_action_plan(
         self,
         plan: Dict[str, Any],
@@ -212,13 +414,15 @@ class CommandProcessor:
         """Validate and enrich action plan
         
         Args:
-            plan: Action plan from LLM
+            plan: Action plan from LLM; updated in place
             ha_context: Home Assistant context
             
         Returns:
             Validated action plan
         """
-        validated_plan = plan.copy()
+        # The plan is freshly parsed and owned by the caller, so it is
+        # updated in place
+        needs_confirmation = bool(plan.get("needs_confirmation", False))
 
         # Validate each action
         validated_actions = []
@@ -234,13 +438,47 @@ class CommandProcessor:
 
             # Check if service needs confirmation
             if ha_client.needs_confirmation(service_call):
-                validated_plan["needs_confirmation"] = True
+                needs_confirmation = True
 
             validated_actions.append(action)
 
-        validated_plan["actions"] = validated_actions
+        plan["actions"] = validated_actions
+        plan["needs_confirmation"] = needs_confirmation
+
+        return plan
+
+    async def process_commands(
+        self,
+        user_id: str,
+        commands: List[str],
+        ha_context: Optional[Dict[str, Any]] = None,
+        max_concurrency: int = 4,
+    ) -> List[Dict[str, Any]]:
+        """Process independent commands concurrently
+        
+        Args:
+            user_id: User identifier
+            commands: Commands to process
+            ha_context: Optional Home Assistant context shared by all commands
+            max_concurrency: Maximum commands in flight at once
+            
+        Returns:
+            Results in command order; failed commands get an error result
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(command: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await self.process_command(
+                        user_id=user_id,
+                        command=command,
+                        ha_context=ha_context,
+                    )
+                except Exception as e:
+                    return {"type": "error", "response": str(e)}
 
-        return validated_plan
+        return await asyncio.gather(*(run(command) for command in commands))
 
     async def execute_action_plan(
         self,
@@ -284,57 +522,50 @@ class CommandProcessor:
         all_success = True
         error_message = None
 
-        for action in actions:
-            try:
-                domain = action["domain"]
-                service = action["service"]
-                target = action.get("target", {})
-                service_data = action.get("service_data", {})
-
-                # Call HA service
-                result = await ha_client.call_service(
-                    domain=domain,
-                    service=service,
-                    service_data=service_data,
-                    target=target,
-                )
-
-                results.append({
-                    "action": action,
-                    "success": True,
-                    "result": result,
-                })
-
-                logger.info(
-                    "Action executed",
-                    domain=domain,
-                    service=service,
-                    affected_entities=len(result),
-                )
+        # Actions in a plan are independent, so their HA calls overlap
+        outcomes = await asyncio.gather(
+            *(self._call_action(action) for action in actions),
+            return_exceptions=True,
+        )
 
-            except Exception as e:
-                logger.error("Action failed", action=action, error=str(e))
+        for action, outcome in zip(actions, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error("Action failed", action=action, error=str(outcome))
                 all_success = False
-                error_message = str(e)
+                error_message = str(outcome)
                 results.append({
                     "action": action,
                     "success": False,
-                    "error": str(e),
+                    "error": str(outcome),
                 })
+                continue
+
+            results.append({
+                "action": action,
+                "success": True,
+                "result": outcome,
+            })
+
+            logger.info(
+                "Action executed",
+                domain=action["domain"],
+                service=action["service"],
+                affected_entities=len(outcome),
+            )
 
-        # Log to database
-        async with async_session_maker() as session:
-            log_entry = ActionLog(
+        # The audit log is observational; don't make the user wait on it
+        task = asyncio.create_task(
+            self._log_action(
                 user_id=user_id,
                 intent=intent,
                 actions=actions,
                 confirmed=confirmed,
-                executed=True,
                 success=all_success,
                 error=error_message,
             )
-            session.add(log_entry)
-            await session.commit()
+        )
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
 
         return {
             "success": all_success,
@@ -342,6 +573,44 @@ class CommandProcessor:
             "message": "Действия выполнены" if all_success else f"Ошибка: {error_message}",
         }
 
+    async def _call_action(self, action: Dict[str, Any]) -> Any:
+        """Call the Home Assistant service of one planned action"""
+        return await ha_client.call_service(
+            domain=action["domain"],
+            service=action["service"],
+            service_data=action.get("service_data", {}),
+            target=action.get("target", {}),
+        )
+
+    async def _log_action(
+        self,
+        user_id: str,
+        intent: str,
+        actions: List[Dict[str, Any]],
+        confirmed: bool,
+        success: bool,
+        error: Optional[str],
+    ) -> None:
+        """Write an executed plan to the action log"""
+        try:
+            # A Core insert skips ORM unit-of-work bookkeeping
+            async with async_session_maker() as session:
+                await session.execute(
+                    insert(ActionLog).values(
+                        user_id=user_id,
+                        intent=intent,
+                        actions=actions,
+                        confirmed=confirmed,
+                        executed=True,
+                        success=success,
+                        error=error,
+                    )
+                )
+                await session.commit()
+
+        except Exception as e:
+            logger.error("Failed to log action", user_id=user_id, intent=intent, error=str(e))
+
 
 # Global command processor instance
 command_processor = CommandProcessor()
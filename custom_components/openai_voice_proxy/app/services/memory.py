@@ -1,7 +1,8 @@
 """Memory and context management with Chroma vector database"""
 
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Sequence, Tuple
 from datetime import datetime
+import asyncio
 import json
 
 # Make ChromaDB optional
@@ -74,6 +75,24 @@ class MemoryService:
             logger.error("Failed to get embedding", error=str(e))
             raise
 
+    async def embed_query(self, query: str) -> Optional[List[float]]:
+        """Embed a query once for several memory searches
+        
+        Args:
+            query: Search query
+            
+        Returns:
+            Embedding vector, or None if memory search is disabled or failed
+        """
+        if not settings.long_term_memory_enabled:
+            return None
+
+        try:
+            return await self.get_embedding(query)
+        except Exception:
+            # Searches embed on their own and handle the failure
+            return None
+
     async def add_to_short_term(
         self,
         user_id: str,
@@ -101,6 +120,40 @@ class MemoryService:
 
         logger.debug("Added to short-term memory", user_id=user_id, role=role)
 
+    async def add_to_short_term_many(
+        self,
+        user_id: str,
+        messages: Sequence[Tuple[Any, ...]],
+    ) -> None:
+        """Add several messages to short-term memory in one transaction
+        
+        Args:
+            user_id: User identifier
+            messages: (role, content) or (role, content, metadata) tuples,
+                oldest first
+        """
+        dialogs = []
+        for role, content, *rest in messages:
+            metadata = rest[0] if rest else None
+            dialogs.append(
+                DialogHistory(
+                    user_id=user_id,
+                    role=role,
+                    content=content,
+                    extra_data=metadata or {},
+                )
+            )
+
+        if not dialogs:
+            return
+
+        # One commit flushes all rows as a single multi-row INSERT
+        async with async_session_maker() as session:
+            session.add_all(dialogs)
+            await session.commit()
+
+        logger.debug("Added to short-term memory", user_id=user_id, count=len(dialogs))
+
     async def get_short_term_history(
         self,
         user_id: str,
@@ -122,7 +175,7 @@ class MemoryService:
             result = await session.execute(
                 select(DialogHistory)
                 .where(DialogHistory.user_id == user_id)
-                .order_by(desc(DialogHistory.timestamp))
+                .order_by(desc(DialogHistory.timestamp), desc(DialogHistory.id))
                 .limit(limit)
             )
             dialogs = result.scalars().all()
@@ -183,6 +236,7 @@ class MemoryService:
         user_id: str,
         query: str,
         limit: int = 5,
+        query_embedding: Optional[List[float]] = None,
     ) -> List[Dict[str, Any]]:
         """Search long-term memory
         
@@ -190,6 +244,7 @@ class MemoryService:
             user_id: User identifier
             query: Search query
             limit: Maximum results
+            query_embedding: Precomputed embedding of query
             
         Returns:
             List of relevant memories
@@ -199,7 +254,8 @@ class MemoryService:
 
         try:
             # Get query embedding
-            query_embedding = await self.get_embedding(query)
+            if query_embedding is None:
+                query_embedding = await self.get_embedding(query)
 
             # Search in Chroma
             results = self.conversations_collection.query(
@@ -319,6 +375,7 @@ class MemoryService:
         user_id: str,
         query: str,
         limit: int = 3,
+        query_embedding: Optional[List[float]] = None,
     ) -> List[Dict[str, Any]]:
         """Search for relevant user rules based on query
         
@@ -326,6 +383,7 @@ class MemoryService:
             user_id: User identifier
             query: Query to match against rules
             limit: Maximum results
+            query_embedding: Precomputed embedding of query
             
         Returns:
             List of relevant rules
@@ -335,7 +393,8 @@ class MemoryService:
             return await self.get_user_rules(user_id)
 
         try:
-            query_embedding = await self.get_embedding(query)
+            if query_embedding is None:
+                query_embedding = await self.get_embedding(query)
 
             results = self.preferences_collection.query(
                 query_embeddings=[query_embedding],
@@ -375,14 +434,19 @@ class MemoryService:
         Returns:
             Complete context dictionary
         """
-        # Get short-term history
-        recent_history = await self.get_short_term_history(user_id)
-
-        # Search long-term memory
-        relevant_memories = await self.search_long_term(user_id, current_query, limit=3)
-
-        # Get relevant rules
-        relevant_rules = await self.search_relevant_rules(user_id, current_query, limit=3)
+        # Both searches use the same query vector
+        query_embedding = await self.embed_query(current_query)
+
+        # History, long-term memories and rules are independent lookups
+        recent_history, relevant_memories, relevant_rules = await asyncio.gather(
+            self.get_short_term_history(user_id),
+            self.search_long_term(
+                user_id, current_query, limit=3, query_embedding=query_embedding
+            ),
+            self.search_relevant_rules(
+                user_id, current_query, limit=3, query_embedding=query_embedding
+            ),
+        )
 
         context = {
             "user_id": user_id,
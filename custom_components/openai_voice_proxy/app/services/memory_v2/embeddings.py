@@ -3,7 +3,9 @@
 from typing import List, Optional
 import numpy as np
 from openai import AsyncOpenAI
+from app.services.memory_v2.simd import cosine
 from app.core.config import settings
+from app.core.http_client import get_http_client
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -27,14 +29,16 @@ class EmbeddingService:
 
     async def initialize(self) -> None:
         """Initialize embedding service"""
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+        self.client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            http_client=get_http_client(),
+        )
         logger.info("Embedding service initialized", model=self.model)
 
     async def shutdown(self) -> None:
         """Cleanup resources"""
-        if self.client:
-            await self.client.close()
-            self.client = None
+        # The HTTP pool is shared and closed with the application
+        self.client = None
         self.cache.clear()
         logger.info("Embedding service shutdown")
 
@@ -93,21 +97,23 @@ class EmbeddingService:
             use_cache: Use cached embeddings
             
         Returns:
-            List of embedding vectors
+            List of embedding vectors, in input order
         """
         if not self.client:
             raise RuntimeError("Embedding service not initialized")
 
-        embeddings = []
-        texts_to_embed = []
-        cached_indices = []
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        texts_to_embed: List[str] = []
+        positions: dict[str, List[int]] = {}
 
-        # Check cache
+        # Check cache; repeated texts are embedded once
         for i, text in enumerate(texts):
             if use_cache and text in self.cache:
-                embeddings.append(self.cache[text])
-                cached_indices.append(i)
+                embeddings[i] = self.cache[text]
+            elif text in positions:
+                positions[text].append(i)
             else:
+                positions[text] = [i]
                 texts_to_embed.append(text)
 
         # Generate embeddings for uncached texts
@@ -118,18 +124,19 @@ class EmbeddingService:
                     input=texts_to_embed,
                 )
                 
-                for i, data in enumerate(response.data):
+                for text, data in zip(texts_to_embed, response.data):
                     embedding = data.embedding
-                    embeddings.append(embedding)
+                    for i in positions[text]:
+                        embeddings[i] = embedding
                     
                     # Cache it
                     if use_cache:
-                        self.cache[texts_to_embed[i]] = embedding
+                        self.cache[text] = embedding
 
                 logger.debug(
                     "Batch embeddings generated",
                     total=len(texts),
-                    cached=len(cached_indices),
+                    cached=len(texts) - sum(len(p) for p in positions.values()),
                     generated=len(texts_to_embed),
                 )
 
@@ -151,17 +158,7 @@ class EmbeddingService:
         Returns:
             Similarity score (0-1)
         """
-        arr1 = np.array(vec1)
-        arr2 = np.array(vec2)
-        
-        dot_product = np.dot(arr1, arr2)
-        norm1 = np.linalg.norm(arr1)
-        norm2 = np.linalg.norm(arr2)
-        
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
-        
-        return float(dot_product / (norm1 * norm2))
+        return cosine(vec1, vec2)
 
     @staticmethod
     def euclidean_distance(vec1: List[float], vec2: List[float]) -> float:
@@ -1,7 +1,19 @@
 """Long-term memory using ChromaDB for semantic search"""
 
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+import asyncio
+import itertools
+import os
+import sqlite3
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass
+from functools import partial
+from time import time_ns
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from datetime import datetime, timedelta, timezone
+import numpy as np
 
 # Make ChromaDB optional
 try:
@@ -14,12 +26,53 @@ except ImportError:
     CHROMADB_AVAILABLE = False
 
 from app.services.memory_v2.embeddings import embedding_service
+from app.services.memory_v2.query_cache import QueryCache
 from app.services.memory_v2.policy import MemoryType, MemoryImportance
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.services.monitoring import metrics
 
 logger = get_logger(__name__)
 
+_EPOCH = datetime(1970, 1, 1)
+
+# IDs per collection.delete call, to keep SQL IN-lists bounded
+_DELETE_CHUNK_SIZE = 1000
+
+# Collections for different memory types, each split into shards
+_BASE_COLLECTIONS = (
+    "conversations",
+    "preferences",
+    "rules",
+    "facts",
+    "actions",
+)
+
+
+def _utc_isoformat(ns: int) -> str:
+    """Format epoch nanoseconds like datetime.utcnow().isoformat()"""
+    return (_EPOCH + timedelta(microseconds=ns // 1000)).isoformat()
+
+
+@dataclass
+class _PendingMemory:
+    """Memory queued for the next batched collection write"""
+    memory_id: str
+    content: str
+    metadata: Dict[str, Any]
+    embedding: Optional[List[float]]
+    # Settled once the entry is written or lost; only set if a caller waits
+    written: Optional["asyncio.Future[None]"] = None
+
+    def settle(self, error: Optional[BaseException] = None) -> None:
+        """Report the outcome of the write to a waiting caller"""
+        if self.written is None or self.written.done():
+            return
+        if error is None:
+            self.written.set_result(None)
+        else:
+            self.written.set_exception(error)
+
 
 class LongTermMemory:
     """
@@ -31,11 +84,44 @@ class LongTermMemory:
     - Persistent storage
     - Metadata filtering
     - Collections by memory type
+    - Write-behind batching of adds
+    - Query result cache in front of search
+    - Collections sharded by user, so one heavy user does not slow the rest
+    
+    Chroma pays an index update and a SQLite transaction per add call, so
+    adds are queued and written in batches of up to batch_size, at most
+    flush_interval seconds after the first queued add. Queued entries are
+    embedded together in the same pass. Reads flush the queue first, so an
+    added memory is always visible to them. Callers that must know the
+    write succeeded pass wait=True to add() or add_many().
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        batch_size: int = 128,
+        flush_interval: float = 0.05,
+        query_cache: Optional[QueryCache] = None,
+        max_parallel_queries: int = 8,
+        workers: int = 4,
+        shards: int = 8,
+    ):
         self.client: Optional[chromadb.Client] = None
         self.collections: Dict[str, chromadb.Collection] = {}
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.query_cache = query_cache or QueryCache()
+        self.workers = workers
+        self.shards = max(1, shards)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[str, List[_PendingMemory]] = {}
+        self._pending_count = 0
+        self._has_pending = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._query_semaphore = asyncio.Semaphore(max_parallel_queries)
+        # Keeps IDs unique when the clock does not advance between adds
+        self._id_sequence = itertools.count()
 
     async def initialize(self) -> None:
         """Initialize ChromaDB client and collections"""
@@ -55,19 +141,23 @@ class LongTermMemory:
         )
 
         # Create collections for different memory types
-        collection_names = [
-            "conversations",
-            "preferences",
-            "rules",
-            "facts",
-            "actions",
-        ]
+        for base in _BASE_COLLECTIONS:
+            for shard in range(self.shards):
+                name = self._shard_name(base, shard)
+                self.collections[name] = self.client.get_or_create_collection(
+                    name=name,
+                    metadata={"description": f"{base.capitalize()} memories"},
+                )
 
-        for name in collection_names:
-            self.collections[name] = self.client.get_or_create_collection(
-                name=name,
-                metadata={"description": f"{name.capitalize()} memories"},
-            )
+        # Chroma calls block on SQLite and HNSW; keep them off the event loop
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="chroma",
+        )
+
+        await self._call(self._ensure_metadata_index)
+
+        self._flush_task = asyncio.create_task(self._flusher_loop())
 
         logger.info(
             "Long-term memory initialized",
@@ -75,12 +165,66 @@ class LongTermMemory:
             persist_dir=settings.chroma_persist_dir,
         )
 
+    def _ensure_metadata_index(self) -> None:
+        """
+        Index metadata equality filters in Chroma's SQLite store
+        
+        Every search filters on user_id; without an index on
+        (key, string_value) Chroma scans the whole metadata table. Newer
+        Chroma versions create this index themselves.
+        """
+        path = os.path.join(settings.chroma_persist_dir, "chroma.sqlite3")
+        if not os.path.exists(path):
+            # In-memory client, nothing to index
+            return
+
+        try:
+            with closing(sqlite3.connect(path, timeout=5.0)) as conn:
+                for _, name, *_ in conn.execute("PRAGMA index_list(embedding_metadata)"):
+                    columns = [
+                        row[2]
+                        for row in conn.execute("SELECT * FROM pragma_index_info(?)", (name,))
+                    ]
+                    if columns[:2] == ["key", "string_value"]:
+                        return
+
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_embedding_metadata_key_string "
+                    "ON embedding_metadata(key, string_value)"
+                )
+                conn.commit()
+
+            logger.info("Created Chroma metadata index", path=path)
+
+        except sqlite3.Error as e:
+            logger.warning("Failed to index Chroma metadata", error=str(e))
+
     async def shutdown(self) -> None:
         """Cleanup resources"""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+
+        # Write whatever is still queued
+        await self.flush()
+
+        if self._pool:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
         self.collections.clear()
         self.client = None
         logger.info("Long-term memory shutdown")
 
+    async def _call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking Chroma call on the Chroma worker pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, partial(fn, *args, **kwargs))
+
     async def add(
         self,
         user_id: str,
@@ -89,6 +233,7 @@ class LongTermMemory:
         importance: MemoryImportance = MemoryImportance.MEDIUM,
         metadata: Optional[Dict[str, Any]] = None,
         embedding: Optional[List[float]] = None,
+        wait: bool = False,
     ) -> str:
         """
         Add entry to long-term memory
@@ -100,6 +245,8 @@ class LongTermMemory:
             importance: Importance level
             metadata: Optional metadata
             embedding: Optional pre-computed embedding
+            wait: Return only once the entry is written; raise if the
+                write fails
             
         Returns:
             Memory ID
@@ -111,48 +258,281 @@ class LongTermMemory:
             raise RuntimeError("Long-term memory not initialized")
 
         try:
-            # Generate embedding if not provided
-            if embedding is None:
-                embedding = await embedding_service.embed(content)
-
-            # Generate unique ID
-            memory_id = f"{user_id}_{datetime.utcnow().timestamp()}"
-
-            # Determine collection
-            collection_name = self._get_collection_name(memory_type)
-            collection = self.collections.get(collection_name, self.collections["conversations"])
-
-            # Prepare metadata
-            full_metadata = {
-                "user_id": user_id,
-                "memory_type": memory_type.value,
-                "importance": importance.value,
-                "timestamp": datetime.utcnow().isoformat(),
-                **(metadata or {}),
-            }
-
-            # Add to collection
-            collection.add(
-                embeddings=[embedding],
-                documents=[content],
-                metadatas=[full_metadata],
-                ids=[memory_id],
+            now_ns = time_ns()
+            memory_id = f"{user_id}_{now_ns}_{next(self._id_sequence)}"
+            collection_name, item = self._prepare(
+                user_id,
+                memory_id,
+                _utc_isoformat(now_ns),
+                content,
+                memory_type,
+                importance,
+                metadata,
+                embedding,
             )
 
+            if wait:
+                item.written = asyncio.get_running_loop().create_future()
+
+            # Queue for the next batched write
+            self._enqueue(collection_name, item)
+
             logger.debug(
-                "Added to long-term memory",
+                "Queued for long-term memory",
                 user_id=user_id,
                 memory_id=memory_id,
                 memory_type=memory_type.value,
                 collection=collection_name,
             )
 
+            if item.written is not None:
+                await item.written
+
             return memory_id
 
         except Exception as e:
             logger.error("Failed to add to long-term memory", error=str(e))
             raise
 
+    async def add_many(
+        self,
+        user_id: str,
+        items: Sequence[Dict[str, Any]],
+        wait: bool = False,
+    ) -> List[str]:
+        """
+        Add several entries to long-term memory
+        
+        Args:
+            user_id: User identifier
+            items: Keyword arguments of add() for each entry: content and
+                optionally memory_type, importance, metadata, embedding
+            wait: Return only once all entries are written; raise if any
+                write fails
+            
+        Returns:
+            Memory IDs, in input order
+        """
+        if not settings.long_term_memory_enabled:
+            return []
+
+        if not self.client:
+            raise RuntimeError("Long-term memory not initialized")
+
+        # One clock read and one ISO format for the whole batch
+        now_ns = time_ns()
+        timestamp = _utc_isoformat(now_ns)
+        memory_ids = []
+        waiters = []
+
+        for entry in items:
+            memory_id = f"{user_id}_{now_ns}_{next(self._id_sequence)}"
+            collection_name, item = self._prepare(
+                user_id,
+                memory_id,
+                timestamp,
+                entry["content"],
+                entry.get("memory_type", MemoryType.CONVERSATION),
+                entry.get("importance", MemoryImportance.MEDIUM),
+                entry.get("metadata"),
+                entry.get("embedding"),
+            )
+            if wait:
+                item.written = asyncio.get_running_loop().create_future()
+                waiters.append(item.written)
+            self._enqueue(collection_name, item)
+            memory_ids.append(memory_id)
+
+        logger.debug(
+            "Queued for long-term memory",
+            user_id=user_id,
+            count=len(memory_ids),
+        )
+
+        if waiters:
+            # Settle every future before raising, so none is left unobserved
+            results = await asyncio.gather(*waiters, return_exceptions=True)
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+
+        return memory_ids
+
+    def _prepare(
+        self,
+        user_id: str,
+        memory_id: str,
+        timestamp: str,
+        content: str,
+        memory_type: MemoryType,
+        importance: MemoryImportance,
+        metadata: Optional[Dict[str, Any]],
+        embedding: Optional[List[float]],
+    ) -> Tuple[str, _PendingMemory]:
+        """Pick the collection and build the queued entry for a memory"""
+        collection_name = self._get_collection_name(memory_type, user_id)
+        if collection_name not in self.collections:
+            collection_name = self._shard_name("conversations", self._shard_index(user_id))
+
+        full_metadata = {
+            "user_id": user_id,
+            "memory_type": memory_type.value,
+            "importance": importance.value,
+            "timestamp": timestamp,
+            # Chroma rejects None values, which would fail the whole batch
+            **{k: v for k, v in (metadata or {}).items() if v is not None},
+        }
+
+        # Chroma range filters are numeric only; cleanup_expired filters on this
+        expires_at = full_metadata.get("expires_at")
+        if isinstance(expires_at, str):
+            expires_dt = datetime.fromisoformat(expires_at)
+            if expires_dt.tzinfo is None:
+                expires_dt = expires_dt.replace(tzinfo=timezone.utc)
+            full_metadata["expires_at_ts"] = expires_dt.timestamp()
+
+        return collection_name, _PendingMemory(
+            memory_id=memory_id,
+            content=content,
+            metadata=full_metadata,
+            embedding=embedding,
+        )
+
+    def _enqueue(self, collection_name: str, item: _PendingMemory) -> None:
+        """Queue a memory and wake the flusher"""
+        # Cached searches of this collection, or of all, no longer hold
+        self.query_cache.invalidate(item.metadata["user_id"], (collection_name, "*"))
+
+        self._pending.setdefault(collection_name, []).append(item)
+        self._pending_count += 1
+        self._has_pending.set()
+        if self._pending_count >= self.batch_size:
+            self._batch_full.set()
+
+    async def _flusher_loop(self) -> None:
+        """Write queued memories in batches"""
+        while True:
+            await self._has_pending.wait()
+
+            # Let concurrent adds join the batch unless it is already full
+            if self._pending_count < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+            await self.flush()
+
+    async def flush(self) -> None:
+        """
+        Write all queued memories
+        
+        Returns once everything queued before the call is searchable,
+        including batches another flush already started.
+        """
+        async with self._flush_lock:
+            pending, self._pending = self._pending, {}
+            self._pending_count = 0
+            self._has_pending.clear()
+            self._batch_full.clear()
+
+            try:
+                await self._write_pending(pending)
+            finally:
+                # Entries the write did not reach, e.g. on cancellation
+                for items in pending.values():
+                    for item in items:
+                        item.settle(RuntimeError("Long-term memory write interrupted"))
+
+    async def _write_pending(self, pending: Dict[str, List[_PendingMemory]]) -> None:
+        """Embed and write dequeued memories, settling each entry"""
+        await self._embed_pending(pending)
+
+        for collection_name, items in pending.items():
+            collection = self.collections.get(collection_name)
+            if collection is None:
+                logger.warning(
+                    "Dropping queued memories for missing collection",
+                    collection=collection_name,
+                    count=len(items),
+                )
+                error = RuntimeError(f"Collection {collection_name} not found")
+                for item in items:
+                    item.settle(error)
+                continue
+
+            # Entries whose embedding failed were settled by _embed_pending
+            items = [item for item in items if item.embedding is not None]
+
+            for start in range(0, len(items), self.batch_size):
+                batch = items[start:start + self.batch_size]
+                try:
+                    await self._call(
+                        collection.add,
+                        embeddings=[item.embedding for item in batch],
+                        documents=[item.content for item in batch],
+                        metadatas=[item.metadata for item in batch],
+                        ids=[item.memory_id for item in batch],
+                    )
+                    logger.debug(
+                        "Wrote long-term memories",
+                        collection=collection_name,
+                        count=len(batch),
+                    )
+                except Exception as e:
+                    logger.error(
+                        "Failed to write long-term memories",
+                        collection=collection_name,
+                        count=len(batch),
+                        error=str(e),
+                    )
+                    for item in batch:
+                        item.settle(e)
+                else:
+                    for item in batch:
+                        item.settle()
+
+    async def _embed_pending(self, pending: Dict[str, List[_PendingMemory]]) -> None:
+        """Embed queued entries that came without an embedding, in batches"""
+        missing = [
+            item
+            for items in pending.values()
+            for item in items
+            if item.embedding is None
+        ]
+        if not missing:
+            return
+
+        batches = [
+            missing[start:start + self.batch_size]
+            for start in range(0, len(missing), self.batch_size)
+        ]
+        results = await asyncio.gather(
+            *(
+                embedding_service.embed_batch([item.content for item in batch])
+                for batch in batches
+            ),
+            return_exceptions=True,
+        )
+
+        for batch, embeddings in zip(batches, results):
+            if isinstance(embeddings, BaseException):
+                logger.error(
+                    "Failed to embed long-term memories",
+                    count=len(batch),
+                    error=str(embeddings),
+                )
+                for item in batch:
+                    item.settle(embeddings)
+                continue
+            for item, embedding in zip(batch, embeddings):
+                item.embedding = embedding
+
+    async def _flush_pending(self) -> None:
+        """Flush before a read if writes are queued or in flight"""
+        if self._pending_count or self._flush_lock.locked():
+            await self.flush()
+
     async def search(
         self,
         user_id: str,
@@ -160,6 +540,7 @@ class LongTermMemory:
         memory_type: Optional[MemoryType] = None,
         limit: int = 5,
         min_similarity: float = 0.7,
+        query_embedding: Optional[List[float]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Search long-term memories semantically
@@ -170,6 +551,7 @@ class LongTermMemory:
             memory_type: Optional type filter
             limit: Maximum results
             min_similarity: Minimum similarity threshold
+            query_embedding: Precomputed embedding of query
             
         Returns:
             List of matching memories
@@ -180,45 +562,69 @@ class LongTermMemory:
         if not self.client:
             raise RuntimeError("Long-term memory not initialized")
 
+        start_time = time.perf_counter()
+        scope = self._get_collection_name(memory_type, user_id) if memory_type else "*"
+
         try:
-            # Generate query embedding
-            query_embedding = await embedding_service.embed(query)
+            # Repeated query text needs neither an embedding nor a query
+            cached = self.query_cache.get(user_id, scope, query, limit, min_similarity)
 
-            # Determine which collections to search
-            if memory_type:
-                collection_name = self._get_collection_name(memory_type)
-                collections = [self.collections[collection_name]]
-            else:
-                # Search all collections
-                collections = list(self.collections.values())
+            # Generate query embedding
+            if cached is None and query_embedding is None:
+                query_embedding = await embedding_service.embed(query)
 
-            all_results = []
+            if cached is None:
+                cached = self.query_cache.get_similar(
+                    user_id, scope, query_embedding, limit, min_similarity
+                )
 
-            for collection in collections:
-                # Query collection
-                results = collection.query(
-                    query_embeddings=[query_embedding],
-                    n_results=limit,
-                    where={"user_id": user_id},
+            if cached is not None:
+                metrics.record_memory_operation(
+                    "search",
+                    "long_term",
+                    len(cached),
+                    duration=time.perf_counter() - start_time,
+                    cache_hit=True,
                 )
+                return cached
 
-                if results["documents"]:
-                    for i in range(len(results["documents"][0])):
-                        distance = results["distances"][0][i] if results["distances"] else 0
-                        # Convert distance to similarity (1 - distance for L2)
-                        similarity = 1 - distance
+            generation = self.query_cache.generation(user_id)
 
-                        if similarity >= min_similarity:
-                            all_results.append({
-                                "content": results["documents"][0][i],
-                                "metadata": results["metadatas"][0][i] if results["metadatas"] else {},
-                                "similarity": similarity,
-                                "distance": distance,
-                            })
+            # Make memories added so far visible
+            await self._flush_pending()
 
-            # Sort by similarity and limit
-            all_results.sort(key=lambda x: x["similarity"], reverse=True)
-            final_results = all_results[:limit]
+            # Determine which collections to search
+            if memory_type:
+                collections = [self.collections[scope]]
+            else:
+                # Search all collections of the user's shard
+                collections = list(self._user_collections(user_id).values())
+
+            # Query collections concurrently
+            results_list = await asyncio.gather(*(
+                self._query(collection, query_embedding, limit, user_id)
+                for collection in collections
+            ))
+
+            final_results = self._top_results(results_list, limit, min_similarity)
+
+            self.query_cache.put(
+                user_id,
+                scope,
+                query,
+                limit,
+                min_similarity,
+                query_embedding,
+                final_results,
+                generation,
+            )
+
+            metrics.record_memory_operation(
+                "search",
+                "long_term",
+                len(final_results),
+                duration=time.perf_counter() - start_time,
+            )
 
             logger.debug(
                 "Long-term memory search",
@@ -233,6 +639,124 @@ class LongTermMemory:
             logger.error("Long-term memory search failed", error=str(e))
             return []
 
+    @staticmethod
+    def _top_results(
+        results_list: List[Dict[str, Any]],
+        limit: int,
+        min_similarity: float,
+    ) -> List[Dict[str, Any]]:
+        """
+        Merge collection query results into the global top hits
+        
+        Args:
+            results_list: collection.query() results, one per collection
+            limit: Maximum results
+            min_similarity: Minimum similarity threshold
+            
+        Returns:
+            Hits sorted by similarity, best first
+        """
+        sources = [r for r in results_list if r["documents"] and r["documents"][0]]
+        if not sources or limit <= 0:
+            return []
+
+        lengths = [len(r["documents"][0]) for r in sources]
+        distances = np.concatenate([
+            np.asarray(r["distances"][0], dtype=np.float64)
+            if r["distances"]
+            else np.zeros(length)
+            for r, length in zip(sources, lengths)
+        ])
+        owners = np.repeat(np.arange(len(sources)), lengths)
+        offsets = np.cumsum([0] + lengths[:-1])
+
+        # Convert distance to similarity (1 - distance for L2)
+        similarities = 1.0 - distances
+        candidates = np.flatnonzero(similarities >= min_similarity)
+
+        # O(N) selection of the top hits, then sort only those
+        if len(candidates) > limit:
+            top = np.argpartition(-similarities[candidates], limit - 1)[:limit]
+            candidates = candidates[top]
+        candidates = candidates[np.argsort(-similarities[candidates], kind="stable")]
+
+        hits = []
+        for index in candidates:
+            results = sources[owners[index]]
+            i = index - offsets[owners[index]]
+            hits.append({
+                "content": results["documents"][0][i],
+                "metadata": results["metadatas"][0][i] if results["metadatas"] else {},
+                "similarity": float(similarities[index]),
+                "distance": float(distances[index]),
+            })
+
+        return hits
+
+    async def _query(
+        self,
+        collection: "chromadb.Collection",
+        query_embedding: List[float],
+        limit: int,
+        user_id: str,
+    ) -> Dict[str, Any]:
+        """Query one collection on the Chroma worker pool"""
+        # Chroma releases the GIL in SQLite and HNSW, so queries overlap;
+        # the semaphore keeps concurrent searches from piling onto the index
+        async with self._query_semaphore:
+            return await self._call(
+                collection.query,
+                query_embeddings=[query_embedding],
+                n_results=limit,
+                where={"user_id": user_id},
+            )
+
+    async def search_many(
+        self,
+        user_id: str,
+        queries: List[str],
+        memory_type: Optional[MemoryType] = None,
+        limit: int = 5,
+        min_similarity: float = 0.7,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search long-term memories for several queries
+        
+        Args:
+            user_id: User identifier
+            queries: Search queries
+            memory_type: Optional type filter
+            limit: Maximum results per query
+            min_similarity: Minimum similarity threshold
+            
+        Returns:
+            List of matching memories for each query, in input order
+        """
+        if not settings.long_term_memory_enabled or not queries:
+            return [[] for _ in queries]
+
+        if not self.client:
+            raise RuntimeError("Long-term memory not initialized")
+
+        try:
+            # One embedding request for all queries
+            query_embeddings = await embedding_service.embed_batch(queries)
+        except Exception as e:
+            logger.error("Long-term memory search failed", error=str(e))
+            return [[] for _ in queries]
+
+        return list(await asyncio.gather(*(
+            self.search(
+                user_id,
+                query,
+                memory_type,
+                limit,
+                min_similarity,
+                query_embedding=query_embedding,
+            )
+            for query, query_embedding in zip(queries, query_embeddings)
+        )))
+
     async def get_by_type(
         self,
         user_id: str,
@@ -253,14 +777,17 @@ class LongTermMemory:
         if not settings.long_term_memory_enabled:
             return []
 
-        collection_name = self._get_collection_name(memory_type)
+        collection_name = self._get_collection_name(memory_type, user_id)
         collection = self.collections.get(collection_name)
 
         if not collection:
             return []
 
+        await self._flush_pending()
+
         try:
-            results = collection.get(
+            results = await self._call(
+                collection.get,
                 where={"user_id": user_id},
                 limit=limit,
             )
@@ -283,12 +810,15 @@ class LongTermMemory:
     async def delete(
         self,
         memory_id: str,
+        user_id: Optional[str] = None,
     ) -> bool:
         """
         Delete memory by ID
         
         Args:
             memory_id: Memory identifier
+            user_id: Owner of the memory; only their shard is searched if
+                given, otherwise every collection is
             
         Returns:
             True if deleted
@@ -296,15 +826,26 @@ class LongTermMemory:
         if not self.client:
             return False
 
-        # Try to delete from all collections
-        deleted = False
-        for collection in self.collections.values():
-            try:
-                collection.delete(ids=[memory_id])
-                deleted = True
-                logger.debug("Deleted from long-term memory", memory_id=memory_id)
-            except:
-                pass
+        await self._flush_pending()
+
+        if user_id is not None:
+            collections = list(self._user_collections(user_id).values())
+        else:
+            collections = list(self.collections.values())
+
+        results = await asyncio.gather(
+            *(self._call(collection.delete, ids=[memory_id]) for collection in collections),
+            return_exceptions=True,
+        )
+        deleted = any(not isinstance(result, Exception) for result in results)
+        if deleted:
+            logger.debug("Deleted from long-term memory", memory_id=memory_id)
+
+        if user_id is not None:
+            self.query_cache.invalidate(user_id)
+        else:
+            # The owner is not known from the ID alone
+            self.query_cache.clear()
 
         return deleted
 
@@ -321,35 +862,64 @@ class LongTermMemory:
         Returns:
             Number of deleted entries
         """
-        current_time = datetime.utcnow()
+        await self._flush_pending()
+
+        # Let Chroma select expired entries instead of scanning them here
+        where_filter: Dict[str, Any] = {"expires_at_ts": {"$lte": time.time()}}
+        if user_id:
+            where_filter = {"$and": [{"user_id": user_id}, where_filter]}
+
         deleted_count = 0
 
-        for collection in self.collections.values():
+        if user_id:
+            collections = self._user_collections(user_id).values()
+        else:
+            collections = self.collections.values()
+
+        for collection in collections:
             try:
-                # Get all entries
-                where_filter = {"user_id": user_id} if user_id else {}
-                results = collection.get(where=where_filter)
-
-                if results["metadatas"]:
-                    for i, metadata in enumerate(results["metadatas"]):
-                        expires_at_str = metadata.get("expires_at")
-                        if expires_at_str:
-                            expires_at = datetime.fromisoformat(expires_at_str)
-                            if current_time >= expires_at:
-                                memory_id = results["ids"][i]
-                                collection.delete(ids=[memory_id])
-                                deleted_count += 1
+                results = await self._call(collection.get, where=where_filter, include=[])
+                expired_ids = results["ids"]
+
+                for start in range(0, len(expired_ids), _DELETE_CHUNK_SIZE):
+                    chunk = expired_ids[start:start + _DELETE_CHUNK_SIZE]
+                    await self._call(collection.delete, ids=chunk)
+                    deleted_count += len(chunk)
 
             except Exception as e:
                 logger.error("Cleanup failed for collection", error=str(e))
 
         if deleted_count > 0:
+            if user_id:
+                self.query_cache.invalidate(user_id)
+            else:
+                self.query_cache.clear()
             logger.info("Cleaned up expired memories", count=deleted_count)
 
         return deleted_count
 
-    def _get_collection_name(self, memory_type: MemoryType) -> str:
-        """Get collection name for memory type"""
+    def _shard_index(self, user_id: str) -> int:
+        """Get the shard holding a user's memories"""
+        # crc32 is stable across processes, unlike hash()
+        return zlib.crc32(user_id.encode("utf-8")) % self.shards
+
+    def _shard_name(self, base: str, shard: int) -> str:
+        """Get collection name of one shard of a base collection"""
+        # A single shard keeps the unsharded names
+        return f"{base}_{shard}" if self.shards > 1 else base
+
+    def _user_collections(self, user_id: str) -> Dict[str, "chromadb.Collection"]:
+        """Get a user's collection of each base collection, by base name"""
+        shard = self._shard_index(user_id)
+        collections = {}
+        for base in _BASE_COLLECTIONS:
+            collection = self.collections.get(self._shard_name(base, shard))
+            if collection is not None:
+                collections[base] = collection
+        return collections
+
+    def _get_collection_name(self, memory_type: MemoryType, user_id: str) -> str:
+        """Get name of the user's collection for memory type"""
         mapping = {
             MemoryType.CONVERSATION: "conversations",
             MemoryType.PREFERENCE: "preferences",
@@ -358,27 +928,46 @@ class LongTermMemory:
             MemoryType.ACTION: "actions",
             MemoryType.ERROR: "conversations",  # Errors go to conversations
         }
-        return mapping.get(memory_type, "conversations")
+        base = mapping.get(memory_type, "conversations")
+        return self._shard_name(base, self._shard_index(user_id))
 
     async def get_stats(self, user_id: str) -> Dict[str, Any]:
         """Get long-term memory statistics"""
         
+        await self._flush_pending()
+
         stats = {
             "collections": {},
             "total": 0,
         }
 
-        for name, collection in self.collections.items():
+        for name, collection in self._user_collections(user_id).items():
             try:
-                results = collection.get(where={"user_id": user_id})
+                results = await self._call(
+                    collection.get,
+                    where={"user_id": user_id},
+                    include=[],
+                )
                 count = len(results["ids"]) if results["ids"] else 0
                 stats["collections"][name] = count
                 stats["total"] += count
-            except:
+            except Exception:
                 stats["collections"][name] = 0
 
         return stats
 
 
 # Global instance
-long_term_memory = LongTermMemory()
+long_term_memory = LongTermMemory(
+    batch_size=settings.ltm_batch_size,
+    flush_interval=settings.ltm_flush_interval,
+    query_cache=QueryCache(
+        max_size=settings.ltm_query_cache_size,
+        ttl_seconds=settings.ltm_query_cache_ttl_seconds,
+        threshold=settings.ltm_query_cache_threshold,
+        quantize=settings.ltm_cache_quantize,
+    ),
+    max_parallel_queries=settings.ltm_max_parallel_queries,
+    workers=settings.chroma_workers,
+    shards=settings.ltm_shards,
+)
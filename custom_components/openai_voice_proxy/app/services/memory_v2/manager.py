@@ -37,8 +37,9 @@ class MemoryManager:
 
     async def shutdown(self) -> None:
         """Shutdown memory manager"""
-        await self.embeddings.shutdown()
+        # Long-term memory writes out queued memories first
         await self.long_term.shutdown()
+        await self.embeddings.shutdown()
         logger.info("Memory manager shutdown")
 
     async def remember(
@@ -110,6 +111,8 @@ class MemoryManager:
                     "role": role,
                     "expires_at": expires_at.isoformat() if expires_at else None,
                 },
+                # Critical memories must not be lost silently
+                wait=importance == MemoryImportance.CRITICAL,
             )
             saved_to.append("long_term")
 
@@ -0,0 +1,266 @@
+"""Query result cache for long-term memory search"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+import numpy as np
+from app.services.memory_v2.simd import cosine_batch, quantize_i8
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# (user_id, scope, limit, min_similarity, normalized query)
+_Key = Tuple[str, str, int, float, str]
+
+
+@dataclass
+class _QueryCacheEntry:
+    """Search results with the query embedding they were computed for"""
+    # Unit float32 vector, or its int8 quantization
+    embedding: Optional[np.ndarray]
+    results: List[Dict[str, Any]]
+    expires_at: float
+
+
+class QueryCache:
+    """
+    Bounded LRU + TTL cache of long-term memory search results.
+
+    Features:
+    - Exact hits on the normalized query text, before any embedding call
+    - Semantic hits on cached query embeddings of the same user and scope
+    - Per-user invalidation when that user's memories change
+    - Optional int8 quantization of cached embeddings (4x less memory)
+
+    A scope is the collection searched, or "*" for a search across all
+    collections.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 2000,
+        ttl_seconds: float = 300.0,
+        threshold: float = 0.97,
+        quantize: bool = True,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+        self.quantize = quantize
+        self._entries: "OrderedDict[_Key, _QueryCacheEntry]" = OrderedDict()
+        self._partitions: Dict[Tuple[str, str], Set[_Key]] = {}
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Normalize query text for exact matching"""
+        return " ".join(query.lower().split())
+
+    def generation(self, user_id: str) -> Tuple[int, int]:
+        """
+        Current invalidation generation of a user
+
+        Take it before searching and pass it to put(), so results computed
+        while the user's memories changed are not cached.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            Opaque generation token
+        """
+        with self._lock:
+            return self._epoch, self._generations.get(user_id, 0)
+
+    def get(
+        self,
+        user_id: str,
+        scope: str,
+        query: str,
+        limit: int,
+        min_similarity: float,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Find cached results for the same query text
+
+        Args:
+            user_id: User identifier
+            scope: Collection name or "*"
+            query: Search query
+            limit: Maximum results
+            min_similarity: Minimum similarity threshold
+
+        Returns:
+            Cached results or None
+        """
+        key = (user_id, scope, limit, min_similarity, self.normalize(query))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+            return list(entry.results)
+
+    def get_similar(
+        self,
+        user_id: str,
+        scope: str,
+        embedding: Sequence[float],
+        limit: int,
+        min_similarity: float,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Find cached results for a semantically similar query
+
+        Args:
+            user_id: User identifier
+            scope: Collection name or "*"
+            embedding: Query embedding
+            limit: Maximum results
+            min_similarity: Minimum similarity threshold
+
+        Returns:
+            Results of the most similar cached query above the threshold,
+            or None
+        """
+        query = self._prepare_vector(embedding)
+        if query is None:
+            return None
+
+        now = time.monotonic()
+        keys: List[_Key] = []
+        vectors: List[np.ndarray] = []
+
+        with self._lock:
+            for key in list(self._partitions.get((user_id, scope), ())):
+                if key[2] != limit or key[3] != min_similarity:
+                    continue
+
+                entry = self._entries[key]
+                if entry.expires_at <= now:
+                    self._remove(key)
+                    continue
+                if entry.embedding is None or entry.embedding.shape != query.shape:
+                    continue
+
+                keys.append(key)
+                vectors.append(entry.embedding)
+
+            if not keys:
+                return None
+
+            # One batched kernel call over the partition
+            scores = cosine_batch(query, np.stack(vectors))
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+
+            logger.debug("Memory query cache semantic hit", similarity=float(scores[best]))
+            self._entries.move_to_end(keys[best])
+            return list(self._entries[keys[best]].results)
+
+    def put(
+        self,
+        user_id: str,
+        scope: str,
+        query: str,
+        limit: int,
+        min_similarity: float,
+        embedding: Optional[Sequence[float]],
+        results: List[Dict[str, Any]],
+        generation: Tuple[int, int],
+    ) -> None:
+        """
+        Cache search results
+
+        Args:
+            user_id: User identifier
+            scope: Collection name or "*"
+            query: Search query
+            limit: Maximum results
+            min_similarity: Minimum similarity threshold
+            embedding: Query embedding
+            results: Search results
+            generation: generation() taken before the search started
+        """
+        key = (user_id, scope, limit, min_similarity, self.normalize(query))
+        vector = self._prepare_vector(embedding) if embedding is not None else None
+
+        with self._lock:
+            if (self._epoch, self._generations.get(user_id, 0)) != generation:
+                return
+
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = _QueryCacheEntry(
+                embedding=vector,
+                results=list(results),
+                expires_at=time.monotonic() + self.ttl_seconds,
+            )
+            self._partitions.setdefault((user_id, scope), set()).add(key)
+
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, user_id: str, scopes: Optional[Sequence[str]] = None) -> None:
+        """
+        Drop cached results of a user
+
+        Args:
+            user_id: User identifier
+            scopes: Scopes to drop; all scopes of the user if None
+        """
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+            if scopes is None:
+                partitions = [p for p in self._partitions if p[0] == user_id]
+            else:
+                partitions = [(user_id, scope) for scope in scopes]
+
+            for partition in partitions:
+                for key in list(self._partitions.get(partition, ())):
+                    self._remove(key)
+
+    def clear(self) -> None:
+        """Drop all cached results"""
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self._partitions.clear()
+
+    def _remove(self, key: _Key) -> None:
+        """Remove an entry and its partition index (lock held)"""
+        self._entries.pop(key, None)
+        partition = (key[0], key[1])
+        keys = self._partitions.get(partition)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._partitions[partition]
+
+    def _prepare_vector(self, embedding: Sequence[float]) -> Optional[np.ndarray]:
+        """Convert to the stored representation: unit float32, or int8"""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if vector.ndim != 1 or norm == 0:
+            return None
+
+        vector = vector / norm
+        if self.quantize:
+            # Scales cancel out in cosine similarity
+            vector, _ = quantize_i8(vector)
+        return vector
@@ -105,7 +105,7 @@ class ShortTermMemory:
             if memory_type:
                 query = query.where(DialogHistory.memory_type == memory_type.value)
 
-            query = query.order_by(desc(DialogHistory.timestamp)).limit(limit)
+            query = query.order_by(desc(DialogHistory.timestamp), desc(DialogHistory.id)).limit(limit)
 
             result = await session.execute(query)
             entries = result.scalars().all()
@@ -155,7 +155,7 @@ class ShortTermMemory:
                     DialogHistory.timestamp >= start_time,
                     DialogHistory.timestamp <= end_time,
                 )
-            ).order_by(DialogHistory.timestamp)
+            ).order_by(DialogHistory.timestamp, DialogHistory.id)
 
             result = await session.execute(query)
             entries = result.scalars().all()
@@ -205,7 +205,7 @@ class ShortTermMemory:
                     DialogHistory.user_id == user_id,
                     DialogHistory.importance.in_(allowed_levels)
                 )
-            ).order_by(desc(DialogHistory.timestamp)).limit(limit)
+            ).order_by(desc(DialogHistory.timestamp), desc(DialogHistory.id)).limit(limit)
 
             result = await session.execute(query)
             entries = result.scalars().all()
@@ -278,7 +278,7 @@ class ShortTermMemory:
             # Get IDs to delete (keep most recent max_size)
             query = select(DialogHistory.id).where(
                 DialogHistory.user_id == user_id
-            ).order_by(desc(DialogHistory.timestamp)).offset(self.max_size)
+            ).order_by(desc(DialogHistory.timestamp), desc(DialogHistory.id)).offset(self.max_size)
 
             result = await session.execute(query)
             ids_to_delete = [row[0] for row in result.all()]
@@ -0,0 +1,95 @@
+"""Cosine similarity kernels, SIMD-accelerated when SimSIMD is available"""
+
+from typing import Sequence, Tuple
+import numpy as np
+
+# Make SimSIMD optional
+try:
+    import simsimd
+    SIMSIMD_AVAILABLE = True
+except ImportError:
+    simsimd = None
+    SIMSIMD_AVAILABLE = False
+
+
+def cosine(a: Sequence[float], b: Sequence[float]) -> float:
+    """
+    Cosine similarity of two vectors
+
+    Args:
+        a: First vector
+        b: Second vector
+
+    Returns:
+        Similarity in [-1, 1]; 0 if either vector is zero
+    """
+    a = np.asarray(a, dtype=np.float32)
+    b = np.asarray(b, dtype=np.float32)
+
+    # SimSIMD scores two zero vectors as identical
+    if not a.any() or not b.any():
+        return 0.0
+
+    if SIMSIMD_AVAILABLE:
+        # SimSIMD returns cosine distance
+        return 1.0 - float(simsimd.cosine(a, b))
+
+    return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+def cosine_batch(query: Sequence[float], matrix: Sequence[Sequence[float]]) -> np.ndarray:
+    """
+    Cosine similarity of a vector against each row of a matrix
+
+    int8 inputs from quantize_i8() are scored with SimSIMD's int8 kernel.
+
+    Args:
+        query: Query vector
+        matrix: Vectors to compare, one per row
+
+    Returns:
+        float32 array of similarities, one per row; 0 for zero rows
+    """
+    query = np.asarray(query)
+    matrix = np.asarray(matrix)
+
+    # Only SimSIMD has int8 kernels; numpy would overflow in int8
+    native_i8 = SIMSIMD_AVAILABLE and query.dtype == np.int8 and matrix.dtype == np.int8
+    if not native_i8:
+        query = query.astype(np.float32, copy=False)
+        matrix = matrix.astype(np.float32, copy=False)
+
+    # A zero query would match zero rows in SimSIMD
+    if matrix.size == 0 or not query.any():
+        return np.zeros(len(matrix), dtype=np.float32)
+
+    if SIMSIMD_AVAILABLE:
+        distances = np.asarray(
+            simsimd.cdist(query[np.newaxis, :], matrix, metric="cosine"),
+            dtype=np.float32,
+        )
+        return 1.0 - distances[0]
+
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    scores = matrix @ query
+    return np.divide(scores, norms, out=np.zeros_like(scores), where=norms > 0)
+
+
+def quantize_i8(vec: Sequence[float]) -> Tuple[np.ndarray, float]:
+    """
+    Quantize a vector to int8 with a symmetric per-vector scale
+
+    Cosine similarity is scale-invariant, so quantized vectors can be
+    compared with cosine_batch() directly.
+
+    Args:
+        vec: Vector to quantize
+
+    Returns:
+        (int8 vector, scale); vec is approximately int8 vector * scale
+    """
+    vec = np.asarray(vec, dtype=np.float32)
+    scale = float(np.max(np.abs(vec))) / 127 if vec.size else 0.0
+    if scale == 0:
+        return np.zeros(vec.shape, dtype=np.int8), 0.0
+    return np.round(vec / scale).astype(np.int8), scale
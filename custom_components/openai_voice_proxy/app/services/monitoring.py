@@ -1,5 +1,8 @@
 """Prometheus monitoring and metrics"""
 
+import time
+from functools import lru_cache
+from typing import Optional
 from prometheus_client import Counter, Histogram, Gauge, Info, generate_latest, CONTENT_TYPE_LATEST
 from app.core.logging import get_logger
 from app import __version__
@@ -115,6 +118,13 @@ memory_search_results = Histogram(
     ["memory_type"],
 )
 
+memory_search_duration_seconds = Histogram(
+    "memory_search_duration_seconds",
+    "Memory search duration in seconds",
+    ["memory_type", "cache_hit"],
+    buckets=(0.001, 0.01, 0.05, 0.2, 1.0),
+)
+
 
 # Active connections
 active_websocket_connections = Gauge(
@@ -122,6 +132,12 @@ active_websocket_connections = Gauge(
     "Number of active WebSocket connections",
 )
 
+realtime_websocket_messages_total = Counter(
+    "realtime_websocket_messages_total",
+    "Total realtime WebSocket messages",
+    ["direction", "type"],
+)
+
 
 # System health
 system_health = Gauge(
@@ -143,6 +159,15 @@ telegram_messages_sent_total = Counter(
 )
 
 
+@lru_cache(maxsize=256)
+def _command_children(intent: str, status: str):
+    """Resolve labeled command metric children once per (intent, status)"""
+    return (
+        commands_processed_total.labels(intent=intent, status=status),
+        command_processing_duration_seconds.labels(intent=intent),
+    )
+
+
 class MetricsCollector:
     """Collector for application metrics"""
 
@@ -155,8 +180,9 @@ class MetricsCollector:
     @staticmethod
     def record_command(intent: str, status: str, duration: float):
         """Record command processing metrics"""
-        commands_processed_total.labels(intent=intent, status=status).inc()
-        command_processing_duration_seconds.labels(intent=intent).observe(duration)
+        counter, histogram = _command_children(intent, status)
+        counter.inc()
+        histogram.observe(duration)
 
     @staticmethod
     def record_ha_call(domain: str, service: str, status: str, duration: float):
@@ -195,17 +221,33 @@ class MetricsCollector:
         habr_search_duration_seconds.labels(method=method).observe(duration)
 
     @staticmethod
-    def record_memory_operation(operation: str, memory_type: str, results_count: int = 0):
+    def record_memory_operation(
+        operation: str,
+        memory_type: str,
+        results_count: int = 0,
+        duration: Optional[float] = None,
+        cache_hit: bool = False,
+    ):
         """Record memory operation metrics"""
         memory_operations_total.labels(operation=operation, memory_type=memory_type).inc()
         if results_count > 0:
             memory_search_results.labels(memory_type=memory_type).observe(results_count)
+        if duration is not None:
+            memory_search_duration_seconds.labels(
+                memory_type=memory_type,
+                cache_hit="true" if cache_hit else "false",
+            ).observe(duration)
 
     @staticmethod
     def record_telegram_message(message_type: str, status: str):
         """Record Telegram message metrics"""
         telegram_messages_sent_total.labels(message_type=message_type, status=status).inc()
 
+    @staticmethod
+    def record_websocket_message(direction: str, message_type: str):
+        """Record realtime WebSocket message (direction: inbound/outbound)"""
+        realtime_websocket_messages_total.labels(direction=direction, type=message_type).inc()
+
     @staticmethod
     def set_websocket_connections(count: int):
         """Set active WebSocket connections count"""
@@ -222,13 +264,28 @@ class MetricsCollector:
         database_health.set(1 if healthy else 0)
 
 
+# Seconds a rendered exposition is reused for repeated scrapes
+_METRICS_SNAPSHOT_TTL = 5.0
+_metrics_snapshot = b""
+_metrics_rendered_at = float("-inf")
+
+
 def get_metrics() -> bytes:
     """Get Prometheus metrics
     
+    Scrapes within a few seconds of each other share one rendering of
+    the registry instead of walking every collector again.
+    
     Returns:
         Metrics in Prometheus format
     """
-    return generate_latest()
+    global _metrics_snapshot, _metrics_rendered_at
+
+    now = time.monotonic()
+    if now - _metrics_rendered_at >= _METRICS_SNAPSHOT_TTL:
+        _metrics_snapshot = generate_latest()
+        _metrics_rendered_at = now
+    return _metrics_snapshot
 
 
 def get_content_type() -> str:
@@ -3,12 +3,28 @@
 import json
 from typing import Dict, Any, Optional
 from datetime import datetime
-from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import (
+    Counter,
+    Histogram,
+    Gauge,
+    generate_latest,
+    disable_created_metrics,
+    CONTENT_TYPE_LATEST,
+)
+from sqlalchemy import insert
 from app.core.database import ActionLog, async_session_maker
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Skip the *_created series every counter and histogram child would export
+disable_created_metrics()
+
+# Bucket bounds, kept short: each observe() scans them linearly
+_FAST_BUCKETS = (0.001, 0.01, 0.05, 0.2, 1.0)
+_REQUEST_BUCKETS = (0.05, 0.2, 1.0, 5.0)
+_SLOW_BUCKETS = (0.5, 1.0, 2.0, 5.0, 10.0)
+
 
 class EnhancedMetrics:
     """
@@ -36,6 +52,7 @@ class EnhancedMetrics:
             "http_request_duration_seconds",
             "HTTP request duration",
             ["method", "endpoint"],
+            buckets=_REQUEST_BUCKETS,
         )
 
         # Pipeline metrics
@@ -48,14 +65,16 @@ class EnhancedMetrics:
             "pipeline_duration_seconds",
             "Pipeline processing duration",
             ["intent"],
-            buckets=(0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0),
+            buckets=_SLOW_BUCKETS,
         )
         self.pipeline_steps_duration = Histogram(
             "pipeline_step_duration_seconds",
             "Individual pipeline step duration",
             ["step"],
-            buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 2.0, 5.0),
+            buckets=(0.01, 0.1, 0.5, 1.0, 5.0),
         )
+        # Labeled children by step, reused across requests
+        self._step_durations: Dict[str, Any] = {}
 
         # Agent metrics
         self.agent_requests_total = Counter(
@@ -72,7 +91,7 @@ class EnhancedMetrics:
             "agent_latency_seconds",
             "Agent processing latency",
             ["agent_type"],
-            buckets=(0.1, 0.5, 1.0, 2.0, 5.0, 10.0),
+            buckets=_SLOW_BUCKETS,
         )
 
         # Memory metrics
@@ -84,7 +103,8 @@ class EnhancedMetrics:
         self.memory_search_duration = Histogram(
             "memory_search_duration_seconds",
             "Memory search duration",
-            ["storage"],
+            ["storage", "cache_hit"],
+            buckets=_FAST_BUCKETS,
         )
         self.memory_size_gauge = Gauge(
             "memory_entries_total",
@@ -120,6 +140,7 @@ class EnhancedMetrics:
             "tts_duration_seconds",
             "TTS synthesis duration",
             ["voice"],
+            buckets=_SLOW_BUCKETS,
         )
         self.tts_characters_total = Counter(
             "tts_characters_total",
@@ -140,6 +161,7 @@ class EnhancedMetrics:
         self.websocket_audio_duration = Histogram(
             "websocket_audio_duration_seconds",
             "WebSocket audio chunk duration",
+            buckets=_REQUEST_BUCKETS,
         )
 
         # Home Assistant metrics
@@ -152,6 +174,7 @@ class EnhancedMetrics:
             "ha_service_duration_seconds",
             "HA service call duration",
             ["domain", "service"],
+            buckets=_REQUEST_BUCKETS,
         )
 
         # System health
@@ -201,11 +224,16 @@ class EnhancedMetrics:
             intent=intent,
         ).observe(duration)
 
+        # All steps of a request are recorded together, skipping the
+        # labels() lookup for steps seen before
         if step_durations:
             for step, step_duration in step_durations.items():
-                self.pipeline_steps_duration.labels(
-                    step=step,
-                ).observe(step_duration)
+                child = self._step_durations.get(step)
+                if child is None:
+                    child = self._step_durations[step] = self.pipeline_steps_duration.labels(
+                        step=step,
+                    )
+                child.observe(step_duration)
 
     def record_agent(
         self,
@@ -236,6 +264,7 @@ class EnhancedMetrics:
         operation: str,
         storage: str,
         duration: Optional[float] = None,
+        cache_hit: bool = False,
     ):
         """Record memory operation metrics"""
         self.memory_operations_total.labels(
@@ -246,6 +275,7 @@ class EnhancedMetrics:
         if duration:
             self.memory_search_duration.labels(
                 storage=storage,
+                cache_hit="true" if cache_hit else "false",
             ).observe(duration)
 
     def record_search(
@@ -369,16 +399,17 @@ class AuditLogger:
         """Log command execution to audit database"""
         try:
             async with async_session_maker() as session:
-                log_entry = ActionLog(
-                    user_id=user_id,
-                    intent=intent,
-                    actions=actions,
-                    confirmed=confirmed,
-                    executed=executed,
-                    success=success,
-                    error=error,
+                await session.execute(
+                    insert(ActionLog).values(
+                        user_id=user_id,
+                        intent=intent,
+                        actions=actions,
+                        confirmed=confirmed,
+                        executed=executed,
+                        success=success,
+                        error=error,
+                    )
                 )
-                session.add(log_entry)
                 await session.commit()
 
             logger.info(
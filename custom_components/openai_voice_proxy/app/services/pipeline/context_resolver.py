@@ -144,20 +144,28 @@ class ContextResolver:
             # Get recent history
             recent_history = await memory_service.get_short_term_history(user_id, limit=10)
 
+            # Embed the command once for both searches and the planner
+            query_embedding = await memory_service.embed_query(command)
+
             # Search relevant long-term memories
-            relevant_memories = await memory_service.search_long_term(user_id, command, limit=3)
+            relevant_memories = await memory_service.search_long_term(
+                user_id, command, limit=3, query_embedding=query_embedding
+            )
 
             # Get user rules
             user_rules = await memory_service.get_user_rules(user_id)
 
             # Search relevant rules
-            relevant_rules = await memory_service.search_relevant_rules(user_id, command, limit=3)
+            relevant_rules = await memory_service.search_relevant_rules(
+                user_id, command, limit=3, query_embedding=query_embedding
+            )
 
             return {
                 "recent_history": recent_history,
                 "relevant_memories": relevant_memories,
                 "user_rules": user_rules,
                 "relevant_rules": relevant_rules,
+                "query_embedding": query_embedding,
             }
 
         except Exception as e:
@@ -1,6 +1,8 @@
 """Executor - executes action plans safely"""
 
-from typing import Dict, Any, List
+import asyncio
+from typing import Dict, Any, List, Set
+from sqlalchemy import insert
 from app.core.logging import get_logger
 from app.core.database import ActionLog, async_session_maker
 from app.integrations.homeassistant import ha_client
@@ -61,7 +63,7 @@ class Executor:
     """
 
     def __init__(self):
-        pass
+        self._background: Set[asyncio.Task] = set()
 
     async def execute(
         self,
@@ -117,8 +119,12 @@ class Executor:
                 "message": "No execution required",
             }
 
-        # Log to audit
-        await self._log_action(user_id, intent, plan, result, confirmed)
+        # Log to audit; the result doesn't depend on it, so don't wait
+        task = asyncio.create_task(
+            self._log_action(user_id, intent, plan, result, confirmed)
+        )
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
 
         return result
 
@@ -139,40 +145,18 @@ class Executor:
 
         result = ExecutionResult()
 
-        for action in actions:
-            try:
-                domain = action.get("domain")
-                service = action.get("service")
-                target = action.get("target", {})
-                service_data = action.get("service_data", {})
-
-                if not domain or not service:
-                    result.add_failure(action, "Missing domain or service")
-                    continue
-
-                logger.info(
-                    "Executing HA action",
-                    domain=domain,
-                    service=service,
-                    dry_run=dry_run,
-                )
-
-                if dry_run:
-                    # Simulate execution
-                    result.add_success(action, {"dry_run": True})
-                else:
-                    # Execute via HA client
-                    ha_result = await ha_client.call_service(
-                        domain=domain,
-                        service=service,
-                        service_data=service_data,
-                        target=target,
-                    )
-                    result.add_success(action, ha_result)
+        # Actions in a plan are independent, so their HA calls overlap
+        outcomes = await asyncio.gather(
+            *(self._execute_ha_action(action, dry_run) for action in actions),
+            return_exceptions=True,
+        )
 
-            except Exception as e:
-                logger.error("Action execution failed", action=action, error=str(e))
-                result.add_failure(action, str(e))
+        for action, outcome in zip(actions, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error("Action execution failed", action=action, error=str(outcome))
+                result.add_failure(action, str(outcome))
+            else:
+                result.add_success(action, outcome)
 
         return {
             "success": result.success,
@@ -183,6 +167,35 @@ class Executor:
             "message": self._format_execution_message(result),
         }
 
+    async def _execute_ha_action(
+        self,
+        action: Dict[str, Any],
+        dry_run: bool = False,
+    ) -> Any:
+        """Execute one Home Assistant action and return the service result"""
+        domain = action.get("domain")
+        service = action.get("service")
+        if not domain or not service:
+            raise ValueError("Missing domain or service")
+
+        logger.info(
+            "Executing HA action",
+            domain=domain,
+            service=service,
+            dry_run=dry_run,
+        )
+
+        if dry_run:
+            # Simulate execution
+            return {"dry_run": True}
+
+        return await ha_client.call_service(
+            domain=domain,
+            service=service,
+            service_data=action.get("service_data", {}),
+            target=action.get("target", {}),
+        )
+
     async def _execute_set_rule(
         self,
         user_id: str,
@@ -239,17 +252,19 @@ class Executor:
         """Log action to audit database"""
         
         try:
+            # Write-only row: a Core insert skips ORM unit-of-work bookkeeping
             async with async_session_maker() as session:
-                log_entry = ActionLog(
-                    user_id=user_id,
-                    intent=intent,
-                    actions=plan.get("actions", []),
-                    confirmed=confirmed,
-                    executed=True,
-                    success=result.get("success", False),
-                    error="; ".join(result.get("errors", [])) if result.get("errors") else None,
+                await session.execute(
+                    insert(ActionLog).values(
+                        user_id=user_id,
+                        intent=intent,
+                        actions=plan.get("actions", []),
+                        confirmed=confirmed,
+                        executed=True,
+                        success=result.get("success", False),
+                        error="; ".join(result.get("errors", [])) if result.get("errors") else None,
+                    )
                 )
-                session.add(log_entry)
                 await session.commit()
 
             logger.debug("Action logged to audit", user_id=user_id, intent=intent)
@@ -2,6 +2,7 @@
 
 from typing import Dict, Any, Optional
 import time
+import asyncio
 from app.services.pipeline.intent_analyzer import intent_analyzer
 from app.services.pipeline.context_resolver import context_resolver
 from app.services.pipeline.planner import planner
@@ -234,25 +235,21 @@ class PipelineOrchestrator:
         """Save interaction to memory"""
         
         try:
-            # Save user message
-            await memory_service.add_to_short_term(
-                user_id=user_id,
-                role="user",
-                content=command,
-            )
+            messages = [("user", command)]
 
             # Save assistant response
             response_text = response.get("text", "")
             if response_text:
-                await memory_service.add_to_short_term(
-                    user_id=user_id,
-                    role="assistant",
-                    content=response_text,
-                    metadata={
+                messages.append((
+                    "assistant",
+                    response_text,
+                    {
                         "intent": response.get("intent"),
                         "channel": response.get("channel"),
                     },
-                )
+                ))
+
+            await memory_service.add_to_short_term_many(user_id, messages)
 
             logger.debug("Saved to memory", user_id=user_id)
 
@@ -263,8 +260,10 @@ class PipelineOrchestrator:
         """Check pipeline health"""
         
         # Check each component
-        planner_health = await self.planner.text_agent.health_check()
-        tts_health = await self.response_composer.tts.health_check()
+        planner_health, tts_health = await asyncio.gather(
+            self.planner.text_agent.health_check(),
+            self.response_composer.tts.health_check(),
+        )
 
         all_healthy = (
             planner_health.get("healthy", False) and
@@ -231,6 +231,8 @@ class Planner:
         """Plan automation creation"""
         
         agent_context = self._build_agent_context(user_id, context)
+        # The prompt below is not the command, so its embedding doesn't apply
+        agent_context.input_embedding = None
         
         # Add automation creation instructions
         automation_prompt = (
@@ -341,6 +343,7 @@ class Planner:
         if memory_ctx:
             agent_context.user_rules = memory_ctx.get("relevant_rules", [])
             agent_context.relevant_memories = memory_ctx.get("relevant_memories", [])
+            agent_context.input_embedding = memory_ctx.get("query_embedding")
 
             # Add recent history to messages
             for msg in memory_ctx.get("recent_history", []):
@@ -1,6 +1,7 @@
 """Enhanced Perplexity client with enforced recency policies"""
 
-from typing import Dict, Any, Optional, List
+from typing import AsyncIterator, Dict, Any, Optional, List, Tuple
+import json
 import httpx
 import time
 from app.services.search.policies import (
@@ -13,9 +14,24 @@ from app.core.config import settings
 from app.core.logging import get_logger
 from app.core.rate_limiter import rate_limiter
 
+# Make orjson optional
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
 logger = get_logger(__name__)
 
 
+def _loads(data: str) -> Any:
+    """Parse the JSON payload of a server-sent event"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 class RecencyFilter(str):
     """Recency filter values for Perplexity API"""
     HOUR = "hour"
@@ -79,7 +95,121 @@ class EnhancedPerplexityClient:
         """
         start_time = time.time()
 
-        # Check rate limit
+        self._check_rate_limit()
+        category, policy_decision, recency_filter = self._resolve_policy(
+            query, category, requested_recency_days, override_reason
+        )
+
+        # Step 5: Check cache
+        cache_key = f"{query}:{category.value}:{recency_filter}"
+        if use_cache:
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                logger.info("Using cached result", query=query[:50])
+                return cached
+
+        # Step 6: Perform search
+        try:
+            search_result = await self._perform_search(
+                query=query,
+                recency_filter=recency_filter,
+                max_results=max_results,
+            )
+            return self._complete_search(
+                search_result, query, category, policy_decision,
+                cache_key if use_cache else None, start_time,
+            )
+
+        except Exception as e:
+            logger.error("Search failed", query=query[:50], error=str(e))
+            raise
+
+    async def stream_search(
+        self,
+        query: str,
+        category: Optional[SearchCategory] = None,
+        requested_recency_days: Optional[int] = None,
+        override_reason: Optional[str] = None,
+        use_cache: bool = True,
+        max_results: int = 5,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Perform search with enforced recency policy, streaming the answer
+        
+        Args:
+            query: Search query
+            category: Optional explicit category
+            requested_recency_days: Requested recency (may be overridden)
+            override_reason: Reason for policy override
+            use_cache: Use cached results if available
+            max_results: Maximum results
+            
+        Yields:
+            {"type": "delta", "text": ...} events as the answer is generated,
+            then one {"type": "done", ...} event with sources and policy metadata
+        """
+        start_time = time.time()
+
+        self._check_rate_limit()
+        category, policy_decision, recency_filter = self._resolve_policy(
+            query, category, requested_recency_days, override_reason
+        )
+
+        cache_key = f"{query}:{category.value}:{recency_filter}"
+        if use_cache:
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                logger.info("Using cached result", query=query[:50])
+                yield {"type": "delta", "text": cached["answer"]}
+                yield self._done_event(cached)
+                return
+
+        search_params = self._build_search_params(query, recency_filter)
+        search_params["stream"] = True
+
+        parts: List[str] = []
+        citations: List[str] = []
+        try:
+            async with self.client.stream(
+                "POST",
+                f"{self.base_url}/chat/completions",
+                json=search_params,
+            ) as response:
+                response.raise_for_status()
+
+                # Server-sent events, one chat.completion.chunk per data line
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+
+                    chunk = _loads(data)
+                    citations = chunk.get("citations") or citations
+                    choices = chunk.get("choices") or ()
+                    text = choices[0].get("delta", {}).get("content") if choices else None
+                    if text:
+                        parts.append(text)
+                        yield {"type": "delta", "text": text}
+
+        except Exception as e:
+            logger.error("Streaming search failed", query=query[:50], error=str(e))
+            raise
+
+        search_result = {
+            "answer": "".join(parts) or "Информация не найдена.",
+            "sources": citations[:max_results],
+            "usage": {},
+        }
+        search_result = self._complete_search(
+            search_result, query, category, policy_decision,
+            cache_key if use_cache else None, start_time,
+        )
+        yield self._done_event(search_result)
+
+    def _check_rate_limit(self) -> None:
+        """Raise if the Perplexity rate limit is exhausted"""
         allowed, wait_time = rate_limiter.check_limit(
             "perplexity",
             settings.perplexity_rate_limit_per_minute,
@@ -90,9 +220,23 @@ class EnhancedPerplexityClient:
             logger.warning("Rate limit exceeded", wait_time=wait_time)
             raise Exception(f"Rate limit exceeded. Wait {wait_time:.1f} seconds.")
 
-        # Step 1: Pre-classify if not provided
+    def _resolve_policy(
+        self,
+        query: str,
+        category: Optional[SearchCategory],
+        requested_recency_days: Optional[int],
+        override_reason: Optional[str],
+    ) -> Tuple[SearchCategory, Dict[str, Any], Optional[str]]:
+        """Classify query and enforce recency policy
+        
+        Returns:
+            Tuple of (category, policy decision, recency filter)
+        """
+        # Step 1: Pre-classify if not provided; API callers pass the plain value
         if category is None:
             category = pre_classifier.classify(query)
+        elif not isinstance(category, SearchCategory):
+            category = SearchCategory(category)
 
         logger.info(
             "Search initiated",
@@ -121,61 +265,71 @@ class EnhancedPerplexityClient:
         # Step 4: Convert days to filter
         recency_filter = self._days_to_filter(policy_decision["recency_days"])
 
-        # Step 5: Check cache
-        cache_key = f"{query}:{category.value}:{recency_filter}"
-        if use_cache and cache_key in self.cache:
-            cached = self.cache[cache_key]
-            if time.time() - cached["timestamp"] < settings.perplexity_cache_ttl_minutes * 60:
-                logger.info("Using cached result", query=query[:50])
-                cached["from_cache"] = True
-                return cached
+        return category, policy_decision, recency_filter
 
-        # Step 6: Perform search
-        try:
-            search_result = await self._perform_search(
-                query=query,
-                recency_filter=recency_filter,
-                max_results=max_results,
-            )
+    def _get_cached(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return unexpired cached result, marked as served from cache"""
+        cached = self.cache.get(cache_key)
+        if cached is None:
+            return None
+        if time.time() - cached["timestamp"] >= settings.perplexity_cache_ttl_minutes * 60:
+            return None
 
-            # Add policy metadata
-            search_result.update({
-                "policy": policy_decision,
-                "category": category.value,
-                "query": query,
-                "from_cache": False,
-                "timestamp": time.time(),
-            })
-
-            # Cache result
-            if use_cache:
-                self.cache[cache_key] = search_result
-
-            duration_ms = int((time.time() - start_time) * 1000)
-            logger.info(
-                "Search completed",
-                query=query[:50],
-                category=category.value,
-                recency_days=policy_decision["recency_days"],
-                sources_count=len(search_result.get("sources", [])),
-                duration_ms=duration_ms,
-            )
+        cached["from_cache"] = True
+        return cached
 
-            return search_result
+    def _complete_search(
+        self,
+        search_result: Dict[str, Any],
+        query: str,
+        category: SearchCategory,
+        policy_decision: Dict[str, Any],
+        cache_key: Optional[str],
+        start_time: float,
+    ) -> Dict[str, Any]:
+        """Attach policy metadata, cache and log a finished search"""
+        # Add policy metadata
+        search_result.update({
+            "policy": policy_decision,
+            "category": category.value,
+            "query": query,
+            "from_cache": False,
+            "timestamp": time.time(),
+        })
 
-        except Exception as e:
-            logger.error("Search failed", query=query[:50], error=str(e))
-            raise
+        # Cache result
+        if cache_key is not None:
+            self.cache[cache_key] = search_result
 
-    async def _perform_search(
+        duration_ms = int((time.time() - start_time) * 1000)
+        logger.info(
+            "Search completed",
+            query=query[:50],
+            category=category.value,
+            recency_days=policy_decision["recency_days"],
+            sources_count=len(search_result.get("sources", [])),
+            duration_ms=duration_ms,
+        )
+
+        return search_result
+
+    @staticmethod
+    def _done_event(search_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Final stream event, shaped like the non-streaming response"""
+        return {
+            "type": "done",
+            "sources": search_result["sources"],
+            "category": search_result["category"],
+            "recency": search_result["policy"].get("recency_days"),
+            "metadata": search_result["policy"],
+        }
+
+    def _build_search_params(
         self,
         query: str,
         recency_filter: Optional[str],
-        max_results: int,
     ) -> Dict[str, Any]:
-        """Perform actual Perplexity API call"""
-        
-        # Build request
+        """Build Perplexity chat completion request"""
         search_params = {
             "model": self.model,
             "messages": [
@@ -203,10 +357,20 @@ class EnhancedPerplexityClient:
         if recency_filter:
             search_params["search_recency_filter"] = recency_filter
 
+        return search_params
+
+    async def _perform_search(
+        self,
+        query: str,
+        recency_filter: Optional[str],
+        max_results: int,
+    ) -> Dict[str, Any]:
+        """Perform actual Perplexity API call"""
+        
         # Perform request
         response = await self.client.post(
             f"{self.base_url}/chat/completions",
-            json=search_params,
+            json=self._build_search_params(query, recency_filter),
         )
         response.raise_for_status()
         result = response.json()
@@ -0,0 +1,157 @@
+"""Semantic response cache keyed on input embeddings"""
+
+import hashlib
+import time
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, List, Optional, Sequence
+import numpy as np
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _CacheEntry:
+    """Cached value with the context chain it was produced in"""
+    context_hash: str
+    value: Any
+
+
+class SemanticCache:
+    """
+    In-process cache of responses for semantically similar inputs.
+
+    Features:
+    - One matrix-vector product per lookup over all cached embeddings
+    - Context chain verification, so a similar question asked after a
+      different conversation is not treated as a hit
+    - Fixed capacity with ring-buffer eviction and per-entry TTL
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.93,
+        ttl_seconds: float = 300.0,
+        max_entries: int = 256,
+    ):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        # Allocated on first put, once the embedding dimension is known
+        self._matrix: Optional[np.ndarray] = None
+        self._expires_at = np.zeros(max_entries, dtype=np.float64)
+        self._entries: List[Optional[_CacheEntry]] = [None] * max_entries
+        self._next = 0
+
+    def __len__(self) -> int:
+        now = time.monotonic()
+        return int(np.count_nonzero(self._expires_at > now))
+
+    @staticmethod
+    def context_hash(
+        user_id: str,
+        messages: Sequence[Any],
+        depth: int = 2,
+    ) -> str:
+        """
+        Hash the conversation a query was asked in
+
+        Args:
+            user_id: User identifier
+            messages: Conversation messages with role and content
+            depth: Number of trailing messages to include
+
+        Returns:
+            Hex digest of the context chain
+        """
+        digest = hashlib.blake2b(user_id.encode("utf-8"), digest_size=16)
+        for msg in islice(messages, max(0, len(messages) - depth), None):
+            digest.update(b"\x00")
+            digest.update(msg.role.encode("utf-8"))
+            digest.update(b"\x00")
+            digest.update(msg.content[:128].encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, embedding: Sequence[float], context_hash: str) -> Optional[Any]:
+        """
+        Find a cached value for a similar input in the same context
+
+        Args:
+            embedding: Input embedding
+            context_hash: Hash from context_hash()
+
+        Returns:
+            Cached value or None
+        """
+        if self._matrix is None:
+            return None
+
+        query = self._normalize(embedding)
+        if query is None or query.shape[0] != self._matrix.shape[1]:
+            return None
+
+        scores = self._matrix @ query
+        scores[self._expires_at <= time.monotonic()] = -1.0
+
+        candidates = np.flatnonzero(scores >= self.threshold)
+        for index in candidates[np.argsort(-scores[candidates])]:
+            entry = self._entries[index]
+            if entry is not None and entry.context_hash == context_hash:
+                logger.debug("Semantic cache hit", similarity=float(scores[index]))
+                return entry.value
+
+        return None
+
+    def put(
+        self,
+        embedding: Sequence[float],
+        context_hash: str,
+        value: Any,
+    ) -> None:
+        """
+        Cache a value for an input
+
+        Args:
+            embedding: Input embedding
+            context_hash: Hash from context_hash()
+            value: Value to return on later hits
+        """
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+
+        if self._matrix is None or self._matrix.shape[1] != vector.shape[0]:
+            self.clear()
+            self._matrix = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+
+        index = self._next
+        self._matrix[index] = vector
+        self._expires_at[index] = time.monotonic() + self.ttl_seconds
+        self._entries[index] = _CacheEntry(context_hash=context_hash, value=value)
+        self._next = (index + 1) % self.max_entries
+
+    def clear(self) -> None:
+        """Drop all cached entries"""
+        self._matrix = None
+        self._expires_at[:] = 0.0
+        self._entries = [None] * self.max_entries
+        self._next = 0
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> Optional[np.ndarray]:
+        """Convert to a unit float32 vector so dot product is cosine similarity"""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if vector.ndim != 1 or norm == 0:
+            return None
+        return vector / norm
+
+
+# Global instance
+semantic_cache = SemanticCache(
+    threshold=settings.semantic_cache_threshold,
+    ttl_seconds=settings.semantic_cache_ttl_seconds,
+)
@@ -11,10 +11,14 @@ from app.services.tts.base import (
     AudioFormat,
 )
 from app.core.config import settings
+from app.core.http_client import get_http_client
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Seconds a successful synthesis health check is reused for
+_HEALTH_CHECK_TTL = 30.0
+
 
 class OpenAITTSProvider(BaseTTSProvider):
     """
@@ -35,10 +39,14 @@ class OpenAITTSProvider(BaseTTSProvider):
         self.model = model
         self.default_voice = default_voice
         self.client: AsyncOpenAI = None
+        self._last_health_ok = float("-inf")
 
     async def initialize(self) -> None:
         """Initialize OpenAI client"""
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+        self.client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            http_client=get_http_client(),
+        )
         logger.info(
             "OpenAI TTS provider initialized",
             model=self.model,
@@ -47,9 +55,8 @@ class OpenAITTSProvider(BaseTTSProvider):
 
     async def shutdown(self) -> None:
         """Cleanup resources"""
-        if self.client:
-            await self.client.close()
-            self.client = None
+        # The HTTP pool is shared and closed with the application
+        self.client = None
         logger.info("OpenAI TTS provider shutdown")
 
     async def synthesize(self, request: TTSRequest) -> TTSResponse:
@@ -251,7 +258,9 @@ class OpenAITTSProvider(BaseTTSProvider):
         """Check TTS provider health"""
         healthy = self.client is not None
 
-        if healthy:
+        # Each check synthesizes audio; a recent success is good enough
+        now = time.monotonic()
+        if healthy and now - self._last_health_ok >= _HEALTH_CHECK_TTL:
             try:
                 # Simple test synthesis
                 test_request = TTSRequest(
@@ -261,6 +270,8 @@ class OpenAITTSProvider(BaseTTSProvider):
                 )
                 response = await self.synthesize(test_request)
                 healthy = len(response.audio_data) > 0
+                if healthy:
+                    self._last_health_ok = now
             except Exception as e:
                 healthy = False
                 logger.error("TTS health check failed", error=str(e))
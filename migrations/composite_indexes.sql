@@ -0,0 +1,23 @@
+-- Migration: Replace single-column indexes with composite ones
+-- Description: dialog_history and action_log keep one index per query shape
+-- instead of one per column, so each insert updates fewer B-trees
+
+-- dialog_history: drop per-column indexes (model defaults and add_memory_v2_fields.sql)
+DROP INDEX IF EXISTS ix_dialog_history_user_id;
+DROP INDEX IF EXISTS ix_dialog_history_timestamp;
+DROP INDEX IF EXISTS ix_dialog_history_memory_type;
+DROP INDEX IF EXISTS ix_dialog_history_importance;
+DROP INDEX IF EXISTS ix_dialog_history_expires_at;
+DROP INDEX IF EXISTS idx_dialog_history_memory_type;
+DROP INDEX IF EXISTS idx_dialog_history_importance;
+DROP INDEX IF EXISTS idx_dialog_history_expires_at;
+
+CREATE INDEX IF NOT EXISTS ix_dialog_history_user_ts ON dialog_history(user_id, timestamp);
+CREATE INDEX IF NOT EXISTS ix_dialog_history_user_type_ts ON dialog_history(user_id, memory_type, timestamp);
+CREATE INDEX IF NOT EXISTS ix_dialog_history_expires_at ON dialog_history(expires_at) WHERE expires_at IS NOT NULL;
+
+-- action_log
+DROP INDEX IF EXISTS ix_action_log_user_id;
+DROP INDEX IF EXISTS ix_action_log_timestamp;
+
+CREATE INDEX IF NOT EXISTS ix_action_log_user_ts ON action_log(user_id, timestamp);
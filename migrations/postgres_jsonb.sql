@@ -0,0 +1,8 @@
+-- Migration: Store JSON columns as JSONB (PostgreSQL only)
+-- Description: Existing PostgreSQL databases keep the json type until converted;
+-- SQLite stores JSON as text and needs no change
+
+ALTER TABLE dialog_history ALTER COLUMN extra_data TYPE JSONB USING extra_data::jsonb;
+ALTER TABLE user_rules ALTER COLUMN extra_data TYPE JSONB USING extra_data::jsonb;
+ALTER TABLE action_log ALTER COLUMN actions TYPE JSONB USING actions::jsonb;
+ALTER TABLE cache_entries ALTER COLUMN cache_value TYPE JSONB USING cache_value::jsonb;
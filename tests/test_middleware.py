@@ -0,0 +1,107 @@
+"""Tests for HTTP timing middleware"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.testclient import TestClient
+from app.api import middleware
+from app.api.middleware import RateLimitMiddleware, TimingMiddleware, internal_error_handler
+from app.core.rate_limiter import RateLimiterManager
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    """Capture record_http_request calls"""
+    calls = []
+
+    def record_http_request(method, endpoint, status, duration):
+        calls.append({"method": method, "endpoint": endpoint, "status": status})
+
+    monkeypatch.setattr(middleware.metrics, "record_http_request", record_http_request)
+    return calls
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        return {"item_id": item_id}
+
+    @app.get("/fail")
+    async def fail():
+        raise RuntimeError("boom")
+
+    app.add_middleware(TimingMiddleware, log_requests=True)
+    app.add_exception_handler(Exception, internal_error_handler)
+    return TestClient(app, raise_server_exceptions=False)
+
+
+class TestTimingMiddleware:
+    """Test TimingMiddleware"""
+
+    def test_adds_timing_headers(self, client, recorded):
+        """Test that responses carry X-Process-Time and X-Request-ID"""
+        response = client.get("/items/42")
+
+        assert response.status_code == 200
+        assert float(response.headers["X-Process-Time"]) >= 0
+        assert response.headers["X-Request-ID"]
+
+    def test_labels_route_template(self, client, recorded):
+        """Test that metrics use the route template, not the raw path"""
+        client.get("/items/42")
+        client.get("/items/43")
+
+        assert [call["endpoint"] for call in recorded] == ["/items/{item_id}"] * 2
+        assert recorded[0]["status"] == 200
+
+    def test_labels_unmatched_404(self, client, recorded):
+        """Test that unrouted 404s share one label"""
+        response = client.get("/no/such/path")
+
+        assert response.status_code == 404
+        assert recorded == [{"method": "GET", "endpoint": "unmatched", "status": 404}]
+
+    def test_unhandled_error_returns_500_with_request_id(self, client, recorded):
+        """Test that unhandled errors become a JSON 500 tagged with the request ID"""
+        response = client.get("/fail")
+
+        assert response.status_code == 500
+        body = response.json()
+        assert body["detail"] == "Internal server error"
+        assert body["request_id"]
+        assert recorded == [{"method": "GET", "endpoint": "/fail", "status": 500}]
+
+    def test_labels_unrouted_responses_as_unmatched(self, monkeypatch, recorded):
+        """Test that preflights and rate-limited requests share one label"""
+        monkeypatch.setattr(middleware, "rate_limiter", RateLimiterManager())
+
+        app = FastAPI()
+
+        @app.get("/items/{item_id}")
+        async def get_item(item_id: str):
+            return {"item_id": item_id}
+
+        app.add_middleware(RateLimitMiddleware, rate_per_minute=1)
+        app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"])
+        app.add_middleware(TimingMiddleware)
+        client = TestClient(app)
+
+        preflight_headers = {
+            "Origin": "http://example.com",
+            "Access-Control-Request-Method": "GET",
+        }
+        for path in ("/random/0", "/random/1"):
+            assert client.options(path, headers=preflight_headers).status_code == 200
+
+        assert client.get("/items/1").status_code == 200
+        assert client.get("/items/2").status_code == 429
+
+        assert [(call["endpoint"], call["status"]) for call in recorded] == [
+            ("unmatched", 200),
+            ("unmatched", 200),
+            ("/items/{item_id}", 200),
+            ("unmatched", 429),
+        ]
@@ -0,0 +1,79 @@
+"""Tests for long-term memory query cache"""
+
+import pytest
+from app.services.memory_v2.query_cache import QueryCache
+
+
+class TestQueryCache:
+    """Test QueryCache"""
+
+    @pytest.fixture(params=[True, False], ids=["int8", "float32"])
+    def cache(self, request):
+        return QueryCache(max_size=3, ttl_seconds=60, threshold=0.97, quantize=request.param)
+
+    def _put(self, cache, query, embedding, results, user_id="u1", scope="*"):
+        cache.put(
+            user_id, scope, query, 5, 0.7, embedding, results,
+            cache.generation(user_id),
+        )
+
+    def test_exact_hit_normalizes_query(self, cache):
+        """Test lookup by case- and whitespace-insensitive query text"""
+        self._put(cache, "Turn on  the lights", [1.0, 0.0], [{"content": "a"}])
+        assert cache.get("u1", "*", "turn on the lights ", 5, 0.7) == [{"content": "a"}]
+
+    def test_exact_miss_for_other_parameters(self, cache):
+        """Test that scope, limit and threshold are part of the key"""
+        self._put(cache, "weather", [1.0, 0.0], [{"content": "a"}])
+        assert cache.get("u1", "rules", "weather", 5, 0.7) is None
+        assert cache.get("u1", "*", "weather", 3, 0.7) is None
+        assert cache.get("u2", "*", "weather", 5, 0.7) is None
+
+    def test_semantic_hit(self, cache):
+        """Test lookup of a near-identical query embedding"""
+        self._put(cache, "weather", [1.0, 0.0], [{"content": "a"}])
+        assert cache.get_similar("u1", "*", [0.999, 0.01], 5, 0.7) == [{"content": "a"}]
+        assert cache.get_similar("u1", "*", [0.7, 0.7], 5, 0.7) is None
+
+    def test_invalidate_scope(self, cache):
+        """Test that invalidation drops only the given scopes"""
+        self._put(cache, "weather", [1.0, 0.0], ["all"])
+        self._put(cache, "weather", [1.0, 0.0], ["rules"], scope="rules")
+        self._put(cache, "weather", [1.0, 0.0], ["facts"], scope="facts")
+
+        cache.invalidate("u1", ("rules", "*"))
+
+        assert cache.get("u1", "*", "weather", 5, 0.7) is None
+        assert cache.get("u1", "rules", "weather", 5, 0.7) is None
+        assert cache.get("u1", "facts", "weather", 5, 0.7) == ["facts"]
+
+    def test_stale_put_ignored(self, cache):
+        """Test that results computed across an invalidation are not cached"""
+        generation = cache.generation("u1")
+        cache.invalidate("u1")
+        cache.put("u1", "*", "weather", 5, 0.7, [1.0, 0.0], ["old"], generation)
+        assert cache.get("u1", "*", "weather", 5, 0.7) is None
+
+        generation = cache.generation("u1")
+        cache.clear()
+        cache.put("u1", "*", "weather", 5, 0.7, [1.0, 0.0], ["old"], generation)
+        assert len(cache) == 0
+
+    def test_expired_entry(self, cache):
+        """Test TTL expiration"""
+        cache.ttl_seconds = 0
+        self._put(cache, "weather", [1.0, 0.0], ["a"])
+        assert cache.get("u1", "*", "weather", 5, 0.7) is None
+        assert cache.get_similar("u1", "*", [1.0, 0.0], 5, 0.7) is None
+
+    def test_lru_eviction(self, cache):
+        """Test that the least recently used entry is evicted at capacity"""
+        for i in range(3):
+            self._put(cache, f"q{i}", [1.0, float(i)], [i])
+
+        cache.get("u1", "*", "q0", 5, 0.7)
+        self._put(cache, "q3", [1.0, 3.0], [3])
+
+        assert cache.get("u1", "*", "q1", 5, 0.7) is None
+        assert cache.get("u1", "*", "q0", 5, 0.7) == [0]
+        assert len(cache) == 3
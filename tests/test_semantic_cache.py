@@ -0,0 +1,57 @@
+"""Tests for semantic response cache"""
+
+import pytest
+from app.agents.base import AgentMessage
+from app.services.semantic_cache import SemanticCache
+
+
+class TestSemanticCache:
+    """Test SemanticCache"""
+
+    @pytest.fixture
+    def cache(self):
+        return SemanticCache(threshold=0.9, ttl_seconds=60, max_entries=4)
+
+    def test_hit_for_similar_embedding(self, cache):
+        """Test lookup of a near-identical embedding"""
+        cache.put([1.0, 0.0, 0.0], "ctx", "answer")
+        assert cache.get([0.99, 0.05, 0.0], "ctx") == "answer"
+
+    def test_miss_below_threshold(self, cache):
+        """Test that dissimilar embeddings do not hit"""
+        cache.put([1.0, 0.0, 0.0], "ctx", "answer")
+        assert cache.get([0.0, 1.0, 0.0], "ctx") is None
+
+    def test_miss_for_different_context(self, cache):
+        """Test context chain verification"""
+        cache.put([1.0, 0.0, 0.0], "ctx-a", "answer")
+        assert cache.get([1.0, 0.0, 0.0], "ctx-b") is None
+
+    def test_expired_entry(self, cache):
+        """Test TTL expiration"""
+        cache.ttl_seconds = 0
+        cache.put([1.0, 0.0, 0.0], "ctx", "answer")
+        assert cache.get([1.0, 0.0, 0.0], "ctx") is None
+
+    def test_ring_eviction(self, cache):
+        """Test that the oldest entry is evicted at capacity"""
+        for i in range(5):
+            vector = [0.0] * 5
+            vector[i] = 1.0
+            cache.put(vector, "ctx", i)
+
+        assert cache.get([1.0, 0.0, 0.0, 0.0, 0.0], "ctx") is None
+        assert cache.get([0.0, 0.0, 0.0, 0.0, 1.0], "ctx") == 4
+        assert len(cache) == 4
+
+    def test_context_hash(self):
+        """Test that the hash covers user and recent messages"""
+        messages = [
+            AgentMessage(role="user", content="привет"),
+            AgentMessage(role="assistant", content="здравствуйте"),
+        ]
+        base = SemanticCache.context_hash("u1", messages)
+
+        assert SemanticCache.context_hash("u1", list(messages)) == base
+        assert SemanticCache.context_hash("u2", messages) != base
+        assert SemanticCache.context_hash("u1", messages[:1]) != base
@@ -0,0 +1,80 @@
+"""Tests for cosine similarity kernels"""
+
+import numpy as np
+import pytest
+from app.services.memory_v2 import simd
+
+
+@pytest.fixture(params=[True, False], ids=["simsimd", "numpy"])
+def backend(request, monkeypatch):
+    if request.param and not simd.SIMSIMD_AVAILABLE:
+        pytest.skip("simsimd not installed")
+    monkeypatch.setattr(simd, "SIMSIMD_AVAILABLE", request.param)
+
+
+class TestCosine:
+    """Test cosine and cosine_batch on both backends"""
+
+    def test_cosine(self, backend):
+        """Test similarity of identical, orthogonal and opposite vectors"""
+        assert simd.cosine([1.0, 2.0], [2.0, 4.0]) == pytest.approx(1.0, abs=1e-6)
+        assert simd.cosine([1.0, 0.0], [0.0, 3.0]) == pytest.approx(0.0, abs=1e-6)
+        assert simd.cosine([1.0, 0.0], [-1.0, 0.0]) == pytest.approx(-1.0, abs=1e-6)
+
+    def test_cosine_zero_vector(self, backend):
+        """Test that a zero vector is not similar to anything"""
+        assert simd.cosine([0.0, 0.0], [1.0, 0.0]) == pytest.approx(0.0, abs=1e-6)
+        assert simd.cosine([0.0, 0.0], [0.0, 0.0]) == pytest.approx(0.0, abs=1e-6)
+
+    def test_cosine_batch_zero_vectors(self, backend):
+        """Test that zero queries and zero rows score 0"""
+        matrix = [[0.0, 0.0], [1.0, 0.0]]
+        assert simd.cosine_batch([0.0, 0.0], matrix).tolist() == [0.0, 0.0]
+        assert simd.cosine_batch([1.0, 0.0], matrix).tolist() == pytest.approx([0.0, 1.0], abs=1e-6)
+
+    def test_cosine_batch(self, backend):
+        """Test batch scores against row-by-row scores"""
+        rng = np.random.default_rng(0)
+        query = rng.standard_normal(64)
+        matrix = rng.standard_normal((5, 64))
+
+        scores = simd.cosine_batch(query, matrix)
+
+        assert scores.shape == (5,)
+        for row, score in zip(matrix, scores):
+            assert score == pytest.approx(simd.cosine(query, row), abs=1e-5)
+
+    def test_cosine_batch_empty(self, backend):
+        """Test an empty matrix"""
+        assert simd.cosine_batch([1.0, 0.0], np.empty((0, 2))).shape == (0,)
+
+    def test_quantize_i8(self):
+        """Test int8 quantization round trip and scale"""
+        vec = np.array([0.5, -1.0, 0.25], dtype=np.float32)
+        quantized, scale = simd.quantize_i8(vec)
+
+        assert quantized.dtype == np.int8
+        assert quantized.tolist() == [64, -127, 32]
+        assert np.allclose(quantized * scale, vec, atol=scale)
+
+    def test_quantize_i8_zero_vector(self):
+        """Test that a zero vector quantizes to zeros"""
+        quantized, scale = simd.quantize_i8([0.0, 0.0])
+        assert quantized.tolist() == [0, 0]
+        assert scale == 0.0
+
+    def test_cosine_batch_int8(self, backend):
+        """Test that quantized vectors keep their similarity ranking"""
+        rng = np.random.default_rng(1)
+        query = rng.standard_normal(256)
+        matrix = rng.standard_normal((8, 256))
+        matrix[3] = query + 0.01 * rng.standard_normal(256)
+
+        q_i8, _ = simd.quantize_i8(query)
+        m_i8 = np.stack([simd.quantize_i8(row)[0] for row in matrix])
+
+        exact = simd.cosine_batch(query, matrix)
+        quantized = simd.cosine_batch(q_i8, m_i8)
+
+        assert int(np.argmax(quantized)) == 3
+        assert np.allclose(quantized, exact, atol=0.02)